@@ -45,6 +45,7 @@ from galaxy.objectstore.caching import check_caches
 from galaxy.queue_worker import GalaxyQueueWorker
 from galaxy.schema.notifications import NotificationCreateRequest
 from galaxy.schema.tasks import (
+    ComputeDatasetHashesTaskRequest,
     ComputeDatasetHashTaskRequest,
     GenerateHistoryContentDownload,
     GenerateHistoryDownload,
@@ -88,7 +89,7 @@ def recalculate_user_disk_usage(
     if task_user_id:
         user = session.get(User, task_user_id)
         if user:
-            user.calculate_and_set_disk_usage(object_store)
+            user.reconcile_disk_usage(object_store)
         else:
             log.error(f"Recalculate user disk usage task failed, user {task_user_id} not found")
     else:
@@ -154,7 +155,7 @@ def change_datatype(
         return
     if datatype == "auto":
         path = dataset_instance.dataset.get_file_name()
-        datatype = sniff.guess_ext(path, datatypes_registry.sniff_order)
+        datatype = sniff.guess_ext(path, datatypes_registry.sniff_index)
     datatypes_registry.change_datatype(dataset_instance, datatype)
     with transaction(sa_session):
         sa_session.commit()
@@ -437,6 +438,15 @@ def compute_dataset_hash(
     dataset_manager.compute_hash(request)
 
 
+@galaxy_task(action="compute dataset hashes for a dataset and its extra files and store in database")
+def compute_dataset_hashes(
+    dataset_manager: DatasetManager,
+    request: ComputeDatasetHashesTaskRequest,
+    task_user_id: Optional[int] = None,
+):
+    dataset_manager.compute_hashes(request)
+
+
 @galaxy_task(action="import a data bundle")
 def import_data_bundle(
     app: MinimalManagerApp,
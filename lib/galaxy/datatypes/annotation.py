@@ -48,6 +48,7 @@ class Augustus(CompressedArchive):
     """
 
     file_ext = "augustus"
+    sniff_requires_tar = True
     edam_data = "data_0950"
     compressed = True
 
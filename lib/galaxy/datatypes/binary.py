@@ -295,6 +295,7 @@ class Meryldb(CompressedArchive):
     """MerylDB is a tar.gz archive, with 128 files. 64 data files and 64 index files."""
 
     file_ext = "meryldb"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         """
@@ -325,6 +326,7 @@ class Visium(CompressedArchive):
     """Visium is a tar.gz archive with at least a 'Spatial' subfolder, a filtered h5 file and a raw h5 file."""
 
     file_ext = "visium.tar.gz"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         """
@@ -348,13 +350,10 @@ class Bref3(Binary):
     """Bref3 format is a binary format for storing phased, non-missing genotypes for a list of samples."""
 
     file_ext = "bref3"
-
-    def __init__(self, **kwd):
-        super().__init__(**kwd)
-        self._magic = binascii.unhexlify("7a8874f400156272")
+    magic_bytes = (binascii.unhexlify("7a8874f400156272"),)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
-        return file_prefix.startswith_bytes(self._magic)
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
         if not dataset.dataset.purged:
@@ -2269,11 +2268,12 @@ class Sff(Binary):
     edam_format = "format_3284"
     edam_data = "data_0924"
     file_ext = "sff"
+    magic_bytes = (b".sff",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         # The first 4 bytes of any sff file is '.sff', and the file is binary. For details
         # about the format, see http://www.ncbi.nlm.nih.gov/Traces/trace.cgi?cmd=show&f=formats&m=doc&s=format
-        return file_prefix.startswith_bytes(b".sff")
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
         if not dataset.dataset.purged:
@@ -3121,12 +3121,13 @@ class Sra(Binary):
     """Sequence Read Archive (SRA) datatype originally from mdshw5/sra-tools-galaxy"""
 
     file_ext = "sra"
+    magic_bytes = (b"NCBI.sra",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         """The first 8 bytes of any NCBI sra file is 'NCBI.sra', and the file is binary.
         For details about the format, see http://www.ncbi.nlm.nih.gov/books/n/helpsra/SRA_Overview_BK/#SRA_Overview_BK.4_SRA_Data_Structure
         """
-        return file_prefix.startswith_bytes(b"NCBI.sra")
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
         if not dataset.dataset.purged:
@@ -3166,6 +3167,7 @@ class RData(CompressedArchive):
     VERSION_2_PREFIX = b"RDX2\nX\n"
     VERSION_3_PREFIX = b"RDX3\nX\n"
     file_ext = "rdata"
+    magic_bytes = (VERSION_2_PREFIX, VERSION_3_PREFIX)
 
     MetadataElement(
         name="version",
@@ -3188,7 +3190,7 @@ class RData(CompressedArchive):
             fh.close()
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
-        return file_prefix.startswith_bytes((self.VERSION_2_PREFIX, self.VERSION_3_PREFIX))
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
     def _parse_rdata_header(self, fh: "FileObjType") -> str:
         header = fh.read(7)
@@ -3506,6 +3508,7 @@ class PostgresqlArchive(CompressedArchive):
         visible=True,
     )
     file_ext = "postgresql"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3562,6 +3565,7 @@ class MongoDBArchive(CompressedArchive):
         visible=True,
     )
     file_ext = "mongodb"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3638,6 +3642,7 @@ class Fast5Archive(CompressedArchive):
         name="fast5_count", default="0", param=MetadataParameter, desc="Read Count", readonly=True, visible=True
     )
     file_ext = "fast5.tar"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3850,6 +3855,7 @@ class NetCDF(Binary):
     """Binary data in netCDF format"""
 
     file_ext = "netcdf"
+    magic_bytes = (b"CDF",)
     edam_format = "format_3650"
     edam_data = "data_0943"
 
@@ -3868,7 +3874,7 @@ class NetCDF(Binary):
             return f"Binary netCDF file ({nice_size(dataset.get_size())})"
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
-        return file_prefix.startswith_bytes(b"CDF")
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
 
 class Dcd(Binary):
@@ -3991,14 +3997,11 @@ class DAA(Binary):
     """
 
     file_ext = "daa"
-
-    def __init__(self, **kwd):
-        super().__init__(**kwd)
-        self._magic = binascii.unhexlify("6be33e6d47530e3c")
+    magic_bytes = (binascii.unhexlify("6be33e6d47530e3c"),)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         # The first 8 bytes of any daa file are 0x3c0e53476d3ee36b
-        return file_prefix.startswith_bytes(self._magic)
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
 
 @build_sniff_from_prefix
@@ -4016,13 +4019,10 @@ class RMA6(Binary):
     """
 
     file_ext = "rma6"
-
-    def __init__(self, **kwd):
-        super().__init__(**kwd)
-        self._magic = binascii.unhexlify("000003f600000006")
+    magic_bytes = (binascii.unhexlify("000003f600000006"),)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
-        return file_prefix.startswith_bytes(self._magic)
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
 
 @build_sniff_from_prefix
@@ -4040,14 +4040,11 @@ class DMND(Binary):
     """
 
     file_ext = "dmnd"
-
-    def __init__(self, **kwd):
-        super().__init__(**kwd)
-        self._magic = binascii.unhexlify("6d18ee15a4f84a02")
+    magic_bytes = (binascii.unhexlify("6d18ee15a4f84a02"),)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         # The first 8 bytes of any dmnd file are 0x24af8a415ee186d
-        return file_prefix.startswith_bytes(self._magic)
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
 
 class ICM(Binary):
@@ -4095,13 +4092,10 @@ class Parquet(Binary):
     """
 
     file_ext = "parquet"
-
-    def __init__(self, **kwd):
-        super().__init__(**kwd)
-        self._magic = b"PAR1"  # Defined at https://parquet.apache.org/documentation/latest/
+    magic_bytes = (b"PAR1",)  # Defined at https://parquet.apache.org/documentation/latest/
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
-        return file_prefix.startswith_bytes(self._magic)
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
 
 class BafTar(CompressedArchive):
@@ -4120,6 +4114,7 @@ class BafTar(CompressedArchive):
     edam_data = "data_2536"  # mass spectrometry data
     edam_format = "format_3712"  # TODO: add more raw formats to EDAM?
     file_ext = "brukerbaf.d.tar"
+    sniff_requires_tar = True
 
     def get_signature_file(self) -> str:
         return "analysis.baf"
@@ -4265,11 +4260,12 @@ class Pretext(Binary):
     """
 
     file_ext = "pretext"
+    magic_bytes = (b"pstm",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         # The first 4 bytes of any pretext file is 'pstm', and the rest of the
         # file contains binary data.
-        return file_prefix.startswith_bytes(b"pstm")
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
         if not dataset.dataset.purged:
@@ -4609,6 +4605,7 @@ class Numpy(Binary):
     """
 
     file_ext = "npy"
+    magic_bytes = (b"\x93NUMPY",)
 
     MetadataElement(
         name="version_str",
@@ -4635,7 +4632,7 @@ class Numpy(Binary):
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         # The first 6 bytes of any numpy file is '\x93NUMPY', with following bytes for version
         # number of file formats, and info about header data. The rest of the file contains binary data.
-        return file_prefix.startswith_bytes(b"\x93NUMPY")
+        return file_prefix.startswith_bytes(self.magic_bytes)
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
         if not dataset.dataset.purged:
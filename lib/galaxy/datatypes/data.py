@@ -42,13 +42,13 @@ from galaxy.datatypes.sniff import (
     build_sniff_from_prefix,
     FilePrefix,
 )
+from galaxy.datatypes.util import line_scan
 from galaxy.exceptions import ObjectNotFound
 from galaxy.util import (
     compression_utils,
     file_reader,
     FILENAME_VALID_CHARS,
     inflector,
-    iter_start_of_line,
     unicodify,
     UNKNOWN,
 )
@@ -228,6 +228,11 @@ class Data(metaclass=DataMeta):
     # The dataset contains binary data --> do not space_to_tab or convert newlines, etc.
     # Allow binary file uploads of this type when True.
     is_binary: Union[bool, Literal["maybe"]] = True
+    # If set, files are only sniffed as this datatype if they start with one of these byte strings.
+    # Allows the sniff index of the datatypes registry to skip the sniffer for other files.
+    magic_bytes: Optional[Tuple[bytes, ...]] = None
+    # If True, files are only sniffed as this datatype if they are tar archives.
+    sniff_requires_tar = False
     # Composite datatypes
     composite_type: Optional[str] = None
     composite_files: Dict[str, Any] = {}
@@ -1059,20 +1064,19 @@ class Text(Data):
         Count the number of lines of data in dataset,
         skipping all blank lines and comments.
         """
-        CHUNK_SIZE = 2**15  # 32Kb
         data_lines = 0
-        with compression_utils.get_fileobj(dataset.get_file_name()) as in_file:
-            # FIXME: Potential encoding issue can prevent the ability to iterate over lines
-            # causing set_meta process to fail otherwise OK jobs. A better solution than
-            # a silent try/except is desirable.
-            try:
-                for line in iter_start_of_line(in_file, CHUNK_SIZE):
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        data_lines += 1
-            except UnicodeDecodeError:
-                log.warning(f"Unable to count lines in file {dataset.get_file_name()}, likely not a text file.")
-                return None
+        with compression_utils.get_fileobj(dataset.get_file_name(), "rb") as in_file:
+            for block in line_scan.iter_line_blocks(in_file):
+                # FIXME: Potential encoding issue can prevent the ability to iterate over lines
+                # causing set_meta process to fail otherwise OK jobs. A better solution than
+                # a silent try/except is desirable.
+                if not block.isascii():
+                    try:
+                        block.decode("utf-8")
+                    except UnicodeDecodeError:
+                        log.warning(f"Unable to count lines in file {dataset.get_file_name()}, likely not a text file.")
+                        return None
+                data_lines += line_scan.count_data_lines(block)
         return data_lines
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
@@ -25,6 +25,18 @@ from . import (
     external,
     hierarchy,
     line,
+    line_index,
 )
 
-__all__ = ("decorators", "exceptions", "base", "chunk", "line", "hierarchy", "column", "external", "dataset")
+__all__ = (
+    "decorators",
+    "exceptions",
+    "base",
+    "chunk",
+    "line",
+    "line_index",
+    "hierarchy",
+    "column",
+    "external",
+    "dataset",
+)
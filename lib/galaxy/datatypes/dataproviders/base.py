@@ -258,6 +258,12 @@ class LimitedOffsetDataProvider(FilteredDataProvider):
         if self.limit is not None and self.limit <= 0:
             return
 
+        if self.offset and self.can_use_line_index():
+            # skip (most of) the offset by seeking the source with its line index, if it has one
+            seek_to_data_line = getattr(type(self.source), "seek_to_data_line", None)
+            if seek_to_data_line:
+                self.num_valid_data_read = seek_to_data_line(self.source, self.offset)
+
         parent_gen = super().__iter__()
         for datum in parent_gen:
             self.num_data_returned -= 1
@@ -269,17 +275,15 @@ class LimitedOffsetDataProvider(FilteredDataProvider):
             if self.limit is not None and self.num_data_returned >= self.limit:
                 break
 
-    # TODO: skipping lines is inefficient - somehow cache file position/line_num pair and allow provider
-    #   to seek to a pos/line and then begin providing lines
-    # the important catch here is that we need to have accurate pos/line pairs
-    #   in order to preserve the functionality of limit and offset
-    # if file_seek and len( file_seek ) == 2:
-    #    seek_pos, new_line_num = file_seek
-    #    self.seek_and_set_curr_line( seek_pos, new_line_num )
-
-    # def seek_and_set_curr_line( self, file_seek, new_curr_line_num ):
-    #    self.seek( file_seek, os.SEEK_SET )
-    #    self.curr_line_num = new_curr_line_num
+    def can_use_line_index(self):
+        """
+        Does each datum counted against `offset` correspond to exactly one data
+        line (a line that is neither blank nor a comment) of the source?
+
+        Only then can a line index (see `line_index`) be used to skip data.
+        Meant to be overridden in subclasses.
+        """
+        return False
 
 
 class MultiSourceDataProvider(DataProvider):
@@ -321,6 +321,9 @@ class ColumnarDataProvider(line.RegexLineDataProvider):
         except IndexError:
             return None
 
+    def can_use_line_index(self):
+        return super().can_use_line_index() and not self.column_filters
+
     def filter_by_columns(self, columns):
         for filter_fn in self.column_filters:
             if not filter_fn(columns):
@@ -8,6 +8,7 @@ Dataproviders that use either:
 
 import logging
 import sys
+import zlib
 
 from bx import (
     seq as bx_seq,
@@ -21,6 +22,7 @@ from . import (
     column,
     external,
     line,
+    line_index,
 )
 
 _TODO = """
@@ -57,6 +59,33 @@ class DatasetDataProvider(base.DataProvider):
         mode = "rb" if dataset.datatype.is_binary else "r"
         super().__init__(get_fileobj(dataset.get_file_name(), mode))
 
+    def seek_to_data_line(self, data_line):
+        """
+        Move the source forward to the closest position before the (0-based)
+        `data_line` recorded in the line index of the dataset, indexing the
+        dataset on first use.
+
+        Must be called before iterating.
+
+        :returns: the number of data lines skipped
+        """
+        if data_line < line_index.LINE_INDEX_INTERVAL or self.dataset.datatype.is_binary:
+            return 0
+        file_name = self.dataset.get_file_name()
+        try:
+            index = line_index.get_line_index(file_name)
+            if index is None:
+                return 0
+            reopened = line_index.open_at_data_line(file_name, index, data_line)
+        except (OSError, zlib.error):
+            log.warning("Unable to use line index of dataset %s", self.dataset.id, exc_info=True)
+            return 0
+        if reopened is None:
+            return 0
+        self.source.close()
+        self.source, skipped = reopened
+        return skipped
+
     # TODO: this is a bit of a mess
     @classmethod
     def get_column_metadata_from_dataset(cls, dataset):
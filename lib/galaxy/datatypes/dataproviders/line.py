@@ -6,14 +6,12 @@ import collections
 import logging
 import re
 
+from galaxy.datatypes.util.line_scan import COMMENT_CHAR
 from . import base
 
 log = logging.getLogger(__name__)
 
 _TODO = """
-line offsets (skip to some place in a file) needs to work more efficiently than simply iterating till we're there
-    capture tell() when provider is done
-        def stop( self ): self.endpoint = source.tell(); raise StopIteration()
 a lot of the hierarchy here could be flattened since we're implementing pipes
 """
 
@@ -89,6 +87,11 @@ class FilteredLineDataProvider(base.LimitedOffsetDataProvider):
 
         return super().filter(line)
 
+    def can_use_line_index(self):
+        return (
+            self.filter_fn is None and self.strip_lines and not self.provide_blank and self.comment_char == COMMENT_CHAR
+        )
+
 
 class RegexLineDataProvider(FilteredLineDataProvider):
     """
@@ -130,6 +133,9 @@ class RegexLineDataProvider(FilteredLineDataProvider):
             line = self.filter_by_regex(line)
         return line
 
+    def can_use_line_index(self):
+        return super().can_use_line_index() and not self.compiled_regex_list
+
     def filter_by_regex(self, line):
         matches = any(regex.match(line) for regex in self.compiled_regex_list)
         if self.invert:
@@ -0,0 +1,211 @@
+"""
+Sparse line offset indexes for line based datasets.
+
+An index records a checkpoint every `interval` data lines: the number of data
+lines before the checkpoint and the (uncompressed) byte offset of the line
+starting there. Data lines are counted the way the line dataproviders count
+them with their default settings - lines that are neither blank nor comments
+once stripped - so a provider asked for an `offset` can seek to the closest
+checkpoint instead of reading and filtering every line before it.
+
+Indexes are built the first time a provider asks to skip at least one interval
+of data lines into a file, and kept in memory for the files paged through most
+recently - so setting metadata never pays for a full scan of the file.
+
+gzip compressed files can't be seeked into directly, so checkpoints there also
+record the compressed offset and uncompressed start of the gzip member the
+line is in. Reading starts at that member, which for block compressed (e.g.
+bgzip) files is close to the line and otherwise is the start of the file -
+skipping to the line is then left to zlib, which is still far cheaper than
+filtering lines one by one.
+"""
+
+import bisect
+import gzip
+import io
+import os
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from galaxy.datatypes.util.line_scan import (
+    count_data_lines,
+    is_data_line,
+)
+from galaxy.util.compression_utils import (
+    FileObjType,
+    is_bz2,
+    is_gzip,
+    is_xz,
+)
+
+# number of data lines between two checkpoints
+LINE_INDEX_INTERVAL = 10000
+# number of indexes kept in memory
+LINE_INDEX_CACHE_SIZE = 32
+READ_SIZE = 1 << 16
+GZIP_WBITS = zlib.MAX_WBITS | 16
+
+LineIndex = Dict[str, Any]
+
+# indexes by path, size and modification time of the file and interval, least recently used first
+_line_index_cache: "OrderedDict[Tuple[str, int, int, int], Optional[LineIndex]]" = OrderedDict()
+_line_index_cache_lock = threading.Lock()
+
+
+def get_line_index(path: str, interval: Optional[int] = None) -> Optional[LineIndex]:
+    """
+    Return the line index of the file at `path`, building it if it isn't cached
+    yet (or the file changed since), or `None` if the file can't be indexed.
+    """
+    interval = interval or LINE_INDEX_INTERVAL
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns, interval)
+    with _line_index_cache_lock:
+        if key in _line_index_cache:
+            _line_index_cache.move_to_end(key)
+            return _line_index_cache[key]
+    index = build_line_index(path, interval=interval)
+    with _line_index_cache_lock:
+        _line_index_cache[key] = index
+        while len(_line_index_cache) > LINE_INDEX_CACHE_SIZE:
+            _line_index_cache.popitem(last=False)
+    return index
+
+
+def build_line_index(path: str, interval: int = LINE_INDEX_INTERVAL) -> Optional[LineIndex]:
+    """
+    Scan the (optionally gzip compressed) file at `path` and return its line
+    index, or `None` for compression formats that can't be indexed.
+    """
+    if is_gzip(path):
+        compression = "gzip"
+    elif is_bz2(path) or is_xz(path) or zipfile.is_zipfile(path):
+        return None
+    else:
+        compression = None
+    data_lines = 0
+    next_checkpoint = interval
+    checkpoints: List[List[int]] = []
+    with open(path, "rb") as fh:
+        chunks = (
+            _iter_gzip_chunks(fh) if compression else ((0, 0, data) for data in iter(lambda: fh.read(READ_SIZE), b""))
+        )
+        for block_start, member_offset, member_start, block in _iter_line_blocks(chunks):
+            block_data_lines = count_data_lines(block)
+            if data_lines + block_data_lines < next_checkpoint:
+                data_lines += block_data_lines
+                continue
+            line_start = block_start
+            for line in block.splitlines(keepends=True):
+                if data_lines >= next_checkpoint:
+                    checkpoints.append([data_lines, line_start, member_offset, member_start])
+                    next_checkpoint += interval
+                data_lines += is_data_line(line)
+                line_start += len(line)
+    return {
+        "interval": interval,
+        "compression": compression,
+        "data_lines": data_lines,
+        "checkpoints": checkpoints,
+    }
+
+
+def open_at_data_line(
+    path: str, index: LineIndex, data_line: int, mode: str = "r"
+) -> Optional[Tuple[FileObjType, int]]:
+    """
+    Open the file at `path` positioned at the last checkpoint of `index` at or
+    before the (0-based) `data_line`.
+
+    :returns: the file object and the number of data lines before its position,
+        or `None` if there's no checkpoint before `data_line`
+    """
+    checkpoints = index["checkpoints"]
+    position = bisect.bisect_right([checkpoint[0] for checkpoint in checkpoints], data_line) - 1
+    if position < 0:
+        return None
+    skipped, offset, member_offset, member_start = checkpoints[position]
+    if index["compression"] == "gzip":
+        fh: FileObjType = _GzipMemberFile(path, member_offset)
+        fh.seek(offset - member_start)
+        if "b" not in mode:
+            fh = io.TextIOWrapper(fh, encoding="utf-8")
+    else:
+        if "b" in mode:
+            fh = open(path, "rb")
+        else:
+            fh = open(path, encoding="utf-8")
+        fh.seek(offset)
+    return fh, skipped
+
+
+class _GzipMemberFile(gzip.GzipFile):
+    """
+    A GzipFile reading `path` from the gzip member starting at `member_offset`.
+    """
+
+    def __init__(self, path: str, member_offset: int):
+        self._raw = open(path, "rb")
+        self._raw.seek(member_offset)
+        super().__init__(fileobj=self._raw, mode="rb")
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def _iter_gzip_chunks(fh) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Decompress a (possibly multi member) gzip file, yielding the compressed
+    offset and uncompressed start of the member each chunk belongs to along
+    with the chunk.
+    """
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    member_offset = member_start = uncompressed_read = 0
+    for chunk in iter(lambda: fh.read(READ_SIZE), b""):
+        while chunk:
+            data = decompressor.decompress(chunk)
+            if data:
+                yield member_offset, member_start, data
+                uncompressed_read += len(data)
+            if not decompressor.eof:
+                break
+            # the next member starts in the unused tail of what was read
+            chunk = decompressor.unused_data
+            member_offset, member_start = fh.tell() - len(chunk), uncompressed_read
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+
+
+def _iter_line_blocks(chunks: Iterator[Tuple[int, int, bytes]]) -> Iterator[Tuple[int, int, int, bytes]]:
+    """
+    Regroup chunks into blocks of whole lines, yielding the offset of each
+    block and the gzip member of its first line with the block.
+    """
+    pending = b""
+    pending_start = pending_member_offset = pending_member_start = 0
+    for member_offset, member_start, data in chunks:
+        if not pending:
+            pending_member_offset, pending_member_start = member_offset, member_start
+        end = data.rfind(b"\n") + 1
+        if not end:
+            pending += data
+            continue
+        block = pending + data[:end]
+        yield pending_start, pending_member_offset, pending_member_start, block
+        pending = data[end:]
+        pending_start += len(block)
+        pending_member_offset, pending_member_start = member_offset, member_start
+    if pending:
+        yield pending_start, pending_member_offset, pending_member_start, pending
@@ -40,6 +40,7 @@ from . import (
     xml,
 )
 from .display_applications.application import DisplayApplication
+from .sniff import SniffIndex
 
 if TYPE_CHECKING:
     from galaxy.datatypes.data import Data
@@ -95,6 +96,7 @@ class Registry:
         self.sniffer_elems = []
         self._registry_xml_string = None
         self._edam_formats_mapping = None
+        self._sniff_index: Optional[SniffIndex] = None
         self._edam_data_mapping = None
         self._converters_by_datatype = {}
         # Build sites
@@ -919,6 +921,13 @@ class Registry:
             rval["auto"] = rval["txt"]
         return rval
 
+    @property
+    def sniff_index(self) -> SniffIndex:
+        """Index of ``sniff_order`` narrowing down the sniffers to run on a file."""
+        if self._sniff_index is None or self._sniff_index.sniff_order != self.sniff_order:
+            self._sniff_index = SniffIndex(self.sniff_order)
+        return self._sniff_index
+
     @property
     def edam_formats(self):
         """ """
@@ -10,15 +10,21 @@ import os
 import re
 import shutil
 import struct
+import tarfile
 import tempfile
 import zipfile
 from functools import partial
 from typing import (
+    Any,
     Callable,
     Dict,
     IO,
+    Iterable,
+    Iterator,
+    List,
     NamedTuple,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -613,8 +619,18 @@ class FilePrefix:
         self.contents_header = contents_header
         self.contents_header_bytes = contents_header_bytes
         self._is_binary = None
+        self._is_tar = None
         self._file_size = None
 
+    @property
+    def is_tar(self) -> bool:
+        if self._is_tar is None:
+            try:
+                self._is_tar = tarfile.is_tarfile(self.filename)
+            except Exception:
+                self._is_tar = False
+        return self._is_tar
+
     @property
     def binary(self):
         if self._is_binary is None:
@@ -689,11 +705,77 @@ def _get_file_prefix(filename_or_file_prefix: Union[str, FilePrefix], auto_decom
     return filename_or_file_prefix
 
 
+def _could_sniff(datatype, compressed_format: Optional[str], binary: bool) -> bool:
+    """Check if ``datatype`` could match a file given its compression format and binary/text classification."""
+    datatype_compressed = getattr(datatype, "compressed", False)
+    if datatype_compressed and not compressed_format and not datatype.file_ext.endswith(".tar"):
+        # we don't auto-detect tar as compressed
+        return False
+    if not datatype_compressed and compressed_format:
+        return False
+    if binary != datatype.is_binary and not datatype.is_binary == "maybe":
+        # Binary detection doesn't match datatype ...
+        compressed_data_for_compressed_text_datatype = (
+            binary and compressed_format and datatype_compressed and not datatype.is_binary
+        )
+        if not compressed_data_for_compressed_text_datatype:
+            # ... and mismatch is not due to compressed text data for a compressed text datatype
+            return False
+    if hasattr(datatype, "sniff_prefix") and compressed_format and getattr(datatype, "compressed_format", None):
+        # Compare the compressed format detected to the expected.
+        if compressed_format != datatype.compressed_format:
+            return False
+    return True
+
+
+class SniffIndex:
+    """Narrow down the datatypes of a sniff order to those that could match a file.
+
+    Candidates are computed once per compression format and binary/text
+    classification of files. Datatypes declaring ``magic_bytes`` are only
+    considered if the file starts with one of them, datatypes declaring
+    ``sniff_requires_tar`` only if the file is a tar archive (which is checked
+    once per file instead of once per sniffer). The order of the sniff
+    order is preserved, so running the candidates gives the same result as
+    running all sniffers.
+    """
+
+    def __init__(self, sniff_order: Iterable[Any]):
+        self.sniff_order = list(sniff_order)
+        self._candidates: Dict[Tuple[Optional[str], bool], List[Any]] = {}
+
+    def candidates(self, file_prefix: FilePrefix) -> Iterator[Any]:
+        key = (file_prefix.compressed_format, file_prefix.binary)
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            candidates = [datatype for datatype in self.sniff_order if _could_sniff(datatype, *key)]
+            self._candidates[key] = candidates
+        header_bytes = file_prefix.contents_header_bytes
+        for datatype in candidates:
+            magic_bytes = getattr(datatype, "magic_bytes", None)
+            if magic_bytes and header_bytes is not None and not header_bytes.startswith(magic_bytes):
+                continue
+            if getattr(datatype, "sniff_requires_tar", False) and not file_prefix.is_tar:
+                continue
+            yield datatype
+
+
 def run_sniffers_raw(file_prefix: FilePrefix, sniff_order):
-    """Run through sniffers specified by sniff_order, return None of None match."""
+    """Run through sniffers specified by sniff_order, return None of None match.
+
+    ``sniff_order`` is either a list of datatypes or a :class:`SniffIndex` built from one.
+    """
     fname = file_prefix.filename
     file_ext = None
-    for datatype in sniff_order:
+    if isinstance(sniff_order, SniffIndex):
+        datatypes = sniff_order.candidates(file_prefix)
+    else:
+        datatypes = (
+            datatype
+            for datatype in sniff_order
+            if _could_sniff(datatype, file_prefix.compressed_format, file_prefix.binary)
+        )
+    for datatype in datatypes:
         """
         Some classes may not have a sniff function, which is ok.  In fact,
         Binary, Data, Tabular and Text are examples of classes that should never
@@ -702,27 +784,8 @@ def run_sniffers_raw(file_prefix: FilePrefix, sniff_order):
         from this function after all other datatypes in sniff_order have not been
         successfully discovered.
         """
-        datatype_compressed = getattr(datatype, "compressed", False)
-        if datatype_compressed and not file_prefix.compressed_format and not datatype.file_ext.endswith(".tar"):
-            # we don't auto-detect tar as compressed
-            continue
-        if not datatype_compressed and file_prefix.compressed_format:
-            continue
-        if file_prefix.binary != datatype.is_binary and not datatype.is_binary == "maybe":
-            # Binary detection doesn't match datatype ...
-            compressed_data_for_compressed_text_datatype = (
-                file_prefix.binary and file_prefix.compressed_format and datatype_compressed and not datatype.is_binary
-            )
-            if not compressed_data_for_compressed_text_datatype:
-                # ... and mismatch is not due to compressed text data for a compressed text datatype
-                continue
         try:
             if hasattr(datatype, "sniff_prefix"):
-                if file_prefix.compressed_format and getattr(datatype, "compressed_format", None):
-                    # Compare the compressed format detected
-                    # to the expected.
-                    if file_prefix.compressed_format != datatype.compressed_format:
-                        continue
                 if datatype.sniff_prefix(file_prefix):
                     file_ext = datatype.file_ext
                     break
@@ -819,8 +882,8 @@ def handle_compressed_file(
     if is_compressed and is_valid:
         if ext in AUTO_DETECT_EXTENSIONS:
             # attempt to sniff for a keep-compressed datatype (observing the sniff order)
-            sniff_datatypes = filter(lambda d: getattr(d, "compressed", False), datatypes_registry.sniff_order)
-            sniffed_ext = run_sniffers_raw(file_prefix, sniff_datatypes)
+            # (the sniff index only considers compressed datatypes for compressed files)
+            sniffed_ext = run_sniffers_raw(file_prefix, datatypes_registry.sniff_index)
             if sniffed_ext:
                 ext = sniffed_ext
                 keep_compressed = True
@@ -916,7 +979,7 @@ def handle_uploaded_dataset_file_internal(
             # TODO: skip this if we haven't actually converted the dataset
             guessed_ext = guess_ext(
                 converted_path,
-                sniff_order=datatypes_registry.sniff_order,
+                sniff_order=datatypes_registry.sniff_index,
                 auto_decompress=file_prefix.auto_decompress,
             )
 
@@ -932,7 +995,7 @@ def handle_uploaded_dataset_file_internal(
                 assert _converted_path
                 converted_path = _converted_path
             if ext in AUTO_DETECT_EXTENSIONS:
-                ext = guess_ext(converted_path, sniff_order=datatypes_registry.sniff_order)
+                ext = guess_ext(converted_path, sniff_order=datatypes_registry.sniff_index)
         else:
             ext = guessed_ext
 
@@ -11,6 +11,7 @@ import re
 import shutil
 import subprocess
 import tempfile
+from itertools import zip_longest
 from json import dumps
 from typing import (
     cast,
@@ -65,6 +66,7 @@ from galaxy.datatypes.sniff import (
     iter_headers,
     validate_tabular,
 )
+from galaxy.datatypes.util import line_scan
 from galaxy.exceptions import InvalidFileFormatError
 from galaxy.util import compression_utils
 from galaxy.util.compression_utils import (
@@ -516,53 +518,113 @@ class Tabular(TabularData):
         column_names = None
         column_types: List = []
         first_line_column_types = []
+
+        def set_line_meta(raw_line):
+            nonlocal data_lines, comment_lines, column_names, column_types, first_line_column_types
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+            if i == 0:
+                column_names = self.get_column_names(first_line=line)
+            if i < skip or not line or line.startswith("#"):
+                # We'll call blank lines comments
+                comment_lines += 1
+            else:
+                data_lines += 1
+                if max_guess_type_data_lines is None or data_lines <= max_guess_type_data_lines:
+                    fields = line.split("\t")
+                    for field_count, field in enumerate(fields):
+                        if field_count >= len(column_types):  # found a previously unknown column, we append None
+                            column_types.append(None)
+                        column_type = guess_column_type(field)
+                        if type_overrules_type(column_type, column_types[field_count]):
+                            column_types[field_count] = column_type
+                if i == 0 and requested_skip is None:
+                    # This is our first line, people seem to like to upload files that have a header line, but do not
+                    # start with '#' (i.e. all column types would then most likely be detected as str).  We will assume
+                    # that the first line is always a header (this was previous behavior - it was always skipped).  When
+                    # the requested skip is None, we only use the data from the first line if we have no other data for
+                    # a column.  This is far from perfect, as
+                    # 1,2,3	1.1	2.2	qwerty
+                    # 0	0		1,2,3
+                    # will be detected as
+                    # "column_types": ["int", "int", "float", "list"]
+                    # instead of
+                    # "column_types": ["list", "float", "float", "str"]  *** would seem to be the 'Truth' by manual
+                    # observation that the first line should be included as data.  The old method would have detected as
+                    # "column_types": ["int", "int", "str", "list"]
+                    first_line_column_types = column_types
+                    column_types = [None for col in first_line_column_types]
+
+        def set_lines_meta(raw_lines):
+            # Same as calling set_line_meta for each line past the header and skipped lines, but guessing the types
+            # of all values of a column at once.
+            nonlocal data_lines, comment_lines
+            block = b"".join(raw_lines)
+            if not block.isascii():
+                # fail on undecodable lines, as set_line_meta would
+                block.decode("utf-8")
+            elif line_scan.is_plain_block(block):
+                block_comment_lines = line_scan.count_tabular_comment_lines(block)
+                block_data_lines = len(raw_lines) - block_comment_lines
+                if max_guess_type_data_lines is not None and data_lines >= max_guess_type_data_lines:
+                    columns = []
+                elif max_guess_type_data_lines is None or data_lines + block_data_lines <= max_guess_type_data_lines:
+                    # usually there are no comments and all lines have the same number of fields
+                    columns = line_scan.split_tabular_columns(block)
+                else:
+                    columns = None
+                if columns is not None:
+                    comment_lines += block_comment_lines
+                    data_lines += block_data_lines
+                    line_scan.widen_column_types(column_types, columns, guess_column_type)
+                    return
+            lines = [raw_line.rstrip(b"\r\n") for raw_line in raw_lines]
+            data = [line for line in lines if line and not line.startswith(b"#")]
+            comment_lines += len(lines) - len(data)
+            guessed = data
+            if max_guess_type_data_lines is not None:
+                guessed = data[: max(max_guess_type_data_lines - data_lines, 0)]
+            data_lines += len(data)
+            columns = list(zip_longest(*(line.split(b"\t") for line in guessed), fillvalue=b""))
+            line_scan.widen_column_types(column_types, columns, guess_column_type)
+
+        def lines_until_max_data_lines(raw_lines):
+            # number of lines up to the one where data_lines reaches max_data_lines, or all of them
+            if max_data_lines is None or data_lines + len(raw_lines) < max_data_lines:
+                return len(raw_lines)
+            missing_data_lines = max_data_lines - data_lines
+            for line_count, raw_line in enumerate(raw_lines, start=1):
+                if (line := raw_line.rstrip(b"\r\n")) and not line.startswith(b"#"):
+                    missing_data_lines -= 1
+                if missing_data_lines <= 0:
+                    return line_count
+            return len(raw_lines)
+
         if dataset.has_data():
             # NOTE: if skip > num_check_lines, we won't detect any metadata, and will use default
-            with compression_utils.get_fileobj(dataset.get_file_name()) as dataset_fh:
+            with compression_utils.get_fileobj(dataset.get_file_name(), "rb") as dataset_fh:
                 i = 0
-                for line in iter(dataset_fh.readline, ""):
-                    line = line.rstrip("\r\n")
-                    if i == 0:
-                        column_names = self.get_column_names(first_line=line)
-                    if i < skip or not line or line.startswith("#"):
-                        # We'll call blank lines comments
-                        comment_lines += 1
+                position = 0
+                # read large blocks of lines, setting metadata for the first and skipped lines one by one and for
+                # the rest of a block all at once
+                blocks = line_scan.iter_line_blocks(dataset_fh)
+                raw_lines: List[bytes] = []
+                while raw_lines or (raw_lines := next(blocks, b"").splitlines(keepends=True)):
+                    if i == 0 or i < skip:
+                        consumed = raw_lines[:1]
+                        set_line_meta(consumed[0])
                     else:
-                        data_lines += 1
-                        if max_guess_type_data_lines is None or data_lines <= max_guess_type_data_lines:
-                            fields = line.split("\t")
-                            for field_count, field in enumerate(fields):
-                                if field_count >= len(
-                                    column_types
-                                ):  # found a previously unknown column, we append None
-                                    column_types.append(None)
-                                column_type = guess_column_type(field)
-                                if type_overrules_type(column_type, column_types[field_count]):
-                                    column_types[field_count] = column_type
-                        if i == 0 and requested_skip is None:
-                            # This is our first line, people seem to like to upload files that have a header line, but do not
-                            # start with '#' (i.e. all column types would then most likely be detected as str).  We will assume
-                            # that the first line is always a header (this was previous behavior - it was always skipped).  When
-                            # the requested skip is None, we only use the data from the first line if we have no other data for
-                            # a column.  This is far from perfect, as
-                            # 1,2,3	1.1	2.2	qwerty
-                            # 0	0		1,2,3
-                            # will be detected as
-                            # "column_types": ["int", "int", "float", "list"]
-                            # instead of
-                            # "column_types": ["list", "float", "float", "str"]  *** would seem to be the 'Truth' by manual
-                            # observation that the first line should be included as data.  The old method would have detected as
-                            # "column_types": ["int", "int", "str", "list"]
-                            first_line_column_types = column_types
-                            column_types = [None for col in first_line_column_types]
+                        consumed = raw_lines[: lines_until_max_data_lines(raw_lines)]
+                        set_lines_meta(consumed)
+                    raw_lines = raw_lines[len(consumed) :]
+                    i += len(consumed)
+                    position += sum(map(len, consumed))
                     if max_data_lines is not None and data_lines >= max_data_lines:
-                        if dataset_fh.tell() != dataset.get_size():
+                        if position != dataset.get_size():
                             # Clear optional data_lines metadata value
                             data_lines = None  # type: ignore [assignment]
                             # Clear optional comment_lines metadata value; additional comment lines could appear below this point
                             comment_lines = None  # type: ignore [assignment]
                         break
-                    i += 1
 
         # we error on the larger number of columns
         # first we pad our column_types by using data from first line
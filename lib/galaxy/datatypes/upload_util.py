@@ -76,7 +76,7 @@ def handle_upload(
         except sniff.InappropriateDatasetContentError as exc:
             raise UploadProblemException(exc)
     elif requested_ext == "auto":
-        ext = sniff.guess_ext(file_prefix, registry.sniff_order)
+        ext = sniff.guess_ext(file_prefix, registry.sniff_index)
     else:
         ext = requested_ext
 
@@ -0,0 +1,211 @@
+"""
+Scan line based files in large blocks of bytes rather than line by line.
+
+Line endings follow Python's universal newlines (``\\n``, ``\\r\\n`` and a
+lone ``\\r``), like the text mode file objects these helpers replace, and
+results are the same as doing the work on each decoded line.
+"""
+
+import re
+from itertools import repeat
+from typing import (
+    Callable,
+    IO,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+BLOCK_SIZE = 1 << 20
+COMMENT_CHAR = "#"
+_COMMENT_BYTES = COMMENT_CHAR.encode()
+# characters str.strip() removes from ASCII text
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+_WS = rb"[ \x0b\x0c\r\x1c-\x1f]*"
+# the first line of an ASCII block, and the ends of lines followed by a line, that is blank or a comment once stripped
+_NON_DATA_FIRST_LINE_RE = re.compile(rb"[ \t\x0b\x0c\r\x1c-\x1f]*(?:#|\n)")
+_NON_DATA_LINE_RE = re.compile(rb"\n(?=[ \t\x0b\x0c\r\x1c-\x1f]*(?:#|\n))")
+# ends of lines followed by a line that is a comment for tabular metadata (empty or starting with #, not stripped)
+_TABULAR_NON_DATA_LINE_RE = re.compile(rb"\n(?=#|\r?\n)")
+
+# Tabular column types from narrowest to widest, a column has the widest type of its values.
+COLUMN_TYPES = ("int", "float", "list", "str")
+# the patterns below are for values without tabs or newlines
+# int() and float() strip less whitespace than str.strip()
+_NUMBER_WS = rb"[ \x0b\x0c\r]*"
+_INT = _NUMBER_WS + rb"[+-]?[0-9]+" + _NUMBER_WS
+# what float() accepts, plus 'na' (without sign)
+_FLOAT = (
+    rb"(?:"
+    + _NUMBER_WS
+    + rb"[+-]?(?:(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|(?i:inf|infinity|nan))"
+    + _NUMBER_WS
+    + rb"|"
+    + _WS
+    + rb"(?i:na)"
+    + _WS
+    + rb")"
+)
+_LIST = rb"(?:" + _FLOAT + rb"|[^\t\n]*,[^\t\n]*)"
+_DIGITS = b"0123456789"
+
+
+def _values_re(value: bytes) -> "re.Pattern[bytes]":
+    # newline separated values that are each empty or match `value`
+    return re.compile(rb"(?:" + value + rb")?(?:\n(?:" + value + rb")?)*")
+
+
+def _digit_values(values: bytes) -> bool:
+    # newline separated values that are each empty or digits only
+    return not values.translate(None, _DIGITS + b"\n")
+
+
+def _decimal_values(values: bytes) -> bool:
+    # newline separated values that are each empty, 'NA' or digits with at most one point (and not just the point)
+    padded = b"\n" + values + b"\n"
+    if b"N" in values or b"n" in values:
+        for na in (b"\nNA\n", b"\nna\n"):
+            # twice, replacing consumes the newline starting an adjacent 'NA'
+            padded = padded.replace(na, b"\n\n").replace(na, b"\n\n")
+    residue = padded.translate(None, _DIGITS)
+    return not residue.translate(None, b".\n") and b".." not in residue and b"\n.\n" not in padded
+
+
+def _list_values(values: bytes) -> bool:
+    # newline separated values that each contain a comma or pass the float check
+    return _decimal_values(b"\n".join(value for value in values.split(b"\n") if b"," not in value))
+
+
+# ASCII values of a column no wider than each type: a quick check for the
+# common cases, that may reject valid values, and then an exact one
+_COLUMN_VALUES_CHECKS = (
+    ("int", _digit_values, _values_re(_INT).fullmatch),
+    ("float", _decimal_values, _values_re(_FLOAT).fullmatch),
+    ("list", _list_values, _values_re(_LIST).fullmatch),
+)
+
+
+def iter_line_blocks(fh: IO[bytes], block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    Read `fh` in blocks of about `block_size` bytes, each ending with a
+    complete line (apart from a last line without line ending).
+    """
+    pending = b""
+    for data in iter(lambda: fh.read(block_size), b""):
+        end = data.rfind(b"\n") + 1
+        if not end:
+            pending += data
+            continue
+        yield pending + data[:end]
+        pending = data[end:]
+    if pending:
+        yield pending
+
+
+def count_data_lines(block: bytes) -> int:
+    """
+    Count the lines of `block` that are neither blank nor a comment once stripped.
+    """
+    # lone carriage returns end lines in text mode, but not for the regular expression
+    if is_plain_block(block):
+        lines = block.count(b"\n") + (not block.endswith(b"\n"))
+        non_data_lines = bool(_NON_DATA_FIRST_LINE_RE.match(block)) + len(_NON_DATA_LINE_RE.findall(block))
+        return lines - non_data_lines - _is_non_data_last_line(block)
+    return sum(is_data_line(line) for line in block.splitlines())
+
+
+def _is_non_data_last_line(block: bytes) -> bool:
+    # a last line without line ending isn't matched by the regular expression when blank
+    if block.endswith(b"\n"):
+        return False
+    last_line = block[block.rfind(b"\n") + 1 :]
+    return not last_line.strip(_ASCII_WHITESPACE)
+
+
+def is_data_line(line: bytes) -> bool:
+    if line.isascii():
+        stripped = line.strip(_ASCII_WHITESPACE)
+        return bool(stripped) and not stripped.startswith(_COMMENT_BYTES)
+    text = line.decode("utf-8", errors="replace").strip()
+    return bool(text) and not text.startswith(COMMENT_CHAR)
+
+
+def widest_column_type(column_type: Optional[str], other_column_type: Optional[str]) -> Optional[str]:
+    if column_type is None:
+        return other_column_type
+    if other_column_type is None:
+        return column_type
+    return max(column_type, other_column_type, key=COLUMN_TYPES.index)
+
+
+def widen_column_types(
+    column_types: List[Optional[str]],
+    columns: Sequence[Sequence[bytes]],
+    guess_column_type: Callable[[str], Optional[str]],
+) -> None:
+    """
+    Widen `column_types` in place to fit the values of `columns`, appending a
+    `None` type for previously unknown columns.
+
+    Columns of ASCII values are checked all at once, others fall back to
+    `guess_column_type` for each (decoded) value. Empty values have no type.
+    """
+    column_types.extend([None] * (len(columns) - len(column_types)))
+    for column, values in enumerate(columns):
+        column_type = column_types[column]
+        if column_type == COLUMN_TYPES[-1] or not any(values):
+            continue
+        joined = b"\n".join(values)
+        if joined.isascii():
+            for values_type, quick_check, check in _COLUMN_VALUES_CHECKS:
+                if widest_column_type(column_type, values_type) != values_type:
+                    continue
+                if (quick_check and quick_check(joined)) or check(joined):
+                    break
+            else:
+                values_type = COLUMN_TYPES[-1]
+        else:
+            values_type = None
+            for value in values:
+                values_type = widest_column_type(values_type, guess_column_type(value.decode("utf-8")))
+                if values_type == COLUMN_TYPES[-1]:
+                    break
+        column_types[column] = widest_column_type(column_type, values_type)
+
+
+def is_plain_block(block: bytes) -> bool:
+    """
+    Is `block` ASCII text with ``\\n`` or ``\\r\\n`` line endings only?
+    """
+    return block.isascii() and block.count(b"\r") == block.count(b"\r\n")
+
+
+def count_tabular_comment_lines(block: bytes) -> int:
+    """
+    Count the lines of a plain block that are empty or start with ``#``, the
+    lines tabular metadata counts as comments.
+    """
+    first_line = block.startswith((_COMMENT_BYTES, b"\n", b"\r\n"))
+    return first_line + len(_TABULAR_NON_DATA_LINE_RE.findall(block))
+
+
+def split_tabular_columns(block: bytes) -> Optional[List[Sequence[bytes]]]:
+    """
+    Split the data lines of a plain block into columns of values, or return
+    `None` if it has comment lines or lines with different numbers of fields.
+    """
+    if block.startswith(_COMMENT_BYTES) or b"\n#" in block:
+        return None
+    data = block.replace(b"\r\n", b"\n") if b"\r" in block else block
+    while b"\n\n" in data:
+        data = data.replace(b"\n\n", b"\n")
+    data = data.strip(b"\n")
+    if not data:
+        return []
+    tabs = set(map(bytes.count, data.split(b"\n"), repeat(b"\t")))
+    if len(tabs) != 1:
+        return None
+    width = tabs.pop() + 1
+    fields = data.replace(b"\n", b"\t").split(b"\t")
+    return [fields[column::width] for column in range(width)]
@@ -314,6 +314,7 @@ class JobConfiguration(ConfiguresHandlers):
     DEFAULT_NWORKERS = 4
 
     DEFAULT_HANDLER_READY_WINDOW_SIZE = 100
+    DEFAULT_HANDLER_READY_RECONCILE_INTERVAL = 300
 
     JOB_RESOURCE_CONDITIONAL_XML = """<conditional name="__job_resource">
         <param name="__job_resource__select" type="select" label="Job Resource Parameters">
@@ -336,6 +337,9 @@ class JobConfiguration(ConfiguresHandlers):
         self.handler_assignment_methods_configured = False
         self.handler_max_grab = None
         self.handler_ready_window_size = None
+        self.handler_incremental_ready_check = False
+        self.handler_ready_reconcile_interval = JobConfiguration.DEFAULT_HANDLER_READY_RECONCILE_INTERVAL
+        self.handler_prefetch_inputs = False
         self.destinations = {}
         self.default_destination_id = None
         self.tools = {}
@@ -448,6 +452,13 @@ class JobConfiguration(ConfiguresHandlers):
         self.handler_ready_window_size = int(
             handling_config_dict.get("ready_window_size", JobConfiguration.DEFAULT_HANDLER_READY_WINDOW_SIZE)
         )
+        self.handler_incremental_ready_check = util.asbool(handling_config_dict.get("incremental_ready_check", False))
+        self.handler_ready_reconcile_interval = int(
+            handling_config_dict.get(
+                "ready_reconcile_interval", JobConfiguration.DEFAULT_HANDLER_READY_RECONCILE_INTERVAL
+            )
+        )
+        self.handler_prefetch_inputs = util.asbool(handling_config_dict.get("prefetch_inputs", False))
 
         # Parse environments
         job_metrics = self.app.job_metrics
@@ -2022,22 +2033,20 @@ class MinimalJobWrapper(HasResourceParameters):
             job.exit_code = tool_exit_code
         # custom post process setup
 
-        collected_bytes = 0
-        quota_source_info = None
+        collected_hdas = []
         # Once datasets are collected, set the total dataset size (includes extra files)
         for dataset_assoc in job.output_datasets:
             dataset = dataset_assoc.dataset.dataset
-            # assume all datasets in a job get written to the same objectstore
-            quota_source_info = dataset.quota_source_info
-            collected_bytes += dataset.set_total_size()
+            dataset.set_total_size()
             if dataset.purged:
                 # Purge, in case job wrote directly to object store
                 dataset.full_delete()
-                collected_bytes = 0
+            else:
+                collected_hdas.append(dataset_assoc.dataset)
 
         user = job.user
-        if user and collected_bytes > 0 and quota_source_info is not None and quota_source_info.use:
-            user.adjust_total_disk_usage(collected_bytes, quota_source_info.label)
+        if user and collected_hdas:
+            user.adjust_dataset_usage(collected_hdas, 0)
 
         # Certain tools require tasks to be completed after job execution
         # ( this used to be performed in the "exec_after_process" hook, but hooks are deprecated ).
@@ -2356,6 +2365,7 @@ class MinimalJobWrapper(HasResourceParameters):
             job=job,
             max_metadata_value_size=self.app.config.max_metadata_value_size,
             max_discovered_files=self.app.config.max_discovered_files,
+            max_metadata_processes=self.app.config.max_metadata_processes,
             validate_outputs=self.validate_outputs,
             link_data_only=self.__link_file_check(),
             **kwds,
@@ -0,0 +1,94 @@
+"""
+In-memory index of the input datasets that ``new`` jobs are waiting on.
+
+Used by the job handler queue to find jobs whose inputs became ready without
+re-running the full ready-to-run query on every monitor iteration.
+"""
+
+from collections import defaultdict
+from typing import (
+    Dict,
+    Iterable,
+    Set,
+)
+
+
+class JobDependencyIndex:
+    """Track which not-ready datasets block which waiting jobs.
+
+    Jobs are added with the ids of the datasets they still wait on. When
+    datasets transition out of a non-ready state (ok, error, deleted, ...)
+    :meth:`datasets_changed` is called and every job that no longer waits on
+    anything becomes a candidate to be (re-)evaluated by the handler.
+    """
+
+    def __init__(self):
+        # job id -> ids of datasets the job is still waiting on
+        self._blocked_by: Dict[int, Set[int]] = {}
+        # dataset id -> ids of jobs waiting on the dataset
+        self._dependents: Dict[int, Set[int]] = defaultdict(set)
+        # ids of tracked jobs that don't wait on any dataset
+        self._ready: Set[int] = set()
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._blocked_by or job_id in self._ready
+
+    def __len__(self) -> int:
+        return len(self._blocked_by) + len(self._ready)
+
+    @property
+    def job_ids(self) -> Set[int]:
+        return set(self._blocked_by) | self._ready
+
+    @property
+    def ready_job_ids(self) -> Set[int]:
+        return set(self._ready)
+
+    @property
+    def blocking_dataset_ids(self) -> Set[int]:
+        return set(self._dependents)
+
+    def clear(self):
+        self._blocked_by.clear()
+        self._dependents.clear()
+        self._ready.clear()
+
+    def add_job(self, job_id: int, blocking_dataset_ids: Iterable[int] = ()):
+        """Start tracking ``job_id`` (replacing any previous entry)."""
+        self.remove_jobs((job_id,))
+        blocking = set(blocking_dataset_ids)
+        if blocking:
+            self._blocked_by[job_id] = blocking
+            for dataset_id in blocking:
+                self._dependents[dataset_id].add(job_id)
+        else:
+            self._ready.add(job_id)
+
+    def remove_jobs(self, job_ids: Iterable[int]):
+        """Stop tracking jobs, e.g. because they were dispatched or left the ``new`` state."""
+        for job_id in job_ids:
+            self._ready.discard(job_id)
+            for dataset_id in self._blocked_by.pop(job_id, ()):
+                dependents = self._dependents.get(dataset_id)
+                if dependents is not None:
+                    dependents.discard(job_id)
+                    if not dependents:
+                        del self._dependents[dataset_id]
+
+    def datasets_changed(self, dataset_ids: Iterable[int]) -> Set[int]:
+        """Record that datasets left their non-ready state.
+
+        Returns the ids of jobs that became ready as a consequence.
+        """
+        newly_ready = set()
+        for dataset_id in dataset_ids:
+            for job_id in self._dependents.pop(dataset_id, ()):
+                blocking = self._blocked_by.get(job_id)
+                if blocking is None:
+                    continue
+                blocking.discard(dataset_id)
+                if not blocking:
+                    del self._blocked_by[job_id]
+                    self._ready.add(job_id)
+                    newly_ready.add(job_id)
+        return newly_ready
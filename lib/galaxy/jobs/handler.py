@@ -13,12 +13,18 @@ from queue import (
 from typing import (
     Dict,
     List,
+    Optional,
+    Set,
     Tuple,
     Type,
     Union,
 )
 
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import (
+    joinedload,
+    selectinload,
+)
 from sqlalchemy.sql.expression import (
     and_,
     func,
@@ -36,6 +42,7 @@ from galaxy.jobs import (
     JobWrapper,
     TaskWrapper,
 )
+from galaxy.jobs.dependency_index import JobDependencyIndex
 from galaxy.jobs.mapper import JobNotReadyException
 from galaxy.managers.jobs import get_jobs_to_check_at_startup
 from galaxy.model.base import (
@@ -43,7 +50,10 @@ from galaxy.model.base import (
     transaction,
 )
 from galaxy.structured_app import MinimalManagerApp
-from galaxy.util import unicodify
+from galaxy.util import (
+    chunk_iterable,
+    unicodify,
+)
 from galaxy.util.custom_logging import get_logger
 from galaxy.util.monitors import Monitors
 from galaxy.web_stack.handlers import HANDLER_ASSIGNMENT_METHODS
@@ -255,6 +265,14 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         self.waiting_jobs: List[int] = []
         # Contains wrappers of jobs that are limited or ready (so they aren't created unnecessarily/multiple times)
         self.job_wrappers: Dict[int, JobWrapper] = {}
+        # Tracks the not-ready inputs of new jobs if ready jobs are detected incrementally (only use from monitor thread)
+        self.dependency_index: Optional[JobDependencyIndex] = None
+        if self.track_jobs_in_database and self.app.job_config.handler_incremental_ready_check:
+            self.dependency_index = JobDependencyIndex()
+        self._last_ready_reconcile: Optional[float] = None
+        # Maps ids of jobs waiting on limits to the ids of the input datasets being prefetched into the object store
+        # cache (only use from monitor thread)
+        self.prefetched_inputs: Dict[int, List[int]] = {}
         name = "JobHandlerQueue.monitor_thread"
         self._init_monitor_thread(name, target=self.__monitor, config=app.config)
         self.job_grabber = None
@@ -413,67 +431,10 @@ class JobHandlerQueue(BaseJobHandlerQueue):
             # Clear the session so we get fresh states for job and all datasets
             self.sa_session.expunge_all()
             # Fetch all new jobs
-            hda_not_ready = (
-                self.sa_session.query(model.Job.id)
-                .enable_eagerloads(False)
-                .join(model.JobToInputDatasetAssociation)
-                .join(model.HistoryDatasetAssociation)
-                .join(model.Dataset)
-                .filter(
-                    and_(
-                        model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states)
-                    )
-                )
-                .subquery()
-            )
-            ldda_not_ready = (
-                self.sa_session.query(model.Job.id)
-                .enable_eagerloads(False)
-                .join(model.JobToInputLibraryDatasetAssociation)
-                .join(model.LibraryDatasetDatasetAssociation)
-                .join(model.Dataset)
-                .filter(
-                    and_(
-                        model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states)
-                    )
-                )
-                .subquery()
-            )
-            coalesce_exp = func.coalesce(
-                model.Job.table.c.user_id, model.Job.table.c.session_id
-            )  # accommodate jobs by anonymous users
-            rank = func.rank().over(partition_by=coalesce_exp, order_by=model.Job.table.c.id).label("rank")
-            job_filter_conditions = (
-                (model.Job.state == model.Job.states.NEW),
-                (model.Job.handler == self.app.config.server_name),
-                ~model.Job.table.c.id.in_(select(hda_not_ready)),
-                ~model.Job.table.c.id.in_(select(ldda_not_ready)),
-            )
-            if self.app.config.user_activation_on:
-                job_filter_conditions = job_filter_conditions + (
-                    or_((model.Job.user_id == null()), (model.User.active == true())),
-                )
-            if self.sa_session.bind.name == "sqlite":
-                query_objects = (model.Job,)
+            if self.dependency_index is not None:
+                jobs_to_check = self.__get_ready_jobs_incremental()
             else:
-                query_objects = (model.Job, rank)
-            ready_query = (
-                self.sa_session.query(*query_objects)
-                .enable_eagerloads(False)
-                .outerjoin(model.User)
-                .filter(and_(*job_filter_conditions))
-                .order_by(model.Job.id)
-            )
-            if self.sa_session.bind.name == "sqlite":
-                jobs_to_check = ready_query.all()
-            else:
-                ranked = ready_query.subquery()
-                jobs_to_check = (
-                    self.sa_session.query(model.Job)
-                    .join(ranked, model.Job.id == ranked.c.id)
-                    .filter(ranked.c.rank <= self.app.job_config.handler_ready_window_size)
-                    .all()
-                )
+                jobs_to_check = self.__get_ready_jobs()
             # Filter jobs with invalid input states
             jobs_to_check = self.__filter_jobs_with_invalid_input_states(jobs_to_check)
             # Fetch all "resubmit" jobs
@@ -507,13 +468,15 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                 pass
         # Ensure that we get new job counts on each iteration
         self.__clear_job_count()
+        # Load what is needed to check the limits of all jobs at once instead of job by job
+        self.__prefetch_job_readiness(jobs_to_check)
         # Check resubmit jobs first so that limits of new jobs will still be enforced
         for job in resubmit_jobs:
             log.debug("(%s) Job was resubmitted and is being dispatched immediately", job.id)
             # Reassemble resubmit job destination from persisted value
             jw = self.__recover_job_wrapper(job)
             if jw.is_ready_for_resubmission(job):
-                self.increase_running_job_count(job.user_id, jw.job_destination.id)
+                self.increase_running_job_count(job.user_id, jw.job_destination.id, session_id=job.session_id)
                 self.dispatcher.put(jw)
         # Iterate over new and waiting jobs and look for any that are
         # ready to run
@@ -548,6 +511,7 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                     log.info("(%d) Job unable to run: one or more inputs deleted" % job.id)
                 elif job_state == JOB_READY:
                     self.dispatcher.put(self.job_wrappers.pop(job.id))
+                    self.prefetched_inputs.pop(job.id, None)
                     log.info("(%d) Job dispatched" % job.id)
                 elif job_state == JOB_DELETED:
                     log.info("(%d) Job deleted by user while still queued" % job.id)
@@ -581,10 +545,186 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         # Remove cached wrappers for any jobs that are no longer being tracked
         for id in set(self.job_wrappers.keys()) - set(new_waiting_jobs):
             del self.job_wrappers[id]
+        # Stop prefetching inputs of jobs that are no longer waiting (e.g. because they were deleted)
+        if self.prefetched_inputs:
+            self.__cancel_input_prefetches(set(new_waiting_jobs))
         # Commit updated state
         with transaction(self.sa_session):
             self.sa_session.commit()
 
+    def __get_ready_jobs(self):
+        """
+        Query for all new jobs assigned to this handler whose inputs are ready, limited to
+        ``handler_ready_window_size`` jobs per user.
+        """
+        hda_not_ready = (
+            self.sa_session.query(model.Job.id)
+            .enable_eagerloads(False)
+            .join(model.JobToInputDatasetAssociation)
+            .join(model.HistoryDatasetAssociation)
+            .join(model.Dataset)
+            .filter(
+                and_(model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states))
+            )
+            .subquery()
+        )
+        ldda_not_ready = (
+            self.sa_session.query(model.Job.id)
+            .enable_eagerloads(False)
+            .join(model.JobToInputLibraryDatasetAssociation)
+            .join(model.LibraryDatasetDatasetAssociation)
+            .join(model.Dataset)
+            .filter(
+                and_(model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states))
+            )
+            .subquery()
+        )
+        coalesce_exp = func.coalesce(
+            model.Job.table.c.user_id, model.Job.table.c.session_id
+        )  # accommodate jobs by anonymous users
+        rank = func.rank().over(partition_by=coalesce_exp, order_by=model.Job.table.c.id).label("rank")
+        job_filter_conditions = (
+            (model.Job.state == model.Job.states.NEW),
+            (model.Job.handler == self.app.config.server_name),
+            ~model.Job.table.c.id.in_(select(hda_not_ready)),
+            ~model.Job.table.c.id.in_(select(ldda_not_ready)),
+        )
+        if self.app.config.user_activation_on:
+            job_filter_conditions = job_filter_conditions + (
+                or_((model.Job.user_id == null()), (model.User.active == true())),
+            )
+        if self.sa_session.bind.name == "sqlite":
+            query_objects = (model.Job,)
+        else:
+            query_objects = (model.Job, rank)
+        ready_query = (
+            self.sa_session.query(*query_objects)
+            .enable_eagerloads(False)
+            .outerjoin(model.User)
+            .filter(and_(*job_filter_conditions))
+            .order_by(model.Job.id)
+        )
+        if self.sa_session.bind.name == "sqlite":
+            return ready_query.all()
+        else:
+            ranked = ready_query.subquery()
+            return (
+                self.sa_session.query(model.Job)
+                .join(ranked, model.Job.id == ranked.c.id)
+                .filter(ranked.c.rank <= self.app.job_config.handler_ready_window_size)
+                .all()
+            )
+
+    def __get_ready_jobs_incremental(self):
+        """
+        Like ``__get_ready_jobs`` but only evaluates jobs whose inputs became ready since the last iteration, based on
+        the dependency index. The index is rebuilt from the database every ``handler_ready_reconcile_interval``
+        seconds as a safety net for state changes that went unnoticed.
+        """
+        index = self.dependency_index
+        assert index is not None
+        now = time.time()
+        if (
+            self._last_ready_reconcile is None
+            or now - self._last_ready_reconcile >= self.app.job_config.handler_ready_reconcile_interval
+        ):
+            index.clear()
+            self._last_ready_reconcile = now
+        # Sync the index with the jobs that are currently new, this only reads job ids
+        new_job_ids = set(
+            self.sa_session.scalars(
+                select(model.Job.id).where(
+                    and_(
+                        model.Job.state == model.Job.states.NEW,
+                        model.Job.handler == self.app.config.server_name,
+                    )
+                )
+            )
+        )
+        index.remove_jobs(index.job_ids - new_job_ids)
+        untracked_job_ids = new_job_ids - index.job_ids
+        if untracked_job_ids:
+            blocking_datasets = self.__get_not_ready_input_dataset_ids(untracked_job_ids)
+            for job_id in untracked_job_ids:
+                index.add_job(job_id, blocking_datasets.get(job_id, ()))
+        # Release jobs waiting on datasets that are no longer in a non-ready state
+        changed_dataset_ids = []
+        for dataset_ids in chunk_iterable(index.blocking_dataset_ids):
+            changed_dataset_ids.extend(
+                self.sa_session.scalars(
+                    select(model.Dataset.id).where(
+                        and_(
+                            model.Dataset.id.in_(dataset_ids),
+                            not_(model.Dataset.state.in_(model.Dataset.non_ready_states)),
+                        )
+                    )
+                )
+            )
+        index.datasets_changed(changed_dataset_ids)
+        ready_job_ids = index.ready_job_ids
+        if not ready_job_ids:
+            return []
+        # Jobs held back by limits stay ready, so only read owners first and load the jobs in the window
+        ready_jobs = []
+        for job_ids in chunk_iterable(sorted(ready_job_ids)):
+            job_filter_conditions = (
+                model.Job.id.in_(job_ids),
+                model.Job.state == model.Job.states.NEW,
+                model.Job.handler == self.app.config.server_name,
+            )
+            if self.app.config.user_activation_on:
+                job_filter_conditions = job_filter_conditions + (
+                    or_((model.Job.user_id == null()), (model.User.active == true())),
+                )
+            ready_jobs.extend(
+                self.sa_session.execute(
+                    select(model.Job.id, model.Job.user_id, model.Job.session_id)
+                    .outerjoin(model.User, model.Job.user_id == model.User.id)
+                    .where(and_(*job_filter_conditions))
+                )
+            )
+        # Apply the per-user ready window, this accommodates jobs by anonymous users like the ranked query (keeping
+        # user and session ids apart)
+        jobs_per_owner: Dict[Tuple[str, int], int] = defaultdict(int)
+        window_job_ids = []
+        for job_id, user_id, session_id in sorted(ready_jobs):
+            owner = ("user", user_id) if user_id is not None else ("session", session_id)
+            jobs_per_owner[owner] += 1
+            if jobs_per_owner[owner] <= self.app.job_config.handler_ready_window_size:
+                window_job_ids.append(job_id)
+        jobs_to_check = []
+        for job_ids in chunk_iterable(window_job_ids):
+            jobs_to_check.extend(
+                self.sa_session.query(model.Job)
+                .enable_eagerloads(False)
+                .filter(model.Job.id.in_(job_ids))
+                .order_by(model.Job.id)
+                .all()
+            )
+        return jobs_to_check
+
+    def __get_not_ready_input_dataset_ids(self, job_ids) -> Dict[int, Set[int]]:
+        """
+        Return a mapping of job id to the ids of its input datasets that are in a non-ready state.
+        """
+        not_ready: Dict[int, Set[int]] = defaultdict(set)
+        for chunk in chunk_iterable(job_ids):
+            for job_to_input in (model.JobToInputDatasetAssociation, model.JobToInputLibraryDatasetAssociation):
+                stmt = (
+                    select(job_to_input.job_id, model.Dataset.id)
+                    .join(job_to_input.dataset)
+                    .join(model.Dataset)
+                    .where(
+                        and_(
+                            job_to_input.job_id.in_(chunk),
+                            model.Dataset.state.in_(model.Dataset.non_ready_states),
+                        )
+                    )
+                )
+                for job_id, dataset_id in self.sa_session.execute(stmt):
+                    not_ready[job_id].add(dataset_id)
+        return not_ready
+
     def __filter_jobs_with_invalid_input_states(self, jobs):
         """
         Takes  list of jobs and filters out jobs whose input datasets are in invalid state and
@@ -697,13 +837,54 @@ class JobHandlerQueue(BaseJobHandlerQueue):
 
         if state == JOB_READY:
             # PASS.  increase usage by one job (if caching) so that multiple jobs aren't dispatched on this queue iteration
-            self.increase_running_job_count(job.user_id, job_destination.id)
+            self.increase_running_job_count(job.user_id, job_destination.id, session_id=job.session_id)
             for job_to_input_dataset_association in job.input_datasets:
                 # We record the input dataset version, now that we know the inputs are ready
                 if job_to_input_dataset_association.dataset:
                     job_to_input_dataset_association.dataset_version = job_to_input_dataset_association.dataset.version
+        elif state == JOB_WAIT and job_destination is not None and self.app.job_config.handler_prefetch_inputs:
+            # The destination is known, so the job only waits on limits - stage its inputs in the meantime
+            self.__prefetch_job_inputs(job)
         return state
 
+    def __prefetch_job_inputs(self, job):
+        """Start pulling the inputs of a waiting job into the object store cache."""
+        if job.id in self.prefetched_inputs:
+            return
+        dataset_ids = []
+        for dataset_assoc in job.input_datasets + job.input_library_datasets:
+            if not dataset_assoc.dataset:
+                continue
+            dataset = dataset_assoc.dataset.dataset
+            if dataset.purged or dataset.state != model.Dataset.states.OK:
+                continue
+            try:
+                self.app.object_store.prefetch(dataset)
+            except Exception:
+                log.exception("(%s) Failed to prefetch input dataset %s", job.id, dataset.id)
+            dataset_ids.append(dataset.id)
+        self.prefetched_inputs[job.id] = dataset_ids
+
+    def __cancel_input_prefetches(self, waiting_job_ids):
+        """Cancel pending prefetches of inputs only needed by jobs that are no longer waiting."""
+        stale_dataset_ids = set()
+        needed_dataset_ids = set()
+        for job_id, dataset_ids in list(self.prefetched_inputs.items()):
+            if job_id in waiting_job_ids:
+                needed_dataset_ids.update(dataset_ids)
+            else:
+                stale_dataset_ids.update(dataset_ids)
+                del self.prefetched_inputs[job_id]
+        stale_dataset_ids -= needed_dataset_ids
+        if not stale_dataset_ids:
+            return
+        stmt = select(model.Dataset).where(model.Dataset.id.in_(stale_dataset_ids))
+        for dataset in self.sa_session.scalars(stmt):
+            try:
+                self.app.object_store.cancel_prefetch(dataset)
+            except Exception:
+                log.exception("Failed to cancel prefetch of dataset %s", dataset.id)
+
     def __verify_job_ready(self, job, job_wrapper):
         """Compute job destination and verify job is ready at that
         destination by checking job limits and quota. If this method
@@ -738,40 +919,11 @@ class JobHandlerQueue(BaseJobHandlerQueue):
 
         if state == JOB_READY:
             state = self.__check_user_jobs(job, job_wrapper)
-        if state == JOB_READY and self.app.quota_agent.is_over_quota(self.app, job, job_destination):
+        if state == JOB_READY and self.__is_over_quota(job, job_destination):
             return JOB_USER_OVER_QUOTA, job_destination
         # Check total walltime limits
         if state == JOB_READY and "delta" in self.app.job_config.limits.total_walltime:
-            jobs_to_check = self.sa_session.query(model.Job).filter(
-                model.Job.update_time
-                >= datetime.datetime.now() - datetime.timedelta(self.app.job_config.limits.total_walltime["window"]),
-                model.Job.state == "ok",
-            )
-            if job.user_id:
-                jobs_to_check = jobs_to_check.filter(model.Job.user_id == job.user_id)
-            else:
-                jobs_to_check = jobs_to_check.filter(model.Job.session_id == job.session_id)
-            time_spent = datetime.timedelta(0)
-            for job in jobs_to_check:
-                # History is job.state_history
-                started = None
-                finished = None
-                for history in sorted(job.state_history, key=lambda h: h.create_time):
-                    if history.state == "running":
-                        started = history.create_time
-                    elif history.state == "ok":
-                        finished = history.create_time
-
-                if started is not None and finished is not None:
-                    time_spent += finished - started
-                else:
-                    log.warning(
-                        "Unable to calculate time spent for job %s; started: %s, finished: %s",
-                        job.id,
-                        started,
-                        finished,
-                    )
-
+            time_spent = self.__get_total_walltime_spent(job)
             if time_spent > self.app.job_config.limits.total_walltime["delta"]:
                 return JOB_USER_OVER_TOTAL_WALLTIME, job_destination
 
@@ -819,12 +971,182 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         self.user_job_count = None
         self.user_job_count_per_destination = None
         self.total_job_count_per_destination = None
+        # Database counts, quota and walltime state fetched for the jobs checked in this iteration
+        self.prefetched_user_job_count: Dict[int, int] = {}
+        self.prefetched_user_job_count_per_destination: Dict[int, Dict[str, int]] = {}
+        self.prefetched_session_job_count: Dict[int, int] = {}
+        self.total_walltime_spent: Dict[Tuple[str, int], datetime.timedelta] = {}
+        self.over_quota: Dict[Tuple[Optional[int], Optional[int], Optional[str]], bool] = {}
+
+    def __prefetch_job_readiness(self, jobs):
+        """
+        Fetch the inputs, owners, concurrent job counts and walltime usage needed to check whether ``jobs`` are ready
+        to run with a few set-based queries, so that checking each job in turn does not run per-job queries.
+        """
+        if not jobs:
+            return
+        # Populate the input associations and owners of the jobs in the session
+        for job_ids in chunk_iterable([job.id for job in jobs]):
+            self.sa_session.scalars(
+                select(model.Job)
+                .where(model.Job.id.in_(job_ids))
+                .options(
+                    selectinload(model.Job.input_datasets),
+                    selectinload(model.Job.input_library_datasets),
+                    joinedload(model.Job.user),
+                    joinedload(model.Job.galaxy_session),
+                )
+            ).unique().all()
+        limits = self.app.job_config.limits
+        user_ids = {job.user_id for job in jobs if job.user_id is not None}
+        session_ids = {job.session_id for job in jobs if job.user_id is None and job.session_id is not None}
+        if user_ids and not self.app.config.cache_user_job_count:
+            if limits.registered_user_concurrent_jobs:
+                self.prefetched_user_job_count = dict.fromkeys(user_ids, 0)
+            self.prefetched_user_job_count_per_destination = {user_id: {} for user_id in user_ids}
+            for chunk in chunk_iterable(user_ids):
+                if limits.registered_user_concurrent_jobs:
+                    result = self.sa_session.execute(
+                        select(model.Job.table.c.user_id, func.count(model.Job.table.c.id))
+                        .where(
+                            and_(
+                                model.Job.table.c.state.in_(
+                                    (model.Job.states.QUEUED, model.Job.states.RUNNING, model.Job.states.RESUBMITTED)
+                                ),
+                                model.Job.table.c.user_id.in_(chunk),
+                            )
+                        )
+                        .group_by(model.Job.table.c.user_id)
+                    )
+                    for user_id, job_count in result:
+                        self.prefetched_user_job_count[user_id] = job_count
+                result = self.sa_session.execute(
+                    select(
+                        model.Job.table.c.user_id,
+                        model.Job.table.c.destination_id,
+                        func.count(model.Job.table.c.destination_id),
+                    )
+                    .where(
+                        and_(
+                            model.Job.table.c.state.in_((model.Job.states.QUEUED, model.Job.states.RUNNING)),
+                            model.Job.table.c.user_id.in_(chunk),
+                        )
+                    )
+                    .group_by(model.Job.table.c.user_id, model.Job.table.c.destination_id)
+                )
+                for user_id, destination_id, job_count in result:
+                    self.prefetched_user_job_count_per_destination[user_id][destination_id] = job_count
+        if session_ids and limits.anonymous_user_concurrent_jobs:
+            self.prefetched_session_job_count = dict.fromkeys(session_ids, 0)
+            for chunk in chunk_iterable(session_ids):
+                result = self.sa_session.execute(
+                    select(model.Job.table.c.session_id, func.count(model.Job.table.c.id))
+                    .where(
+                        and_(
+                            model.Job.table.c.state.in_((model.Job.states.QUEUED, model.Job.states.RUNNING)),
+                            model.Job.table.c.session_id.in_(chunk),
+                        )
+                    )
+                    .group_by(model.Job.table.c.session_id)
+                )
+                for session_id, job_count in result:
+                    self.prefetched_session_job_count[session_id] = job_count
+        if "delta" in limits.total_walltime:
+            self.__cache_total_walltime_spent(user_ids, session_ids)
+
+    def __cache_total_walltime_spent(self, user_ids, session_ids):
+        """
+        Compute the time spent running jobs that finished in the total walltime window, for the given users and
+        anonymous sessions.
+        """
+        owners = [("user", user_id) for user_id in user_ids] + [("session", session_id) for session_id in session_ids]
+        for owner_ids in chunk_iterable(owners):
+            chunk_user_ids = [owner_id for kind, owner_id in owner_ids if kind == "user"]
+            chunk_session_ids = [owner_id for kind, owner_id in owner_ids if kind == "session"]
+            for owner in owner_ids:
+                self.total_walltime_spent[owner] = datetime.timedelta(0)
+            result = self.sa_session.execute(
+                select(
+                    model.Job.table.c.id,
+                    model.Job.table.c.user_id,
+                    model.Job.table.c.session_id,
+                    model.JobStateHistory.table.c.state,
+                    model.JobStateHistory.table.c.create_time,
+                )
+                .outerjoin(
+                    model.JobStateHistory.table,
+                    and_(
+                        model.JobStateHistory.table.c.job_id == model.Job.table.c.id,
+                        model.JobStateHistory.table.c.state.in_(("running", "ok")),
+                    ),
+                )
+                .where(
+                    and_(
+                        model.Job.table.c.update_time
+                        >= datetime.datetime.now()
+                        - datetime.timedelta(self.app.job_config.limits.total_walltime["window"]),
+                        model.Job.table.c.state == "ok",
+                        or_(
+                            model.Job.table.c.user_id.in_(chunk_user_ids),
+                            and_(
+                                model.Job.table.c.user_id == null(),
+                                model.Job.table.c.session_id.in_(chunk_session_ids),
+                            ),
+                        ),
+                    )
+                )
+                .order_by(model.Job.table.c.id, model.JobStateHistory.table.c.create_time)
+            )
+            job_owners: Dict[int, List[Tuple[str, int]]] = {}
+            started: Dict[int, datetime.datetime] = {}
+            finished: Dict[int, datetime.datetime] = {}
+            for job_id, user_id, session_id, state, create_time in result:
+                if job_id not in job_owners:
+                    # jobs of registered users count towards the user, only anonymous jobs towards their session
+                    owner = ("user", user_id) if user_id else ("session", session_id)
+                    job_owners[job_id] = [owner] if owner in owner_ids else []
+                if state == "running":
+                    started[job_id] = create_time
+                elif state == "ok":
+                    finished[job_id] = create_time
+            for job_id, owners in job_owners.items():
+                if job_id in started and job_id in finished:
+                    for owner in owners:
+                        self.total_walltime_spent[owner] += finished[job_id] - started[job_id]
+                else:
+                    log.warning(
+                        "Unable to calculate time spent for job %s; started: %s, finished: %s",
+                        job_id,
+                        started.get(job_id),
+                        finished.get(job_id),
+                    )
+
+    def __get_total_walltime_spent(self, job):
+        if job.user_id:
+            owner = ("user", job.user_id)
+            if owner not in self.total_walltime_spent:
+                self.__cache_total_walltime_spent([job.user_id], [])
+        else:
+            owner = ("session", job.session_id)
+            if owner not in self.total_walltime_spent:
+                self.__cache_total_walltime_spent([], [job.session_id])
+        return self.total_walltime_spent[owner]
+
+    def __is_over_quota(self, job, job_destination):
+        # Usage does not change while jobs are being dispatched, so check each user (or anonymous history) only once
+        object_store_id = job_destination.params.get("object_store_id", None) if job_destination is not None else None
+        key = (job.user_id, job.history_id if not job.user_id else None, object_store_id)
+        if key not in self.over_quota:
+            self.over_quota[key] = self.app.quota_agent.is_over_quota(self.app, job, job_destination)
+        return self.over_quota[key]
 
     def get_user_job_count(self, user_id):
         self.__cache_user_job_count()
         # This could have been incremented by a previous job dispatched on this iteration, even if we're not caching
         rval = self.user_job_count.get(user_id, 0)
-        if not self.app.config.cache_user_job_count:
+        if user_id in self.prefetched_user_job_count:
+            rval += self.prefetched_user_job_count[user_id]
+        elif not self.app.config.cache_user_job_count:
             result = self.sa_session.execute(
                 select(func.count(model.Job.table.c.id)).where(
                     and_(
@@ -873,6 +1195,10 @@ class JobHandlerQueue(BaseJobHandlerQueue):
             # queue.
             rval = {}
             rval.update(cached)
+            if user_id in self.prefetched_user_job_count_per_destination:
+                for destination_id, job_count in self.prefetched_user_job_count_per_destination[user_id].items():
+                    rval[destination_id] = rval.get(destination_id, 0) + job_count
+                return rval
             result = self.sa_session.execute(
                 select(
                     model.Job.table.c.destination_id, func.count(model.Job.table.c.destination_id).label("job_count")
@@ -910,7 +1236,7 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         elif self.user_job_count_per_destination is None:
             self.user_job_count_per_destination = {}
 
-    def increase_running_job_count(self, user_id, destination_id):
+    def increase_running_job_count(self, user_id, destination_id, session_id=None):
         if (
             self.app.job_config.limits.registered_user_concurrent_jobs
             or self.app.job_config.limits.anonymous_user_concurrent_jobs
@@ -926,6 +1252,9 @@ class JobHandlerQueue(BaseJobHandlerQueue):
             self.user_job_count_per_destination[user_id][destination_id] = (
                 self.user_job_count_per_destination[user_id].get(destination_id, 0) + 1
             )
+            if user_id is None and session_id in self.prefetched_session_job_count:
+                # the prefetched count of the session is used for all its jobs checked in this iteration
+                self.prefetched_session_job_count[session_id] += 1
         if self.app.job_config.limits.destination_total_concurrent_jobs:
             if self.total_job_count_per_destination is None:
                 self.total_job_count_per_destination = {}
@@ -967,19 +1296,23 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         elif job.galaxy_session:
             # Anonymous users only get the hard limit
             if self.app.job_config.limits.anonymous_user_concurrent_jobs:
-                count = (
-                    self.sa_session.query(model.Job)
-                    .enable_eagerloads(False)
-                    .filter(
-                        and_(
-                            model.Job.session_id == job.galaxy_session.id,
-                            or_(
-                                model.Job.state == model.Job.states.RUNNING, model.Job.state == model.Job.states.QUEUED
-                            ),
+                if job.session_id in self.prefetched_session_job_count:
+                    count = self.prefetched_session_job_count[job.session_id]
+                else:
+                    count = (
+                        self.sa_session.query(model.Job)
+                        .enable_eagerloads(False)
+                        .filter(
+                            and_(
+                                model.Job.session_id == job.galaxy_session.id,
+                                or_(
+                                    model.Job.state == model.Job.states.RUNNING,
+                                    model.Job.state == model.Job.states.QUEUED,
+                                ),
+                            )
                         )
+                        .count()
                     )
-                    .count()
-                )
                 if count >= self.app.job_config.limits.anonymous_user_concurrent_jobs:
                     return JOB_WAIT
         else:
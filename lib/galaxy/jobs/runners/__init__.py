@@ -14,6 +14,7 @@ import typing
 import uuid
 from queue import (
     Empty,
+    Full,
     Queue,
 )
 
@@ -96,7 +97,11 @@ class BaseJobRunner:
     runner_name = "BaseJobRunner"
 
     start_methods = ["_init_monitor_thread", "_init_worker_threads"]
-    DEFAULT_SPECS = dict(recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0))
+    DEFAULT_SPECS = dict(
+        recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+        finish_workers=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+        finish_queue_size=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+    )
 
     def __init__(self, app: "GalaxyManagerApplication", nworkers: int, **kwargs):
         """Start the job runner"""
@@ -118,7 +123,7 @@ class BaseJobRunner:
             getattr(self, start_method, lambda: None)()
 
     def _init_worker_threads(self):
-        """Start ``nworkers`` worker threads."""
+        """Start ``nworkers`` worker threads and the optional finish worker threads."""
         self.work_queue = Queue()
         self.work_threads = []
         log.debug(f"Starting {self.nworkers} {self.runner_name} workers")
@@ -127,24 +132,44 @@ class BaseJobRunner:
             worker.daemon = True
             worker.start()
             self.work_threads.append(worker)
+        # Finishing jobs (collecting outputs, setting metadata, pushing to the object store)
+        # can be slow, if requested do it on separate threads so it can't hold up submissions.
+        # A bounded finish queue applies backpressure to the thread marking jobs as finished.
+        self.finish_queue: typing.Optional[Queue] = None
+        self.finish_threads = []
+        finish_workers = self.runner_params.finish_workers
+        if finish_workers:
+            self.finish_queue = Queue(maxsize=self.runner_params.finish_queue_size)
+            log.debug(f"Starting {finish_workers} {self.runner_name} finish workers")
+            for i in range(finish_workers):
+                worker = threading.Thread(
+                    name="%s.finish_thread-%d" % (self.runner_name, i),
+                    target=self.run_next,
+                    args=(self.finish_queue,),
+                )
+                worker.daemon = True
+                worker.start()
+                self.finish_threads.append(worker)
 
     def _alive_worker_threads(self, cycle=False):
         # yield endlessly as long as there are alive threads if cycle is True
         alive = True
         while alive:
             alive = False
-            for thread in self.work_threads:
+            for thread in self.work_threads + self.finish_threads:
                 if thread.is_alive():
                     if cycle:
                         alive = True
                     yield thread
 
-    def run_next(self):
+    def run_next(self, work_queue: typing.Optional[Queue] = None):
         """Run the next item in the work queue (a job waiting to run)"""
+        if work_queue is None:
+            work_queue = self.work_queue
         while self._should_stop is False:
             with self.app.model.session():  # Create a Session instance and ensure it's closed.
                 try:
-                    (method, arg) = self.work_queue.get(timeout=1)
+                    (method, arg) = work_queue.get(timeout=1)
                 except Empty:
                     continue
                 if method is STOP_SIGNAL:
@@ -222,6 +247,13 @@ class BaseJobRunner:
         self._should_stop = True
         for _ in range(len(self.work_threads)):
             self.work_queue.put((STOP_SIGNAL, None))
+        if self.finish_queue is not None:
+            for _ in range(len(self.finish_threads)):
+                try:
+                    self.finish_queue.put_nowait((STOP_SIGNAL, None))
+                except Full:
+                    # finish threads also stop once they see _should_stop
+                    break
 
         if (join_timeout := self.app.config.monitor_thread_join_timeout) > 0:
             log.info("Waiting up to %d seconds for job worker threads to shutdown...", join_timeout)
@@ -944,7 +976,21 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
         self._finish_or_resubmit_job(job_state, stdout, stderr, job_id=galaxy_id_tag, external_job_id=external_job_id)
 
     def mark_as_finished(self, job_state):
-        self.work_queue.put((self.finish_job, job_state))
+        if self.finish_queue is None:
+            self.work_queue.put((self.finish_job, job_state))
+            return
+        if self.finish_queue.full():
+            log.debug(
+                "(%s) %s finish queue is full, waiting for a finish worker",
+                job_state.job_wrapper.get_id_tag(),
+                self.runner_name,
+            )
+        put_timer = self.app.execution_timer_factory.get_timer(
+            f"internals.galaxy.jobs.runners.{self.__class__.__name__.lower()}.finish_queue_put",
+            "job ${job_id} added to finish queue",
+        )
+        self.finish_queue.put((self.finish_job, job_state))
+        log.trace(put_timer.to_str(job_id=job_state.job_wrapper.get_id_tag()))
 
     def mark_as_failed(self, job_state):
         self.work_queue.put((self.fail_job, job_state))
@@ -202,7 +202,7 @@ class ShellJobRunner(AsynchronousJobRunner):
                 if external_metadata:
                     self.work_queue.put((self.handle_metadata_externally, ajs))
                 log.debug(f"({id_tag}/{external_job_id}) job execution finished, running job wrapper finish method")
-                self.work_queue.put((self.finish_job, ajs))
+                self.mark_as_finished(ajs)
             else:
                 new_watched.append(ajs)
         # Replace the watch list with the updated version
@@ -8,6 +8,10 @@ import os
 import shlex
 import string
 import time
+from typing import (
+    Dict,
+    List,
+)
 
 from galaxy import model
 from galaxy.jobs import JobDestination
@@ -101,6 +105,9 @@ class DRMAAJobRunner(AsynchronousJobRunner):
 
         self.redact_email_in_job_name = self.app.config.redact_email_in_job_name
 
+        # States of the watched jobs fetched in bulk on each iteration of the monitor thread
+        self._batch_job_states: Dict[str, str] = {}
+
     def url_to_destination(self, url):
         """Convert a legacy URL to a job destination"""
         if not url:
@@ -256,7 +263,7 @@ class DRMAAJobRunner(AsynchronousJobRunner):
             if external_metadata:
                 self._handle_metadata_externally(ajs.job_wrapper, resolve_requirements=True)
             if job_state != model.Job.states.DELETED:
-                self.work_queue.put((self.finish_job, ajs))
+                self.mark_as_finished(ajs)
 
     def check_watched_item(self, ajs, new_watched):
         """
@@ -283,7 +290,9 @@ class DRMAAJobRunner(AsynchronousJobRunner):
         state = None
         try:
             assert external_job_id not in (None, "None"), f"({galaxy_id_tag}/{external_job_id}) Invalid job id"
-            state = self.ds.job_status(external_job_id)
+            state = self._batch_job_states.get(external_job_id)
+            if state is None:
+                state = self.ds.job_status(external_job_id)
             # Reset exception retries
             for retry_exception in RETRY_EXCEPTIONS_LOWER:
                 setattr(ajs, f"{retry_exception}_retries", 0)
@@ -308,7 +317,7 @@ class DRMAAJobRunner(AsynchronousJobRunner):
                     return None
             if self.runner_params[state_param] == model.Job.states.OK:
                 log.warning("(%s/%s) job will now be finished OK", galaxy_id_tag, external_job_id)
-                self.work_queue.put((self.finish_job, ajs))
+                self.mark_as_finished(ajs)
             elif self.runner_params[state_param] == model.Job.states.ERROR:
                 log.warning("(%s/%s) job will now be errored", galaxy_id_tag, external_job_id)
                 self.work_queue.put((self.fail_job, ajs))
@@ -332,12 +341,26 @@ class DRMAAJobRunner(AsynchronousJobRunner):
             return None
         return state
 
+    def get_job_states(self, watched: List[AsynchronousJobState]) -> Dict[str, str]:
+        """
+        Return the DRMAA states of the watched jobs, keyed by external job id,
+        that can be determined with a single query to the DRM. Jobs missing from
+        the result are checked individually by check_watched_item(). DRMAA has no
+        bulk status call, runners for DRMs that can be queried in bulk override this.
+        """
+        return {}
+
     def check_watched_items(self):
         """
         Called by the monitor thread to look at each watched job and deal
         with state changes.
         """
         new_watched = []
+        try:
+            self._batch_job_states = self.get_job_states(self.watched)
+        except Exception:
+            log.exception("Unable to check the state of watched jobs in bulk, checking them individually")
+            self._batch_job_states = {}
         for ajs in self.watched:
             external_job_id = ajs.job_id
             galaxy_id_tag = ajs.job_wrapper.get_id_tag()
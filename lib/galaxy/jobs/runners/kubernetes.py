@@ -9,6 +9,10 @@ import os
 import re
 import time
 from datetime import datetime
+from typing import (
+    List,
+    Optional,
+)
 
 import yaml
 
@@ -39,6 +43,7 @@ from galaxy.jobs.runners.util.pykube_util import (
     is_pod_unschedulable,
     Job,
     job_object_dict,
+    KubernetesObjectCache,
     parse_pvc_param_line,
     Pod,
     produce_k8s_job_prefix,
@@ -47,7 +52,10 @@ from galaxy.jobs.runners.util.pykube_util import (
     Service,
     service_object_dict,
 )
-from galaxy.util import unicodify
+from galaxy.util import (
+    asbool,
+    unicodify,
+)
 from galaxy.util.bytesize import ByteSize
 
 log = logging.getLogger(__name__)
@@ -62,6 +70,8 @@ class KubernetesJobRunner(AsynchronousJobRunner):
 
     runner_name = "KubernetesRunner"
 
+    start_methods = ["_init_object_caches", "_init_monitor_thread", "_init_worker_threads"]
+
     LABEL_START = re.compile("^[A-Za-z0-9]")
     LABEL_END = re.compile("[A-Za-z0-9]$")
     LABEL_REGEX = re.compile("[^-A-Za-z0-9_.]")
@@ -113,6 +123,7 @@ class KubernetesJobRunner(AsynchronousJobRunner):
             k8s_interactivetools_ingress_class=dict(map=str, default=None),
             k8s_interactivetools_tls_secret=dict(map=str, default=None),
             k8s_ingress_api_version=dict(map=str, default=DEFAULT_INGRESS_API_VERSION),
+            k8s_watch_jobs=dict(map=asbool, default=False),
         )
 
         if "runner_param_specs" not in kwargs:
@@ -133,6 +144,55 @@ class KubernetesJobRunner(AsynchronousJobRunner):
 
         self.setup_base_volumes()
 
+        # With k8s_watch_jobs the Jobs and Pods of this Galaxy instance are tracked with one
+        # list+watch stream each instead of querying the API for every watched job.
+        self._job_cache: Optional[KubernetesObjectCache] = None
+        self._pod_cache: Optional[KubernetesObjectCache] = None
+        if self.runner_params["k8s_watch_jobs"]:
+            selector = (
+                f"app.kubernetes.io/instance={self.__produce_k8s_job_prefix()},app.kubernetes.io/managed-by=galaxy"
+            )
+            namespace = self.runner_params["k8s_namespace"]
+            self._job_cache = KubernetesObjectCache(self._pykube_api, Job, namespace, selector)
+            self._pod_cache = KubernetesObjectCache(
+                self._pykube_api,
+                Pod,
+                namespace,
+                selector,
+                key=lambda obj: obj["metadata"].get("labels", {}).get("job-name"),
+            )
+
+    def _init_object_caches(self):
+        for cache in (self._job_cache, self._pod_cache):
+            if cache is not None:
+                cache.start()
+
+    def shutdown(self):
+        for cache in (self._job_cache, self._pod_cache):
+            if cache is not None:
+                cache.shutdown()
+        super().shutdown()
+
+    def _find_k8s_job_objs(self, job_state) -> List[dict]:
+        """Return the k8s Job objects for a watched job, from the watch cache if enabled."""
+        if self._job_cache is not None:
+            if jobs := self._job_cache.get(job_state.job_id):
+                return jobs
+            # not synced yet, or the Job was created after the last event received
+        return find_job_object_by_name(
+            self._pykube_api, job_state.job_id, self.runner_params["k8s_namespace"]
+        ).response["items"]
+
+    def _find_k8s_pod_objs(self, job_state) -> List[dict]:
+        """Return the k8s Pod objects for a watched job, from the watch cache if enabled."""
+        if self._pod_cache is not None:
+            pods = self._pod_cache.get(job_state.job_id)
+            if pods is not None:
+                return pods
+        return find_pod_object_by_name(
+            self._pykube_api, job_state.job_id, self.runner_params["k8s_namespace"]
+        ).response["items"]
+
     def setup_base_volumes(self):
         def generate_volumes(pvc_list):
             return [{"name": pvc["name"], "persistentVolumeClaim": {"claimName": pvc["name"]}} for pvc in pvc_list]
@@ -747,10 +807,10 @@ class KubernetesJobRunner(AsynchronousJobRunner):
 
     def check_watched_item(self, job_state):
         """Checks the state of a job already submitted on k8s. Job state is an AsynchronousJobState"""
-        jobs = find_job_object_by_name(self._pykube_api, job_state.job_id, self.runner_params["k8s_namespace"])
+        jobs = self._find_k8s_job_objs(job_state)
 
-        if len(jobs.response["items"]) == 1:
-            job = Job(self._pykube_api, jobs.response["items"][0])
+        if len(jobs) == 1:
+            job = Job(self._pykube_api, jobs[0])
             job_destination = job_state.job_wrapper.job_destination
             succeeded = 0
             active = 0
@@ -834,7 +894,7 @@ class KubernetesJobRunner(AsynchronousJobRunner):
 
                 return None
 
-        elif len(jobs.response["items"]) == 0:
+        elif len(jobs) == 0:
             if job_state.job_wrapper.get_job().state == model.Job.states.DELETED:
                 if job_state.job_wrapper.cleanup_job in ("always", "onsuccess"):
                     job_state.job_wrapper.cleanup()
@@ -946,12 +1006,12 @@ class KubernetesJobRunner(AsynchronousJobRunner):
         for being out of memory (pod status OOMKilled). If that is the case
         marks the job for resubmission (resubmit logic is part of destinations).
         """
-        pods = find_pod_object_by_name(self._pykube_api, job_state.job_id, self.runner_params["k8s_namespace"])
-        if not pods.response["items"]:
+        pods = self._find_k8s_pod_objs(job_state)
+        if not pods:
             return False
 
         # pod = self._get_pod_for_job(job_state) # this was always None
-        pod = pods.response["items"][0]
+        pod = pods[0]
         if (
             pod
             and "terminated" in pod["status"]["containerStatuses"][0]["state"]
@@ -965,22 +1025,22 @@ class KubernetesJobRunner(AsynchronousJobRunner):
         """
         checks the state of the pod to see if it is running.
         """
-        pods = find_pod_object_by_name(self._pykube_api, job_state.job_id, self.runner_params["k8s_namespace"])
-        if not pods.response["items"]:
+        pods = self._find_k8s_pod_objs(job_state)
+        if not pods:
             return False
 
-        pod = Pod(self._pykube_api, pods.response["items"][0])
+        pod = Pod(self._pykube_api, pods[0])
         return is_pod_running(self._pykube_api, pod, self.runner_params["k8s_namespace"])
 
     def __job_pending_due_to_unschedulable_pod(self, job_state):
         """
         checks the state of the pod to see if it is unschedulable.
         """
-        pods = find_pod_object_by_name(self._pykube_api, job_state.job_id, self.runner_params["k8s_namespace"])
-        if not pods.response["items"]:
+        pods = self._find_k8s_pod_objs(job_state)
+        if not pods:
             return False
 
-        pod = Pod(self._pykube_api, pods.response["items"][0])
+        pod = Pod(self._pykube_api, pods[0])
         return is_pod_unschedulable(self._pykube_api, pod, self.runner_params["k8s_namespace"])
 
     def __job_failed_due_to_unknown_exit_code(self, job_state):
@@ -988,11 +1048,11 @@ class KubernetesJobRunner(AsynchronousJobRunner):
         checks whether the pod exited prematurely due to an unknown exit code (i.e. not an exit code like OOM that
         we can handle). This would mean that the tool failed, but the job should be considered to have succeeded.
         """
-        pods = find_pod_object_by_name(self._pykube_api, job_state.job_id, self.runner_params["k8s_namespace"])
-        if not pods.response["items"]:
+        pods = self._find_k8s_pod_objs(job_state)
+        if not pods:
             return False
 
-        pod = pods.response["items"][0]
+        pod = pods[0]
         if (
             pod
             and "terminated" in pod["status"]["containerStatuses"][0]["state"]
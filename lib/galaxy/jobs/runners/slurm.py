@@ -4,10 +4,19 @@ SLURM job control via the DRMAA API.
 
 import os
 import time
+from collections import defaultdict
+from typing import (
+    Dict,
+    Iterable,
+    List,
+)
 
 from galaxy import model
+from galaxy.jobs.runners import AsynchronousJobState
 from galaxy.jobs.runners.drmaa import DRMAAJobRunner
 from galaxy.util import (
+    asbool,
+    chunk_iterable,
     commands,
     unicodify,
 )
@@ -35,11 +44,82 @@ SLURM_MEMORY_LIMIT_EXCEEDED_PARTIAL_WARNINGS = [
 OUT_OF_MEMORY_MSG = "This job was terminated because it used more memory than it was allocated."
 PROBABLY_OUT_OF_MEMORY_MSG = "This job was cancelled probably because it used more memory than it was allocated."
 
+# Number of job ids passed to a single squeue call
+SQUEUE_JOB_IDS_PER_CALL = 1000
+
+# SLURM job states (as reported by `squeue -o %T`) that map unambiguously to a DRMAA job state,
+# jobs in any other state are checked individually through DRMAA.
+SLURM_QUEUED_STATES = frozenset({"PENDING", "CONFIGURING", "REQUEUED", "REQUEUE_FED", "REQUEUE_HOLD"})
+SLURM_RUNNING_STATES = frozenset({"RUNNING", "COMPLETING", "STAGE_OUT", "SIGNALING"})
+# like slurm-drmaa, report jobs that exited with a non-zero exit code as done, their
+# exit code is checked when the job is finished
+SLURM_DONE_STATES = frozenset({"COMPLETED", "FAILED"})
+SLURM_FAILED_STATES = frozenset(
+    {"CANCELLED", "TIMEOUT", "NODE_FAIL", "OUT_OF_MEMORY", "BOOT_FAIL", "DEADLINE", "PREEMPTED"}
+)
+
+
+def get_slurm_job_states(job_ids: Iterable[str]) -> Dict[str, str]:
+    """
+    Return the SLURM states of the given external job ids, using one squeue call
+    per cluster (and per SQUEUE_JOB_IDS_PER_CALL jobs) instead of one per job.
+    Jobs unknown to squeue (e.g. older than MinJobAge) are missing from the result.
+    """
+    slurm_ids_by_cluster: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for job_id in job_ids:
+        if "." in job_id:
+            # custom slurm-drmaa-with-cluster-support job id syntax
+            slurm_id, cluster = job_id.split(".", 1)
+        else:
+            slurm_id, cluster = job_id, ""
+        slurm_ids_by_cluster[cluster][slurm_id] = job_id
+    states = {}
+    for cluster, slurm_ids in slurm_ids_by_cluster.items():
+        for chunk in chunk_iterable(slurm_ids, size=SQUEUE_JOB_IDS_PER_CALL):
+            cmd = ["squeue", "--noheader", "--states=all", "--format=%i %T"]
+            if cluster:
+                cmd.extend(["-M", cluster])
+            cmd.extend(["-j", ",".join(chunk)])
+            try:
+                stdout = commands.execute(cmd)
+            except commands.CommandLineException as e:
+                # e.g. `slurm_load_jobs error: Invalid job id specified` if none of the jobs is known anymore
+                log.debug("Unable to check the state of %d jobs with squeue: %s", len(chunk), unicodify(e))
+                continue
+            for line in stdout.splitlines():
+                # with -M squeue prints a `CLUSTER: name` line before the jobs
+                fields = line.split()
+                if len(fields) == 2 and fields[0] in slurm_ids:
+                    states[slurm_ids[fields[0]]] = fields[1].rstrip("+")
+    return states
+
 
 class SlurmJobRunner(DRMAAJobRunner):
     runner_name = "SlurmRunner"
     restrict_job_name_length = False
 
+    def __init__(self, app, nworkers, **kwargs):
+        runner_param_specs = {"batch_state_check": dict(map=asbool, default=False)}
+        if "runner_param_specs" not in kwargs:
+            kwargs["runner_param_specs"] = {}
+        kwargs["runner_param_specs"].update(runner_param_specs)
+        super().__init__(app, nworkers, **kwargs)
+
+    def get_job_states(self, watched: List[AsynchronousJobState]) -> Dict[str, str]:
+        if not self.runner_params.batch_state_check or not watched:
+            return {}
+        drmaa_states = {}
+        for job_id, slurm_state in get_slurm_job_states(ajs.job_id for ajs in watched).items():
+            if slurm_state in SLURM_QUEUED_STATES:
+                drmaa_states[job_id] = self.drmaa_job_states.QUEUED_ACTIVE
+            elif slurm_state in SLURM_RUNNING_STATES:
+                drmaa_states[job_id] = self.drmaa_job_states.RUNNING
+            elif slurm_state in SLURM_DONE_STATES:
+                drmaa_states[job_id] = self.drmaa_job_states.DONE
+            elif slurm_state in SLURM_FAILED_STATES:
+                drmaa_states[job_id] = self.drmaa_job_states.FAILED
+        return drmaa_states
+
     def _complete_terminal_job(self, ajs, drmaa_state, **kwargs):
         def _get_slurm_state_with_sacct(job_id, cluster):
             cmd = ["sacct", "-n", "-o", "state%-32"]
@@ -3,7 +3,14 @@
 import logging
 import os
 import re
+import threading
 from pathlib import PurePath
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
 
 try:
     from pykube.config import KubeConfig
@@ -109,6 +116,102 @@ def is_pod_unschedulable(pykube_api, pod, namespace=None):
     return False
 
 
+class KubernetesObjectCache:
+    """Informer-style local cache of the objects of one kind in a namespace.
+
+    A single list call followed by a watch stream (restarted from the last seen
+    ``resourceVersion``, and relisted if that version has expired) keeps the
+    cache up to date, so looking up objects does not require API calls.
+    Objects are grouped by ``key``, e.g. the name of the Job that created a Pod.
+    """
+
+    def __init__(
+        self,
+        pykube_api,
+        object_class,
+        namespace: Optional[str] = None,
+        selector: Optional[str] = None,
+        key: Callable[[dict], Optional[str]] = lambda obj: obj["metadata"]["name"],
+        retry_interval: float = 5,
+    ):
+        self.pykube_api = pykube_api
+        self.object_class = object_class
+        self.namespace = namespace
+        self.selector = selector
+        self.key = key
+        self.retry_interval = retry_interval
+        self.synced = threading.Event()
+        self._objects: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        name = f"{self.object_class.__name__}.watch_thread"
+        self._thread = threading.Thread(name=name, target=self._run, daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        self._stop.set()
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        """Return the objects cached for ``key``, or None if the cache has not been synced yet."""
+        if not self.synced.is_set():
+            return None
+        with self._lock:
+            return list(self._objects.get(key, {}).values())
+
+    def _query(self):
+        return self.object_class.objects(self.pykube_api).filter(namespace=self.namespace, selector=self.selector)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                resource_version = self._list()
+                while not self._stop.is_set() and resource_version is not None:
+                    resource_version = self._watch(resource_version)
+            except Exception:
+                log.exception("Error watching Kubernetes %s objects, relisting", self.object_class.__name__)
+                self._stop.wait(self.retry_interval)
+
+    def _list(self) -> str:
+        response = self._query().response
+        objects: Dict[str, Dict[str, dict]] = {}
+        for obj in response["items"]:
+            key = self.key(obj)
+            if key is not None:
+                objects.setdefault(key, {})[obj["metadata"]["name"]] = obj
+        with self._lock:
+            self._objects = objects
+        self.synced.set()
+        return response["metadata"]["resourceVersion"]
+
+    def _watch(self, resource_version: str) -> Optional[str]:
+        """Apply watch events to the cache, return the version to resume watching from or None to relist."""
+        for event in self._query().watch(since=resource_version):
+            if self._stop.is_set():
+                return None
+            obj = event.object.obj
+            if event.type == "ERROR":
+                # most likely 410 Gone, the resource version is too old to resume from
+                log.debug("Watch of Kubernetes %s objects expired: %s", self.object_class.__name__, obj)
+                return None
+            resource_version = obj["metadata"]["resourceVersion"]
+            key = self.key(obj)
+            if key is None:
+                continue
+            name = obj["metadata"]["name"]
+            with self._lock:
+                if event.type == "DELETED":
+                    objects = self._objects.get(key, {})
+                    objects.pop(name, None)
+                    if not objects:
+                        self._objects.pop(key, None)
+                else:
+                    self._objects.setdefault(key, {})[name] = obj
+        return resource_version
+
+
 def delete_job(job, cleanup="always"):
     job_failed = job.obj["status"]["failed"] > 0 if "failed" in job.obj["status"] else False
     # Scale down the job just in case even if cleanup is never
@@ -317,6 +420,7 @@ __all__ = (
     "find_job_object_by_name",
     "find_pod_object_by_name",
     "galaxy_instance_id",
+    "KubernetesObjectCache",
     "HTTPError",
     "is_pod_running",
     "is_pod_unschedulable",
@@ -8,9 +8,15 @@ from typing import (
 )
 from zipfile import ZipFile
 
+from sqlalchemy import (
+    inspect,
+    select,
+)
 from sqlalchemy.orm import (
     joinedload,
     Query,
+    selectinload,
+    undefer,
 )
 from typing_extensions import Literal
 
@@ -53,6 +59,8 @@ log = logging.getLogger(__name__)
 
 ERROR_INVALID_ELEMENTS_SPECIFICATION = "Create called with invalid parameters, must specify element identifiers."
 ERROR_NO_COLLECTION_TYPE = "Create called without specifying a collection type."
+# number of HDAs loaded per query when resolving collection elements
+ELEMENT_LOAD_CHUNK_SIZE = 1000
 
 
 class DatasetCollectionManager:
@@ -594,6 +602,7 @@ class DatasetCollectionManager:
 
     def __load_elements(self, trans, element_identifiers, hide_source_items=False, copy_elements=False, history=None):
         elements = {}
+        hdas_by_id = self.__load_hdas(element_identifiers, copy_elements=copy_elements)
         for element_identifier in element_identifiers:
             elements[element_identifier["name"]] = self.__load_element(
                 trans,
@@ -601,10 +610,55 @@ class DatasetCollectionManager:
                 hide_source_items=hide_source_items,
                 copy_elements=copy_elements,
                 history=history,
+                hdas_by_id=hdas_by_id,
             )
         return elements
 
-    def __load_element(self, trans, element_identifier, hide_source_items, copy_elements, history=None):
+    def __load_hdas(self, element_identifiers, copy_elements=False) -> Dict[int, model.HistoryDatasetAssociation]:
+        """
+        Load the HDAs referenced by `element_identifiers` in a few queries, along with
+        what the access, ownership and tag checks of `__load_element` need, and the
+        metadata and annotations copied with each HDA if `copy_elements` is set.
+        """
+        hda_ids = set()
+        for element_identifier in element_identifiers:
+            if not isinstance(element_identifier, dict) or "__object__" in element_identifier:
+                continue
+            element_id = element_identifier.get("id")
+            if element_identifier.get("src", "hda") == "hda" and isinstance(element_id, int):
+                hda_ids.add(element_id)
+        hdas_by_id: Dict[int, model.HistoryDatasetAssociation] = {}
+        sorted_ids = sorted(hda_ids)
+        options = [
+            joinedload(model.HistoryDatasetAssociation.dataset).selectinload(model.Dataset.actions),
+            joinedload(model.HistoryDatasetAssociation.history),
+            selectinload(model.HistoryDatasetAssociation.tags),  # type: ignore[attr-defined]
+        ]
+        if copy_elements:
+            options.extend(
+                [
+                    undefer(model.HistoryDatasetAssociation._metadata),
+                    selectinload(model.HistoryDatasetAssociation.annotations),  # type: ignore[attr-defined]
+                ]
+            )
+        for i in range(0, len(sorted_ids), ELEMENT_LOAD_CHUNK_SIZE):
+            stmt = (
+                select(model.HistoryDatasetAssociation)
+                .where(model.HistoryDatasetAssociation.id.in_(sorted_ids[i : i + ELEMENT_LOAD_CHUNK_SIZE]))
+                .options(*options)
+            )
+            if copy_elements:
+                # Copying an HDA whose dataset has no uuid commits the session to get an object store id,
+                # and every prefetched HDA refreshed after that commit would run the eager loads again.
+                # Those (legacy) datasets are left to the per element query.
+                stmt = stmt.join(model.HistoryDatasetAssociation.dataset).where(model.Dataset.uuid.is_not(None))
+            for hda in self.model.context.scalars(stmt).unique():
+                hdas_by_id[hda.id] = hda
+        return hdas_by_id
+
+    def __load_element(
+        self, trans, element_identifier, hide_source_items, copy_elements, history=None, hdas_by_id=None
+    ):
         # if not isinstance( element_identifier, dict ):
         #    # Is allowing this to just be the id of an hda too clever? Somewhat
         #    # consistent with other API methods though.
@@ -635,15 +689,19 @@ class DatasetCollectionManager:
         if tags := element_identifier.pop("tags", None):
             tag_str = ",".join(str(_) for _ in tags)
         if src_type == "hda":
-            hda = self.hda_manager.get_accessible(element_id, trans.user)
+            # an HDA expired by a commit since it was loaded is cheaper to select again on its own
+            if hdas_by_id and element_id in hdas_by_id and not inspect(hdas_by_id[element_id]).expired:
+                hda = self.hda_manager.error_unless_accessible(hdas_by_id[element_id], trans.user)
+            else:
+                hda = self.hda_manager.get_accessible(element_id, trans.user)
             if copy_elements:
                 element: model.HistoryDatasetAssociation = self.hda_manager.copy(
                     hda, history=history or trans.history, hide_copy=True, flush=False
                 )
             else:
                 element = hda
-            if hide_source_items and self.hda_manager.get_owned(
-                hda.id, user=trans.user, current_history=history or trans.history
+            if hide_source_items and self.hda_manager.error_unless_owner(
+                hda, user=trans.user, current_history=history or trans.history
             ):
                 hda.visible = False
             trans.tag_handler.apply_item_tags(user=trans.user, item=element, tags_str=tag_str, flush=False)
@@ -35,11 +35,15 @@ from galaxy.model import (
 )
 from galaxy.model.base import transaction
 from galaxy.schema.tasks import (
+    ComputeDatasetHashesTaskRequest,
     ComputeDatasetHashTaskRequest,
     PurgeDatasetsTaskRequest,
 )
 from galaxy.structured_app import MinimalManagerApp
-from galaxy.util.hash_util import memory_bound_hexdigest
+from galaxy.util.hash_util import (
+    memory_bound_hexdigest,
+    memory_bound_hexdigests,
+)
 
 log = logging.getLogger(__name__)
 
@@ -169,21 +173,45 @@ class DatasetManager(base.ModelManager[Dataset], secured.AccessibleManagerMixin,
             file_path = dataset.get_file_name()
         hash_function = request.hash_function
         calculated_hash_value = memory_bound_hexdigest(hash_func_name=hash_function, path=file_path)
-        extra_files_path = request.extra_files_path
-        dataset_hash = model.DatasetHash(
-            hash_function=hash_function,
-            hash_value=calculated_hash_value,
-            extra_files_path=extra_files_path,
-        )
-        dataset_hash.dataset = dataset
+        self._record_hash(dataset, hash_function, calculated_hash_value, request.extra_files_path)
+        sa_session = self.session()
+        with transaction(sa_session):
+            sa_session.commit()
+
+    def compute_hashes(self, request: ComputeDatasetHashesTaskRequest):
+        """Hash a dataset and, optionally, all of its extra files with every requested hash function.
+
+        Each file is read once regardless of the number of hash functions requested.
+        """
+        dataset = self.by_id(request.dataset_id)
+        file_paths: Dict[Optional[str], str] = {None: dataset.get_file_name()}
+        if request.include_extra_files and dataset.extra_files_path_exists():
+            extra_files_dir = dataset.extra_files_path
+            for root, _, files in os.walk(extra_files_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    file_paths[os.path.relpath(path, extra_files_dir)] = path
+        for extra_files_path, file_path in file_paths.items():
+            hash_values = memory_bound_hexdigests(request.hash_functions, path=file_path)
+            for hash_function, hash_value in hash_values.items():
+                self._record_hash(dataset, hash_function, hash_value, extra_files_path)
+        sa_session = self.session()
+        with transaction(sa_session):
+            sa_session.commit()
+
+    def _record_hash(self, dataset, hash_function, calculated_hash_value, extra_files_path):
         # TODO: replace/update if the combination of dataset_id/hash_function has already
         # been stored.
         sa_session = self.session()
         hash = get_dataset_hash(sa_session, dataset.id, hash_function, extra_files_path)
         if hash is None:
+            dataset_hash = model.DatasetHash(
+                hash_function=hash_function,
+                hash_value=calculated_hash_value,
+                extra_files_path=extra_files_path,
+            )
+            dataset_hash.dataset = dataset
             sa_session.add(dataset_hash)
-            with transaction(sa_session):
-                sa_session.commit()
         else:
             old_hash_value = hash.hash_value
             if old_hash_value != calculated_hash_value:
@@ -525,7 +553,7 @@ class DatasetAssociationManager(
         self.ensure_can_set_metadata(dataset_assoc)
         assert dataset_assoc.dataset
         path = dataset_assoc.dataset.get_file_name()
-        datatype = sniff.guess_ext(path, self.app.datatypes_registry.sniff_order)
+        datatype = sniff.guess_ext(path, self.app.datatypes_registry.sniff_index)
         self.app.datatypes_registry.change_datatype(dataset_assoc, datatype)
         with transaction(session):
             session.commit()
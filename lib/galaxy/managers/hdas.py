@@ -242,14 +242,11 @@ class HDAManager(
         Purge this HDA and the dataset underlying it.
         """
         user = hda.history.user or None
-        quota_amount_reduction = 0
-        if user:
-            quota_amount_reduction = hda.quota_amount(user)
+        was_purged = hda.purged
         super().purge(hda, flush=flush)
         # decrease the user's space used
-        quota_source_info = hda.dataset.quota_source_info
-        if quota_amount_reduction and quota_source_info.use:
-            user.adjust_total_disk_usage(-quota_amount_reduction, quota_source_info.label)
+        if user and not was_purged:
+            hda.purge_usage_from_quota(user, hda.dataset.quota_source_info)
             # TODO: don't flush above if we're going to re-flush here
             session = object_session(user)
             assert session
@@ -9,9 +9,12 @@ from typing import (
     Any,
     Dict,
     List,
+    Optional,
+    Tuple,
 )
 
 from sqlalchemy import (
+    and_,
     asc,
     cast,
     desc,
@@ -21,6 +24,7 @@ from sqlalchemy import (
     literal,
     nullsfirst,
     nullslast,
+    or_,
     select,
     Select,
     sql,
@@ -86,6 +90,8 @@ class HistoryContentsManager(base.SortableManager):
         "collection_id",
         "name",
         "state",
+        # state of the HDA itself (e.g. failed_metadata), overrides the dataset state
+        "_state",
         "object_store_id",
         "size",
         "deleted",
@@ -152,6 +158,30 @@ class HistoryContentsManager(base.SortableManager):
             "Unknown order_by", order_by=order_by_string, available=available
         )
 
+    def keyset_order_by(self, descending=False):
+        """Return the order_by used for keyset pagination, (hid, history_content_type, id) in one direction."""
+        direction = desc if descending else asc
+        return [direction(column_name) for column_name in ("hid", "history_content_type", "id")]
+
+    def keyset_for(self, container, content_type: str, content_id: int) -> Tuple[int, str, int]:
+        """
+        Return the (hid, history_content_type, id) keyset of a content item in `container`,
+        to be used as the `after` cursor of `contents`.
+        """
+        if content_type == self.contained_class_type_name:
+            component_class = self.contained_class
+        elif content_type == self.subcontainer_class_type_name:
+            component_class = self.subcontainer_class
+        else:
+            raise glx_exceptions.RequestParameterInvalidException(f"Unknown contents type: {content_type}")
+        stmt = select(component_class.hid).where(
+            component_class.id == content_id, component_class.history_id == container.id
+        )
+        hid = self._session().scalar(stmt)
+        if hid is None:
+            raise glx_exceptions.ObjectNotFound(f"No {content_type} with id {content_id} in history {container.id}")
+        return (hid, content_type, content_id)
+
     # history specific methods
     def state_counts(self, history):
         """
@@ -275,11 +305,24 @@ class HistoryContentsManager(base.SortableManager):
         return True
 
     def _union_of_contents_query(
-        self, container, filters=None, limit=None, offset=None, order_by=None, user_id=None, **kwargs
+        self,
+        container,
+        filters=None,
+        limit=None,
+        offset=None,
+        order_by=None,
+        user_id=None,
+        after: Optional[Tuple[int, str, int]] = None,
+        descending=False,
+        **kwargs,
     ):
         """
         Returns a query for a limited and offset list of both types of contents,
         filtered and in some order.
+
+        If `after` is set to the keyset returned by `keyset_for`, only contents following
+        that item in (hid, history_content_type, id) order - descending if `descending` - are
+        returned. This replaces `order_by` and, unlike `offset`, does not slow down on deep pages.
         """
         order_by = order_by if order_by is not None else self.default_order_by
         order_by = order_by if isinstance(order_by, (tuple, list)) else (order_by,)
@@ -311,6 +354,15 @@ class HistoryContentsManager(base.SortableManager):
                 contained_query = self._apply_orm_filter(contained_query, orm_filter)
                 subcontainer_query = self._apply_orm_filter(subcontainer_query, orm_filter)
 
+        if after is not None:
+            contained_query = contained_query.filter(
+                self._keyset_filter(self.contained_class, self.contained_class_type_name, after, descending)
+            )
+            subcontainer_query = subcontainer_query.filter(
+                self._keyset_filter(self.subcontainer_class, self.subcontainer_class_type_name, after, descending)
+            )
+            order_by = self.keyset_order_by(descending)
+
         contents_query = contained_query.union_all(subcontainer_query)
         contents_query = contents_query.order_by(*order_by)
 
@@ -320,6 +372,26 @@ class HistoryContentsManager(base.SortableManager):
             contents_query = contents_query.offset(offset)
         return contents_query
 
+    def _keyset_filter(self, component_class, content_type, after, descending):
+        # history_content_type is constant within each side of the union, so comparing
+        # the (hid, history_content_type, id) tuples reduces to comparing hid and id
+        after_hid, after_type, after_id = after
+        if descending:
+            if content_type < after_type:
+                return component_class.hid <= after_hid
+            elif content_type > after_type:
+                return component_class.hid < after_hid
+            return or_(
+                component_class.hid < after_hid, and_(component_class.hid == after_hid, component_class.id < after_id)
+            )
+        if content_type > after_type:
+            return component_class.hid >= after_hid
+        elif content_type < after_type:
+            return component_class.hid > after_hid
+        return or_(
+            component_class.hid > after_hid, and_(component_class.hid == after_hid, component_class.id > after_id)
+        )
+
     def _apply_orm_filter(self, qry, orm_filter):
         if isinstance(orm_filter.filter, sql.elements.BinaryExpression):
             for match in filter(lambda col: col["name"] == orm_filter.filter.left.name, qry.column_descriptions):
@@ -381,6 +453,7 @@ class HistoryContentsManager(base.SortableManager):
             dataset_id=literal(None),
             size=literal(None),
             state=model.DatasetCollection.populated_state,
+            _state=literal(None),
             object_store_id=literal(None),
             quota_source_label=literal(None),
             # TODO: should be purgable? fix
@@ -627,6 +700,10 @@ class HistoryContentsFilters(
     def decode_type_id(self, type_id):
         TYPE_ID_SEP = "-"
         split = type_id.split(TYPE_ID_SEP, 1)
+        if len(split) != 2 or not all(split):
+            raise glx_exceptions.RequestParameterInvalidException(
+                f"Invalid type_id '{type_id}', expected the content type and encoded id separated by '{TYPE_ID_SEP}'"
+            )
         return TYPE_ID_SEP.join((split[0], str(self.app.security.decode_id(split[1]))))
 
     def parse_type_id_list(self, type_id_list_string, sep=","):
@@ -53,7 +53,9 @@ from galaxy.managers.lddas import LDDAManager
 from galaxy.model import (
     ImplicitCollectionJobs,
     ImplicitCollectionJobsJobAssociation,
+    is_job_cache_ignored_parameter,
     Job,
+    job_parameters_fingerprint,
     JobParameter,
     User,
     Workflow,
@@ -395,104 +397,131 @@ class JobSearch:
                 return key, value
             return key, value
 
-        stmt_sq = self._build_job_subquery(tool_id, user.id, tool_version, job_state, wildcard_param_dump)
-
-        stmt = select(Job.id).select_from(Job.table.join(stmt_sq, stmt_sq.c.id == Job.id))
-
-        data_conditions: List = []
-
-        # We now build the stmt filters that relate to the input datasets
-        # that this job uses. We keep track of the requested dataset id in `requested_ids`,
-        # the type (hda, hdca or lda) in `data_types`
-        # and the ids that have been used in the job that has already been run in `used_ids`.
-        requested_ids = []
-        data_types = []
-        used_ids: List = []
-        for k, input_list in input_data.items():
-            # k will be matched against the JobParameter.name column. This can be prefixed depending on whethter
-            # the input is in a repeat, or not (section and conditional)
-            k = {k, k.split("|")[-1]}
-            for type_values in input_list:
-                t = type_values["src"]
-                v = type_values["id"]
-                requested_ids.append(v)
-                data_types.append(t)
-                identifier = type_values["identifier"]
-                if t == "hda":
-                    stmt = self._build_stmt_for_hda(stmt, data_conditions, used_ids, k, v, identifier)
-                elif t == "ldda":
-                    stmt = self._build_stmt_for_ldda(stmt, data_conditions, used_ids, k, v)
-                elif t == "hdca":
-                    stmt = self._build_stmt_for_hdca(stmt, data_conditions, used_ids, k, v)
-                elif t == "dce":
-                    stmt = self._build_stmt_for_dce(stmt, data_conditions, used_ids, k, v)
-                else:
-                    return []
-
-            stmt = stmt.where(*data_conditions).group_by(model.Job.id, *used_ids).order_by(model.Job.id.desc())
-
-        for job in self.sa_session.execute(stmt):
-            # We found a job that is equal in terms of tool_id, user, state and input datasets,
-            # but to be able to verify that the parameters match we need to modify all instances of
-            # dataset_ids (HDA, LDDA, HDCA) in the incoming param_dump to point to those used by the
-            # possibly equivalent job, which may have been run on copies of the original input data.
-            job_input_ids = {}
-            if len(job) > 1:
-                # We do have datasets to check
-                job_id, current_jobs_data_ids = job[0], job[1:]
-                job_parameter_conditions = [model.Job.id == job_id]
-                for src, requested_id, used_id in zip(data_types, requested_ids, current_jobs_data_ids):
-                    if src not in job_input_ids:
-                        job_input_ids[src] = {requested_id: used_id}
+        # Parameters whose values reference datasets, these need to be verified against the inputs of each candidate.
+        # Other parameters are fully matched by the job subquery.
+        data_param_names = {k for k, v in wildcard_param_dump.items() if v != param_dump.get(k)}
+        fingerprint = job_parameters_fingerprint(
+            (k, json.dumps(None if v == {"__class__": "RuntimeValue"} else v, sort_keys=True))
+            for k, v in wildcard_param_dump.items()
+        )
+
+        def search(fingerprint: Optional[str]):
+            stmt_sq = self._build_job_subquery(
+                tool_id, user.id, tool_version, job_state, wildcard_param_dump, fingerprint
+            )
+
+            stmt = select(Job.id).select_from(Job.table.join(stmt_sq, stmt_sq.c.id == Job.id))
+
+            data_conditions: List = []
+
+            # We now build the stmt filters that relate to the input datasets
+            # that this job uses. We keep track of the requested dataset id in `requested_ids`,
+            # the type (hda, hdca or lda) in `data_types`
+            # and the ids that have been used in the job that has already been run in `used_ids`.
+            requested_ids = []
+            data_types = []
+            used_ids: List = []
+            for k, input_list in input_data.items():
+                # k will be matched against the JobParameter.name column. This can be prefixed depending on whethter
+                # the input is in a repeat, or not (section and conditional)
+                k = {k, k.split("|")[-1]}
+                for type_values in input_list:
+                    t = type_values["src"]
+                    v = type_values["id"]
+                    requested_ids.append(v)
+                    data_types.append(t)
+                    identifier = type_values["identifier"]
+                    if t == "hda":
+                        stmt = self._build_stmt_for_hda(stmt, data_conditions, used_ids, k, v, identifier)
+                    elif t == "ldda":
+                        stmt = self._build_stmt_for_ldda(stmt, data_conditions, used_ids, k, v)
+                    elif t == "hdca":
+                        stmt = self._build_stmt_for_hdca(stmt, data_conditions, used_ids, k, v)
+                    elif t == "dce":
+                        stmt = self._build_stmt_for_dce(stmt, data_conditions, used_ids, k, v)
                     else:
-                        job_input_ids[src][requested_id] = used_id
-                new_param_dump = remap(param_dump, visit=replace_dataset_ids)
-                # new_param_dump has its dataset ids remapped to those used by the job.
-                # We now ask if the remapped job parameters match the current job.
-                for k, v in new_param_dump.items():
-                    if v == {"__class__": "RuntimeValue"}:
-                        # TODO: verify this is always None. e.g. run with runtime input input
-                        v = None
-                    elif k.endswith("|__identifier__"):
-                        # We've taken care of this while constructing the conditions based on ``input_data`` above
-                        continue
-                    elif k == "chromInfo" and "?.len" in v:
-                        continue
-                    a = aliased(model.JobParameter)
-                    job_parameter_conditions.append(
-                        and_(model.Job.id == a.job_id, a.name == k, a.value == json.dumps(v, sort_keys=True))
-                    )
-            else:
-                job_parameter_conditions = [model.Job.id == job[0]]
-            job = get_job(self.sa_session, *job_parameter_conditions)
-            if job is None:
-                continue
-            n_parameters = 0
-            # Verify that equivalent jobs had the same number of job parameters
-            # We skip chrominfo, dbkey, __workflow_invocation_uuid__ and identifer
-            # parameter as these are not passed along when expanding tool parameters
-            # and they can differ without affecting the resulting dataset.
-            for parameter in job.parameters:
-                if parameter.name.startswith("__"):
-                    continue
-                if parameter.name in {"chromInfo", "dbkey"} or parameter.name.endswith("|__identifier__"):
+                        return None
+
+                stmt = stmt.where(*data_conditions).group_by(model.Job.id, *used_ids).order_by(model.Job.id.desc())
+
+            for job in self.sa_session.execute(stmt):
+                # We found a job that is equal in terms of tool_id, user, state and input datasets,
+                # but to be able to verify that the parameters match we need to modify all instances of
+                # dataset_ids (HDA, LDDA, HDCA) in the incoming param_dump to point to those used by the
+                # possibly equivalent job, which may have been run on copies of the original input data.
+                job_input_ids = {}
+                if len(job) > 1:
+                    # We do have datasets to check
+                    job_id, current_jobs_data_ids = job[0], job[1:]
+                    job_parameter_conditions = [model.Job.id == job_id]
+                    for src, requested_id, used_id in zip(data_types, requested_ids, current_jobs_data_ids):
+                        if src not in job_input_ids:
+                            job_input_ids[src] = {requested_id: used_id}
+                        else:
+                            job_input_ids[src][requested_id] = used_id
+                    new_param_dump = remap(param_dump, visit=replace_dataset_ids)
+                    # new_param_dump has its dataset ids remapped to those used by the job.
+                    # We now ask if the remapped job parameters match the current job.
+                    for k, v in new_param_dump.items():
+                        if k not in data_param_names:
+                            # Already matched by the job subquery
+                            continue
+                        elif k.endswith("|__identifier__"):
+                            # We've taken care of this while constructing the conditions based on ``input_data`` above
+                            continue
+                        a = aliased(model.JobParameter)
+                        job_parameter_conditions.append(
+                            and_(model.Job.id == a.job_id, a.name == k, a.value == json.dumps(v, sort_keys=True))
+                        )
+                else:
+                    job_parameter_conditions = [model.Job.id == job[0]]
+                job = get_job(self.sa_session, *job_parameter_conditions)
+                if job is None:
                     continue
-                n_parameters += 1
-            if not n_parameters == sum(
-                1
-                for k in param_dump
-                if not k.startswith("__") and not k.endswith("|__identifier__") and k not in {"chromInfo", "dbkey"}
-            ):
-                continue
+                if fingerprint is None:
+                    # Verify that equivalent jobs had the same number of job parameters,
+                    # parameters that are ignored here can differ without affecting the resulting dataset.
+                    # Implied by matching fingerprints.
+                    n_parameters = sum(
+                        1 for parameter in job.parameters if not is_job_cache_ignored_parameter(parameter.name)
+                    )
+                    if not n_parameters == sum(1 for k in param_dump if not is_job_cache_ignored_parameter(k)):
+                        continue
+                return job
+            return None
+
+        job = search(fingerprint)
+        if job is None and self._has_jobs_without_fingerprint(tool_id, user.id, tool_version, job_state):
+            # Jobs created before parameter fingerprints were recorded,
+            # use scripts/set_job_parameters_fingerprints.py to populate them.
+            job = search(None)
+        if job is not None:
             log.info("Found equivalent job %s", search_timer)
-            return job
-        log.info("No equivalent jobs found %s", search_timer)
-        return None
+        else:
+            log.info("No equivalent jobs found %s", search_timer)
+        return job
+
+    def _has_jobs_without_fingerprint(self, tool_id: str, user_id: int, tool_version: Optional[str], job_state) -> bool:
+        """Check whether any candidate job lacks a parameter fingerprint, before matching such jobs parameter by
+        parameter.
+        """
+        stmt_sq = self._build_job_subquery(tool_id, user_id, tool_version, job_state, {}, None)
+        return self.sa_session.scalar(select(stmt_sq.c.id).limit(1)) is not None
 
     def _build_job_subquery(
-        self, tool_id: str, user_id: int, tool_version: Optional[str], job_state, wildcard_param_dump
+        self,
+        tool_id: str,
+        user_id: int,
+        tool_version: Optional[str],
+        job_state,
+        wildcard_param_dump,
+        fingerprint: Optional[str] = None,
     ):
-        """Build subquery that selects a job with correct job parameters."""
+        """Build subquery that selects a job with correct job parameters.
+
+        If ``fingerprint`` is given parameters are matched using the job's parameter
+        fingerprint, otherwise jobs without a fingerprint are matched parameter by parameter.
+        """
         stmt = select(model.Job.id).where(
             and_(
                 model.Job.tool_id == tool_id,
@@ -523,7 +552,15 @@ class JobSearch:
             )
         )
 
+        if fingerprint is not None:
+            stmt = stmt.where(model.Job.parameters_fingerprint == fingerprint)
+        else:
+            stmt = stmt.where(model.Job.parameters_fingerprint.is_(None))
+
         for k, v in wildcard_param_dump.items():
+            if fingerprint is not None and not is_job_cache_ignored_parameter(k):
+                # matched by the fingerprint
+                continue
             if v == {"__class__": "RuntimeValue"}:
                 # TODO: verify this is always None. e.g. run with runtime input input
                 v = None
@@ -72,6 +72,7 @@ class MetadataCollectionStrategy(metaclass=abc.ABCMeta):
         include_command=True,
         max_metadata_value_size=0,
         max_discovered_files=None,
+        max_metadata_processes=1,
         object_store_conf=None,
         tool=None,
         job=None,
@@ -149,6 +150,7 @@ class PortableDirectoryMetadataGenerator(MetadataCollectionStrategy):
         include_command=True,
         max_metadata_value_size=0,
         max_discovered_files=None,
+        max_metadata_processes=1,
         validate_outputs=False,
         object_store_conf=None,
         tool=None,
@@ -205,6 +207,7 @@ class PortableDirectoryMetadataGenerator(MetadataCollectionStrategy):
             "datatypes_config": datatypes_config,
             "max_metadata_value_size": max_metadata_value_size,
             "max_discovered_files": max_discovered_files,
+            "max_metadata_processes": max_metadata_processes,
             "outputs": outputs,
             "change_datatype_actions": job.get_change_datatype_actions(),
         }
@@ -14,16 +14,22 @@ constructed automatically).
 import glob
 import json
 import logging
+import multiprocessing
 import os
 import sys
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from functools import partial
 from pathlib import Path
 from typing import (
     Any,
+    Callable,
     Dict,
+    Iterator,
     List,
     Optional,
+    Tuple,
 )
 
 try:
@@ -52,6 +58,7 @@ from galaxy.model import (
     DatasetInstance,
     HistoryDatasetAssociation,
     Job,
+    MetadataFile,
     store,
 )
 from galaxy.model.custom_types import total_size
@@ -83,6 +90,12 @@ log = logging.getLogger(__name__)
 
 
 MAX_STDIO_READ_BYTES = 100 * 10**6  # 100 MB
+# dataset instance attributes set_meta and set_peek may change, copied back from worker processes
+OUTPUT_META_ATTRIBUTES = ("extension", "blurb", "peek", "info", "tool_version")
+
+OutputMetaTask = Tuple[DatasetInstance, Callable[[], None]]
+# tasks of the running set_outputs_meta call, inherited by its forked worker processes
+_output_meta_tasks: List[OutputMetaTask] = []
 
 
 def reset_external_filename(dataset_instance: DatasetInstance):
@@ -149,6 +162,91 @@ def set_meta_with_tool_provided(
                 dataset_instance.metadata.remove_key(k)
 
 
+def dump_output_meta(dataset_instance: DatasetInstance) -> Dict[str, Any]:
+    # MetadataFile objects can't be serialized, but are only ever set before forking
+    metadata_files = [name for name, value in dataset_instance._metadata.items() if isinstance(value, MetadataFile)]
+    return {
+        "metadata": json.loads(dataset_instance.metadata.to_JSON_dict()),
+        "metadata_files": metadata_files,
+        "attributes": {name: getattr(dataset_instance, name) for name in OUTPUT_META_ATTRIBUTES},
+        "uuid": dataset_instance.dataset.uuid,
+    }
+
+
+def load_output_meta(dataset_instance: DatasetInstance, output_meta: Dict[str, Any]) -> None:
+    # set the extension first, it determines the metadata spec
+    for name, value in output_meta["attributes"].items():
+        setattr(dataset_instance, name, value)
+    dataset_instance.dataset.uuid = output_meta["uuid"]
+    metadata_files = {
+        name: dataset_instance._metadata[name]
+        for name in output_meta["metadata_files"]
+        if name in dataset_instance._metadata
+    }
+    metadata = output_meta["metadata"].copy()
+    spec = dataset_instance.metadata.spec
+    for name, value in output_meta["metadata"].items():
+        if name in spec and MetadataTempFile.is_JSONified_value(value):
+            # copy the files the worker wrote into MetadataFile objects, as set_meta creates them in this process
+            metadata_tmp_file = MetadataTempFile.from_JSON(value)
+            metadata_file = spec[name].param.new_file(dataset=dataset_instance, **metadata_tmp_file.kwds)
+            metadata_file.update_from_file(metadata_tmp_file.get_file_name())
+            metadata_files[name] = metadata_file
+            del metadata[name]
+    dataset_instance.metadata.from_JSON_dict(json_dict=metadata)
+    dataset_instance._metadata.update(metadata_files)
+
+
+def _run_output_meta_task(index: int) -> Tuple[bool, Any]:
+    dataset_instance, set_output_meta = _output_meta_tasks[index]
+    try:
+        set_output_meta()
+        return True, dump_output_meta(dataset_instance)
+    except Exception:
+        return False, traceback.format_exc()
+
+
+def can_set_outputs_meta_in_processes() -> bool:
+    # daemonic processes (e.g. celery workers) can't have children
+    return "fork" in multiprocessing.get_all_start_methods() and not multiprocessing.current_process().daemon
+
+
+def set_outputs_meta(tasks: List[OutputMetaTask], processes: int) -> Iterator[Tuple[bool, Any]]:
+    """
+    Run the set_meta/set_peek callable of each task in a pool of forked
+    worker processes, yielding for each task (in order) whether it succeeded
+    and either the resulting metadata and attributes to load with
+    :func:`load_output_meta` or the formatted traceback.
+
+    The workers inherit the dataset instances as prepared by this process,
+    which is why the pool has to be created after preparing all of them.
+    Every task gets a result, tasks fail if the pool can't be started or if
+    a worker process dies while they are pending.
+    """
+    global _output_meta_tasks
+    _output_meta_tasks = tasks
+    executor = None
+    try:
+        try:
+            executor = ProcessPoolExecutor(min(processes, len(tasks)), mp_context=multiprocessing.get_context("fork"))
+            futures = [executor.submit(_run_output_meta_task, index) for index in range(len(tasks))]
+        except Exception:
+            message = traceback.format_exc()
+            for _ in tasks:
+                yield False, message
+            return
+        for future in futures:
+            try:
+                yield future.result()
+            except BrokenProcessPool:
+                # a worker was killed (e.g. running out of memory), this fails all tasks that were not done yet
+                yield False, traceback.format_exc()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        _output_meta_tasks = []
+
+
 def set_metadata():
     set_metadata_portable()
 
@@ -196,20 +294,53 @@ def set_metadata_portable(
     max_metadata_value_size = metadata_params.get("max_metadata_value_size") or 0
     max_discovered_files = metadata_params.get("max_discovered_files")
     outputs = metadata_params["outputs"]
+    max_metadata_processes = metadata_params.get("max_metadata_processes") or 1
+    set_meta_in_processes = max_metadata_processes > 1 and len(outputs) > 1 and can_set_outputs_meta_in_processes()
 
     tool_provided_metadata = load_job_metadata(job_metadata, provided_metadata_style)
 
-    def set_meta(new_dataset_instance, file_dict):
+    def set_meta(new_dataset_instance, file_dict, output_set_meta_kwds=None):
+        kwds = set_meta_kwds if output_set_meta_kwds is None else output_set_meta_kwds
         if not extended_metadata_collection:
-            set_meta_kwds["metadata_tmp_files_dir"] = metadata_tmp_files_dir
+            kwds["metadata_tmp_files_dir"] = metadata_tmp_files_dir
         set_meta_with_tool_provided(
             new_dataset_instance,
             file_dict,
-            set_meta_kwds,
+            kwds,
             datatypes_registry,
             max_metadata_value_size,
         )
 
+    def set_extended_output_meta(dataset, file_dict, output_set_meta_kwds, run_set_meta, context):
+        if run_set_meta:
+            set_meta(dataset, file_dict, output_set_meta_kwds)
+        dataset.blurb = "done"
+        dataset.peek = "no peek"
+        dataset.info = dataset.info or ""
+        if context["stdout"].strip():
+            # Ensure white space between entries
+            dataset.info = f"{dataset.info.rstrip()}\n{context['stdout'].strip()}"
+        if context["stderr"].strip():
+            # Ensure white space between entries
+            dataset.info = f"{dataset.info.rstrip()}\n{context['stderr'].strip()}"
+        dataset.tool_version = version_string
+        if "uuid" in context:
+            dataset.dataset.uuid = context["uuid"]
+        if not final_job_state == Job.states.ERROR:
+            line_count = context.get("line_count", None)
+            dataset.set_peek(line_count=line_count)
+
+    def set_tool_provided_attributes(dataset, context):
+        for context_key in TOOL_PROVIDED_JOB_METADATA_KEYS:
+            if context_key in context:
+                context_value = context[context_key]
+                setattr(dataset, context_key, context_value)
+
+    def set_directory_output_meta(dataset, file_dict, output_set_meta_kwds, run_set_meta, filename_out):
+        if run_set_meta:
+            set_meta(dataset, file_dict, output_set_meta_kwds)
+        dataset.metadata.to_JSON_dict(filename_out)  # write out results of set_meta
+
     try:
         object_store = get_object_store(
             tool_job_working_directory=tool_job_working_directory, object_store=object_store
@@ -386,6 +517,8 @@ def set_metadata_portable(
                 if filename and object_id:
                     unnamed_id_to_path[object_id] = os.path.join(job_context.job_working_directory, filename)
 
+    output_meta_tasks: List[OutputMetaTask] = []
+    deferred_outputs = []
     for output_name, output_dict in outputs.items():
         dataset_instance_id = output_dict["id"]
         klass = getattr(galaxy.model, output_dict.get("model_class", "HistoryDatasetAssociation"))
@@ -402,6 +535,7 @@ def set_metadata_portable(
             json.load(open(filename_kwds))
         )  # load kwds; need to ensure our keywords are not unicode
         object_store_update_actions = []
+        is_set_meta_in_process = False
         try:
             is_deferred = bool(unnamed_is_deferred.get(dataset_instance_id))
             dataset.metadata_deferred = is_deferred
@@ -470,6 +604,13 @@ def set_metadata_portable(
             if output_dict.get("validate", False):
                 set_validated_state(dataset)
 
+            # We're going to run through set_metadata in collect_dynamic_outputs with more contextual metadata,
+            # so only run set_meta for fixed outputs
+            run_set_meta = dataset_instance_id not in unnamed_id_to_path and not dataset.dataset.purged
+            output_set_meta_kwds = set_meta_kwds
+            if set_meta_in_processes:
+                # MetadataFile objects can't be created in worker processes, datatypes write temporary files instead
+                output_set_meta_kwds = {**set_meta_kwds, "metadata_tmp_files_dir": metadata_tmp_files_dir}
             if extended_metadata_collection:
                 if not object_store or not export_store:
                     # Can't happen, but type system doesn't know
@@ -481,54 +622,69 @@ def set_metadata_portable(
                     object_store_update_actions.append(partial(reset_external_filename, dataset))
                 object_store_update_actions.append(partial(dataset.set_total_size))
                 object_store_update_actions.append(partial(export_store.add_dataset, dataset))
-                if dataset_instance_id not in unnamed_id_to_path and not dataset.dataset.purged:
+                if run_set_meta:
                     object_store_update_actions.append(partial(collect_extra_files, object_store, dataset, "."))
                     dataset_state = "deferred" if (is_deferred and final_job_state == "ok") else final_job_state
                     if not dataset.state == dataset.states.ERROR:
                         # Don't overwrite failed state (for invalid content) here
                         dataset.state = dataset.dataset.state = dataset_state
-                    # We're going to run through set_metadata in collect_dynamic_outputs with more contextual metadata,
-                    # so only run set_meta for fixed outputs
-                    if not dataset.dataset.purged:
-                        set_meta(dataset, file_dict)
                 # TODO: merge expression_context into tool_provided_metadata so we don't have to special case this (here and in _finish_dataset)
                 meta = tool_provided_metadata.get_dataset_meta(output_name, dataset.dataset.id, dataset.dataset.uuid)
                 if meta:
                     context = ExpressionContext(meta, expression_context)
                 else:
                     context = expression_context
-                dataset.blurb = "done"
-                dataset.peek = "no peek"
-                dataset.info = dataset.info or ""
-                if context["stdout"].strip():
-                    # Ensure white space between entries
-                    dataset.info = f"{dataset.info.rstrip()}\n{context['stdout'].strip()}"
-                if context["stderr"].strip():
-                    # Ensure white space between entries
-                    dataset.info = f"{dataset.info.rstrip()}\n{context['stderr'].strip()}"
-                dataset.tool_version = version_string
-                if "uuid" in context:
-                    dataset.dataset.uuid = context["uuid"]
-                if not final_job_state == Job.states.ERROR:
-                    line_count = context.get("line_count", None)
-                    dataset.set_peek(line_count=line_count)
-                for context_key in TOOL_PROVIDED_JOB_METADATA_KEYS:
-                    if context_key in context:
-                        context_value = context[context_key]
-                        setattr(dataset, context_key, context_value)
+                set_output_meta = partial(
+                    set_extended_output_meta, dataset, file_dict, output_set_meta_kwds, run_set_meta, context
+                )
+                finish_output_meta = partial(set_tool_provided_attributes, dataset, context)
             else:
-                if dataset_instance_id not in unnamed_id_to_path and not dataset.dataset.purged:
-                    # We're going to run through set_metadata in collect_dynamic_outputs with more contextual metadata,
-                    # so only run set_meta for fixed outputs
-                    set_meta(dataset, file_dict)
-                dataset.metadata.to_JSON_dict(filename_out)  # write out results of set_meta
-
-            with open(filename_results_code, "w+") as tf:
-                json.dump((True, "Metadata has been set successfully"), tf)  # setting metadata has succeeded
+                set_output_meta = partial(
+                    set_directory_output_meta, dataset, file_dict, output_set_meta_kwds, run_set_meta, filename_out
+                )
+                finish_output_meta = None
+
+            if set_meta_in_processes:
+                # set_meta and set_peek run in worker processes once all outputs are prepared
+                output_meta_tasks.append((dataset, set_output_meta))
+                deferred_outputs.append(
+                    (dataset, finish_output_meta, filename_results_code, object_store_update_actions)
+                )
+                is_set_meta_in_process = True
+            else:
+                set_output_meta()
+                if finish_output_meta:
+                    finish_output_meta()
+                with open(filename_results_code, "w+") as tf:
+                    json.dump((True, "Metadata has been set successfully"), tf)  # setting metadata has succeeded
         except Exception:
             with open(filename_results_code, "w+") as tf:
                 json.dump((False, traceback.format_exc()), tf)  # setting metadata has failed somehow
         finally:
+            if not is_set_meta_in_process:
+                for action in object_store_update_actions:
+                    action()
+
+    if output_meta_tasks:
+        results = set_outputs_meta(output_meta_tasks, max_metadata_processes)
+        # merge the results in the order of the outputs, as if setting metadata one output after the other
+        for (dataset, finish_output_meta, filename_results_code, object_store_update_actions), (
+            set_successfully,
+            result,
+        ) in zip(deferred_outputs, results):
+            # failed worker processes return the traceback
+            message = result
+            if set_successfully:
+                try:
+                    if extended_metadata_collection:
+                        load_output_meta(dataset, result)
+                    if finish_output_meta:
+                        finish_output_meta()
+                    message = "Metadata has been set successfully"
+                except Exception:
+                    set_successfully, message = False, traceback.format_exc()
+            with open(filename_results_code, "w+") as tf:
+                json.dump((set_successfully, message), tf)
             for action in object_store_update_actions:
                 action()
 
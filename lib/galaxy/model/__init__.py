@@ -8,6 +8,7 @@ the relationship cardinalities are obvious (e.g. prefer Dataset to Data)
 import abc
 import base64
 import errno
+import hashlib
 import json
 import logging
 import numbers
@@ -285,6 +286,8 @@ JOB_METRIC_SCALE = 7
 # Tags that get automatically propagated from inputs to outputs when running jobs.
 AUTO_PROPAGATED_TAGS = ["name"]
 YIELD_PER_ROWS = 100
+# Replaces ids of datasets and collections referenced by job parameters when computing parameter fingerprints.
+JOB_PARAMETER_ID_WILDCARD = "__id_wildcard__"
 CANNOT_SHARE_PRIVATE_DATASET_MESSAGE = "Attempting to share a non-shareable dataset."
 
 
@@ -676,11 +679,23 @@ WHERE id = :id
         label_usage = UNIQUE_DATASET_USER_USAGE.format(
             and_dataset_condition="AND ( dataset.object_store_id IN :include_object_store_ids )"
         )
-        if for_sqlite:
-            # hacky alternative for older sqlite
-            statement = f"""
+        statement = _set_quota_source_usage_statement(f"({label_usage})", for_sqlite)
+        statements.append(
+            (statement, {"id": user_id, "label": quota_source_label, "include_object_store_ids": object_store_ids})
+        )
+
+    statements.append(_clean_quota_source_usage_statement(user_id, list(source.keys())))
+    # user_dataset_usage isn't updated here, rebuild it on the next reconciliation
+    statements.append(("UPDATE galaxy_user SET disk_usage_reconcile_time = NULL WHERE id = :id", {"id": user_id}))
+    return statements
+
+
+def _set_quota_source_usage_statement(disk_usage, for_sqlite):
+    if for_sqlite:
+        # hacky alternative for older sqlite
+        return f"""
 WITH new (user_id, quota_source_label, disk_usage) AS (
-    VALUES(:id, :label, ({label_usage}))
+    VALUES(:id, :label, {disk_usage})
 )
 INSERT OR REPLACE INTO user_quota_source_usage (id, user_id, quota_source_label, disk_usage)
 SELECT old.id, new.user_id, new.quota_source_label, new.disk_usage
@@ -689,20 +704,18 @@ FROM new
         ON new.user_id = old.user_id
             AND new.quota_source_label = old.quota_source_label
 """
-        else:
-            statement = f"""
+    else:
+        return f"""
 INSERT INTO user_quota_source_usage(user_id, quota_source_label, disk_usage)
-VALUES(:id, :label, ({label_usage}))
+VALUES(:id, :label, {disk_usage})
 ON CONFLICT
 ON constraint uqsu_unique_label_per_user
 DO UPDATE SET disk_usage = excluded.disk_usage
 """
-        statements.append(
-            (statement, {"id": user_id, "label": quota_source_label, "include_object_store_ids": object_store_ids})
-        )
 
+
+def _clean_quota_source_usage_statement(user_id, source_labels):
     params = {"id": user_id}
-    source_labels = list(source.keys())
     if len(source_labels) > 0:
         clean_old_statement = """
 DELETE FROM user_quota_source_usage
@@ -714,7 +727,43 @@ WHERE user_id = :id AND quota_source_label NOT IN :labels
 DELETE FROM user_quota_source_usage
 WHERE user_id = :id AND quota_source_label IS NOT NULL
 """
-    statements.append((clean_old_statement, params))
+    return (clean_old_statement, params)
+
+
+def set_user_disk_usage_statements(user_id, quota_source_map, usage_per_objectstore, for_sqlite=False):
+    """Build statements setting user disk usage from usage already grouped by object store.
+
+    ``usage_per_objectstore`` holds ``(usage, object_store_id)`` rows as returned by
+    :func:`rebuild_user_dataset_usage`, so the user's datasets are only scanned once
+    instead of once for the default quota source and once more per quota source label.
+    """
+    default_quota_enabled = quota_source_map.default_quota_enabled
+    default_exclude_ids = set(quota_source_map.default_usage_excluded_ids())
+    source = quota_source_map.ids_per_quota_source()
+    label_per_object_store_id = {
+        object_store_id: label for label, object_store_ids in source.items() for object_store_id in object_store_ids
+    }
+    default_usage = 0
+    usage_per_label = {label: 0 for label in source}
+    for usage, object_store_id in usage_per_objectstore:
+        usage = int(usage or 0)
+        if object_store_id is None:
+            counts_as_default = default_quota_enabled or not default_exclude_ids
+        else:
+            counts_as_default = object_store_id not in default_exclude_ids
+        if counts_as_default:
+            default_usage += usage
+        label = label_per_object_store_id.get(object_store_id)
+        if label is not None:
+            usage_per_label[label] += usage
+
+    statements = [
+        ("UPDATE galaxy_user SET disk_usage = :disk_usage WHERE id = :id", {"id": user_id, "disk_usage": default_usage})
+    ]
+    statement = _set_quota_source_usage_statement(":disk_usage", for_sqlite)
+    for quota_source_label, usage in usage_per_label.items():
+        statements.append((statement, {"id": user_id, "label": quota_source_label, "disk_usage": usage}))
+    statements.append(_clean_quota_source_usage_statement(user_id, list(source.keys())))
     return statements
 
 
@@ -747,6 +796,72 @@ def calculate_disk_usage_per_objectstore(sa_session, user_id: int):
     return sa_session.execute(text(statement), params).all()
 
 
+REBUILD_USER_DATASET_USAGE = """
+INSERT INTO user_dataset_usage (user_id, dataset_id, hda_count, disk_usage)
+SELECT :id, dataset.id, per_dataset.hda_count,
+    CASE WHEN EXISTS (
+        SELECT 1 FROM library_dataset_dataset_association WHERE dataset_id = dataset.id
+    ) THEN 0 ELSE COALESCE(dataset.total_size, dataset.file_size, 0) END
+FROM (
+    SELECT history_dataset_association.dataset_id, COUNT(*) AS hda_count
+    FROM history_dataset_association
+    JOIN history ON history.id = history_dataset_association.history_id
+    WHERE history.user_id = :id
+        AND NOT history.purged
+        AND NOT history_dataset_association.purged
+    GROUP BY history_dataset_association.dataset_id
+) AS per_dataset
+JOIN dataset ON dataset.id = per_dataset.dataset_id
+"""
+
+USER_DATASET_USAGE_PER_OBJECTSTORE = """
+SELECT SUM(user_dataset_usage.disk_usage) as usage, dataset.object_store_id
+FROM user_dataset_usage
+JOIN dataset ON dataset.id = user_dataset_usage.dataset_id
+WHERE user_dataset_usage.user_id = :id
+GROUP BY dataset.object_store_id
+"""
+
+
+def _user_hda_counts(sa_session, user_id, dataset_ids, exclude_hda_ids=None) -> Dict[int, int]:
+    """Count the user's non-purged HDAs in non-purged histories per dataset."""
+    stmt = (
+        select(HistoryDatasetAssociation.dataset_id, func.count(HistoryDatasetAssociation.id))
+        .join(History, HistoryDatasetAssociation.history_id == History.id)
+        .where(
+            History.user_id == user_id,
+            History.purged == false(),
+            HistoryDatasetAssociation.purged == false(),
+            HistoryDatasetAssociation.dataset_id.in_(dataset_ids),
+        )
+        .group_by(HistoryDatasetAssociation.dataset_id)
+    )
+    if exclude_hda_ids:
+        stmt = stmt.where(HistoryDatasetAssociation.id.not_in(exclude_hda_ids))
+    return dict(sa_session.execute(stmt).all())
+
+
+def _library_dataset_ids(sa_session, dataset_ids) -> Set[int]:
+    stmt = select(LibraryDatasetDatasetAssociation.dataset_id).where(
+        LibraryDatasetDatasetAssociation.dataset_id.in_(dataset_ids)
+    )
+    return set(sa_session.scalars(stmt))
+
+
+def _dataset_disk_usage(dataset, hda_count, in_library) -> int:
+    if not hda_count or in_library:
+        return 0
+    return int(dataset.get_total_size() or 0)
+
+
+def rebuild_user_dataset_usage(sa_session, user_id: int):
+    """Rebuild the user's ``user_dataset_usage`` rows and return their usage grouped by object store."""
+    params = {"id": user_id}
+    sa_session.execute(text("DELETE FROM user_dataset_usage WHERE user_id = :id"), params)
+    sa_session.execute(text(REBUILD_USER_DATASET_USAGE), params)
+    return sa_session.execute(text(USER_DATASET_USAGE_PER_OBJECTSTORE), params).all()
+
+
 # move these to galaxy.schema.schema once galaxy-data depends on
 # galaxy-schema.
 class UserQuotaBasicUsage(BaseModel):
@@ -790,6 +905,8 @@ class User(Base, Dictifiable, RepresentById):
     deleted: Mapped[Optional[bool]] = mapped_column(index=True, default=False)
     purged: Mapped[Optional[bool]] = mapped_column(index=True, default=False)
     disk_usage: Mapped[Optional[Decimal]] = mapped_column(Numeric(15, 0), index=True)
+    # histories changed after this time are checked by reconcile_disk_usage
+    disk_usage_reconcile_time: Mapped[Optional[datetime]]
     # Column("person_metadata", JSONType),  # TODO: add persistent, configurable metadata rep for workflow creator
     active: Mapped[bool] = mapped_column(index=True, default=True)
     activation_token: Mapped[Optional[str]] = mapped_column(TrimmedString(64), index=True)
@@ -1061,6 +1178,70 @@ ON CONFLICT
                 with engine.connect() as conn, conn.begin():
                     conn.execute(statement, params)
 
+    def adjust_dataset_usage(self, hdas, delta, quota_source_info=None):
+        """
+        Add ``delta`` to the number of this user's HDAs referencing each dataset of ``hdas``.
+
+        A dataset is charged when the user's first HDA of it is added and credited when the
+        last one is purged, so a dataset in several of the user's histories is counted once.
+        When adding, ``hdas`` must not be counted yet; when removing, they must still be.
+        A ``delta`` of 0 charges the size change of datasets that were already added.
+        ``quota_source_info`` defaults to the quota source of each dataset.
+        """
+        hdas_per_dataset: Dict["Dataset", List["HistoryDatasetAssociation"]] = defaultdict(list)
+        for hda in hdas:
+            if delta >= 0 and hda.purged:
+                continue
+            hdas_per_dataset[hda.dataset].append(hda)
+        if not hdas_per_dataset:
+            return
+        sa_session = object_session(self)
+        dataset_ids = [dataset.id for dataset in hdas_per_dataset if dataset.id is not None]
+        usages: Dict[int, UserDatasetUsage] = {}
+        hda_counts: Dict[int, int] = {}
+        library_dataset_ids: Set[int] = set()
+        if sa_session is not None and self.id is not None and dataset_ids:
+            # hdas being added must not be counted as other hdas of the user
+            with sa_session.no_autoflush:
+                stmt = select(UserDatasetUsage).where(
+                    UserDatasetUsage.user_id == self.id, UserDatasetUsage.dataset_id.in_(dataset_ids)
+                )
+                usages = {usage.dataset_id: usage for usage in sa_session.scalars(stmt)}
+                untracked_ids = [dataset_id for dataset_id in dataset_ids if dataset_id not in usages]
+                if untracked_ids:
+                    hda_ids = [hda.id for hdas in hdas_per_dataset.values() for hda in hdas if hda.id is not None]
+                    hda_counts = _user_hda_counts(sa_session, self.id, untracked_ids, exclude_hda_ids=hda_ids)
+                library_dataset_ids = _library_dataset_ids(sa_session, dataset_ids)
+        usage_per_label: Dict[Optional[str], int] = defaultdict(int)
+        for dataset, dataset_hdas in hdas_per_dataset.items():
+            in_library = dataset.id in library_dataset_ids
+            usage = usages.get(dataset.id)
+            if usage is None:
+                # start from the user's other hdas of the dataset, which are assumed to be
+                # charged already - unless the dataset size is being charged now
+                hda_count = hda_counts.get(dataset.id, 0)
+                if delta <= 0:
+                    hda_count += len(dataset_hdas)
+                disk_usage = _dataset_disk_usage(dataset, hda_count, in_library) if delta else 0
+                usage = UserDatasetUsage(user=self, dataset=dataset, hda_count=hda_count, disk_usage=disk_usage)
+                if sa_session is not None:
+                    sa_session.add(usage)
+            usage.hda_count = max(usage.hda_count + delta * len(dataset_hdas), 0)
+            disk_usage = _dataset_disk_usage(dataset, usage.hda_count, in_library)
+            amount = disk_usage - int(usage.disk_usage or 0)
+            usage.disk_usage = disk_usage
+            if usage.hda_count == 0 and sa_session is not None:
+                if usage.id is None:
+                    sa_session.expunge(usage)
+                else:
+                    sa_session.delete(usage)
+            if amount:
+                source_info = quota_source_info or dataset.quota_source_info
+                if source_info.use:
+                    usage_per_label[source_info.label] += amount
+        for label, amount in usage_per_label.items():
+            self.adjust_total_disk_usage(amount, label)
+
     def _get_social_auth(self, provider_backend):
         if not self.social_auth:
             return None
@@ -1136,6 +1317,69 @@ ON CONFLICT
         """
         self._calculate_or_set_disk_usage(object_store=object_store)
 
+    def reconcile_disk_usage(self, object_store):
+        """
+        Reconcile disk usage with the datasets of histories changed since the last
+        reconciliation, falling back to calculating all of it the first time.
+        """
+        assert object_store is not None
+        if self.disk_usage_reconcile_time is None:
+            self.calculate_and_set_disk_usage(object_store)
+            return
+        quota_source_map = object_store.get_quota_source_map()
+        sa_session = object_session(self)
+        reconcile_time = now()
+        changed_histories = (
+            select(HistoryAudit.history_id)
+            .join(History, HistoryAudit.history_id == History.id)
+            .where(History.user_id == self.id, HistoryAudit.update_time >= self.disk_usage_reconcile_time)
+        )
+        stmt = (
+            select(HistoryDatasetAssociation.dataset_id)
+            .where(HistoryDatasetAssociation.history_id.in_(changed_histories))
+            .distinct()
+        )
+        dataset_ids = [dataset_id for dataset_id in sa_session.scalars(stmt) if dataset_id is not None]
+        if dataset_ids:
+            hda_counts = _user_hda_counts(sa_session, self.id, dataset_ids)
+            library_dataset_ids = _library_dataset_ids(sa_session, dataset_ids)
+            stmt = select(UserDatasetUsage).where(
+                UserDatasetUsage.user_id == self.id, UserDatasetUsage.dataset_id.in_(dataset_ids)
+            )
+            usages = {usage.dataset_id: usage for usage in sa_session.scalars(stmt)}
+            stmt = select(Dataset.id, Dataset.total_size, Dataset.file_size, Dataset.object_store_id).where(
+                Dataset.id.in_(dataset_ids)
+            )
+            usage_per_label: Dict[Optional[str], int] = defaultdict(int)
+            for dataset_id, total_size, file_size, object_store_id in sa_session.execute(stmt):
+                hda_count = hda_counts.get(dataset_id, 0)
+                disk_usage = 0
+                if hda_count and dataset_id not in library_dataset_ids:
+                    disk_usage = int(total_size if total_size is not None else file_size or 0)
+                usage = usages.get(dataset_id)
+                amount = disk_usage - (int(usage.disk_usage) if usage else 0)
+                if not hda_count:
+                    if usage:
+                        sa_session.delete(usage)
+                elif usage:
+                    usage.hda_count = hda_count
+                    usage.disk_usage = disk_usage
+                else:
+                    sa_session.add(
+                        UserDatasetUsage(
+                            user_id=self.id, dataset_id=dataset_id, hda_count=hda_count, disk_usage=disk_usage
+                        )
+                    )
+                if amount:
+                    quota_source_info = quota_source_map.get_quota_source_info(object_store_id)
+                    if quota_source_info.use:
+                        usage_per_label[quota_source_info.label] += amount
+            for label, amount in usage_per_label.items():
+                self.adjust_total_disk_usage(amount, label)
+        self.disk_usage_reconcile_time = reconcile_time
+        with transaction(sa_session):
+            sa_session.commit()
+
     def _calculate_or_set_disk_usage(self, object_store):
         """
         Utility to calculate and return the disk usage.  If dryrun is False,
@@ -1145,7 +1389,9 @@ ON CONFLICT
         quota_source_map = object_store.get_quota_source_map()
         sa_session = object_session(self)
         for_sqlite = "sqlite" in sa_session.bind.dialect.name
-        statements = calculate_user_disk_usage_statements(self.id, quota_source_map, for_sqlite)
+        reconcile_time = now()
+        usage_per_objectstore = rebuild_user_dataset_usage(sa_session, self.id)
+        statements = set_user_disk_usage_statements(self.id, quota_source_map, usage_per_objectstore, for_sqlite)
         for sql, args in statements:
             statement = text(sql)
             binds = []
@@ -1158,6 +1404,7 @@ ON CONFLICT
             # the existing value - we're setting it in raw SQL for
             # performance reasons and bypassing object properties.
             sa_session.expire(self, ["disk_usage"])
+        self.disk_usage_reconcile_time = reconcile_time
         with transaction(sa_session):
             sa_session.commit()
 
@@ -1454,6 +1701,7 @@ class Job(Base, JobLike, UsesCreateAndUpdateTime, Dictifiable, Serializable):
     handler: Mapped[Optional[str]] = mapped_column(TrimmedString(255), index=True)
     preferred_object_store_id: Mapped[Optional[str]] = mapped_column(String(255))
     object_store_id_overrides: Mapped[Optional[STR_TO_STR_DICT]] = mapped_column(JSONType)
+    parameters_fingerprint: Mapped[Optional[str]] = mapped_column(String(64), index=True)
 
     user: Mapped[Optional["User"]] = relationship()
     galaxy_session: Mapped[Optional["GalaxySession"]] = relationship()
@@ -1741,6 +1989,10 @@ class Job(Base, JobLike, UsesCreateAndUpdateTime, Dictifiable, Serializable):
     def add_parameter(self, name, value):
         self.parameters.append(JobParameter(name, value))
 
+    def set_parameters_fingerprint(self):
+        """Record the fingerprint of this job's parameters, used to find equivalent jobs."""
+        self.parameters_fingerprint = job_parameters_fingerprint((p.name, p.value) for p in self.parameters)
+
     def add_input_dataset(self, name, dataset=None, dataset_id=None):
         assoc = JobToInputDatasetAssociation(name, dataset)
         if dataset is None and dataset_id is not None:
@@ -2361,6 +2613,42 @@ class Task(Base, JobLike, RepresentById):
         self.prepare_input_files_cmd = prepare_input_files_cmd
 
 
+def is_job_cache_ignored_parameter(name: str) -> bool:
+    """Return True if parameter ``name`` may differ between equivalent jobs.
+
+    These parameters are not passed along when expanding tool parameters and
+    can differ without affecting the resulting datasets.
+    """
+    return name.startswith("__") or name in ("chromInfo", "dbkey") or name.endswith("|__identifier__")
+
+
+def job_parameters_fingerprint(parameters: Iterable[Tuple[str, Optional[str]]]) -> str:
+    """Hash JSON encoded job parameters for finding equivalent jobs.
+
+    Ids of datasets and collections referenced by parameters are ignored,
+    inputs need to be compared separately.
+    """
+
+    def wildcard_ids(value):
+        if isinstance(value, dict):
+            return {k: JOB_PARAMETER_ID_WILDCARD if k == "id" else wildcard_ids(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [wildcard_ids(v) for v in value]
+        return value
+
+    canonical_parameters = {}
+    for name, value in parameters:
+        if is_job_cache_ignored_parameter(name):
+            continue
+        if value is not None:
+            try:
+                value = wildcard_ids(json.loads(value))
+            except ValueError:
+                pass
+        canonical_parameters[name] = value
+    return hashlib.sha256(json.dumps(canonical_parameters, sort_keys=True).encode("utf-8")).hexdigest()
+
+
 class JobParameter(Base, RepresentById):
     __tablename__ = "job_parameter"
 
@@ -3324,9 +3612,7 @@ class History(Base, HasTags, Dictifiable, UsesAnnotations, HasName, Serializable
                 dataset.hid = self._next_hid()
         add_object_to_object_session(dataset, self)
         if quota and is_dataset and self.user:
-            quota_source_info = dataset.dataset.quota_source_info
-            if quota_source_info.use:
-                self.user.adjust_total_disk_usage(dataset.quota_amount(self.user), quota_source_info.label)
+            self.user.adjust_dataset_usage([dataset], 1)
         dataset.history = self
         if is_dataset and genome_build not in [None, "?"]:
             self.genome_build = genome_build
@@ -3343,11 +3629,7 @@ class History(Base, HasTags, Dictifiable, UsesAnnotations, HasName, Serializable
         if optimize:
             self.__add_datasets_optimized(datasets, genome_build=genome_build)
             if quota and self.user:
-                disk_usage = sum(d.get_total_size() for d in datasets if is_hda(d))
-                if disk_usage:
-                    quota_source_info = datasets[0].dataset.quota_source_info
-                    if quota_source_info.use:
-                        self.user.adjust_total_disk_usage(disk_usage, quota_source_info.label)
+                self.user.adjust_dataset_usage([d for d in datasets if is_hda(d)], 1)
             sa_session.add_all(datasets)
             if flush:
                 with transaction(sa_session):
@@ -3413,15 +3695,20 @@ class History(Base, HasTags, Dictifiable, UsesAnnotations, HasName, Serializable
             hdas = self.datasets
         else:
             hdas = self.active_datasets
+        new_hdas = []
         for hda in hdas:
             # Copy HDA.
             new_hda = hda.copy(flush=False)
-            new_history.add_dataset(new_hda, set_hid=False, quota=applies_to_quota)
+            new_history.add_dataset(new_hda, set_hid=False, quota=False)
+            new_hdas.append(new_hda)
 
             if target_user:
                 new_hda.copy_item_annotation(db_session, self.user, hda, target_user, new_hda)
                 new_hda.copy_tags_from(target_user, hda)
 
+        if applies_to_quota and target_user:
+            target_user.adjust_dataset_usage(new_hdas, 1)
+
         # Copy history dataset collections
         if all_datasets:
             hdcas = self.dataset_collections
@@ -3759,6 +4046,24 @@ class UserQuotaSourceUsage(Base, Dictifiable, RepresentById):
     user: Mapped[Optional["User"]] = relationship(back_populates="quota_source_usages")
 
 
+class UserDatasetUsage(Base, RepresentById):
+    """
+    Number of a user's HDAs referencing a dataset and the bytes the dataset adds
+    to the user's disk usage.
+    """
+
+    __tablename__ = "user_dataset_usage"
+    __table_args__ = (UniqueConstraint("user_id", "dataset_id", name="udu_unique_dataset_per_user"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("galaxy_user.id"))
+    dataset_id: Mapped[int] = mapped_column(ForeignKey("dataset.id"), index=True)
+    hda_count: Mapped[int] = mapped_column(default=0)
+    disk_usage: Mapped[Decimal] = mapped_column(Numeric(15, 0), default=0)
+    user: Mapped["User"] = relationship()
+    dataset: Mapped["Dataset"] = relationship()
+
+
 class UserQuotaAssociation(Base, Dictifiable, RepresentById):
     __tablename__ = "user_quota_association"
 
@@ -5417,8 +5722,8 @@ class HistoryDatasetAssociation(DatasetInstance, HasTags, Dictifiable, UsesAnnot
 
     def purge_usage_from_quota(self, user, quota_source_info):
         """Remove this HDA's quota_amount from user's quota."""
-        if user and quota_source_info.use:
-            user.adjust_total_disk_usage(-self.quota_amount(user), quota_source_info.label)
+        if user:
+            user.adjust_dataset_usage([self], -1, quota_source_info)
 
     def quota_amount(self, user):
         """
@@ -8746,6 +9051,33 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
 
     @staticmethod
     def poll_active_workflow_ids(engine, scheduler=None, handler=None):
+        stmt = (
+            select(WorkflowInvocation.id)
+            .filter(WorkflowInvocation._active_workflow_condition(scheduler, handler))
+            .order_by(WorkflowInvocation.id.asc())
+        )
+        # Immediately just load all ids into memory so time slicing logic
+        # is relatively intutitive.
+        with engine.connect() as conn:
+            return conn.scalars(stmt).all()
+
+    @staticmethod
+    def poll_active_workflow_ids_by_user(engine, scheduler=None, handler=None) -> Dict[Optional[int], List[int]]:
+        """Return ids of active workflow invocations grouped by the id of the user owning their history."""
+        stmt = (
+            select(WorkflowInvocation.id, History.user_id)
+            .join(History, WorkflowInvocation.history_id == History.id)
+            .filter(WorkflowInvocation._active_workflow_condition(scheduler, handler))
+            .order_by(WorkflowInvocation.id.asc())
+        )
+        ids_by_user: Dict[Optional[int], List[int]] = {}
+        with engine.connect() as conn:
+            for invocation_id, user_id in conn.execute(stmt):
+                ids_by_user.setdefault(user_id, []).append(invocation_id)
+        return ids_by_user
+
+    @staticmethod
+    def _active_workflow_condition(scheduler=None, handler=None):
         and_conditions = [
             or_(
                 WorkflowInvocation.state == WorkflowInvocation.states.NEW,
@@ -8757,12 +9089,7 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
             and_conditions.append(WorkflowInvocation.scheduler == scheduler)
         if handler is not None:
             and_conditions.append(WorkflowInvocation.handler == handler)
-
-        stmt = select(WorkflowInvocation.id).filter(and_(*and_conditions)).order_by(WorkflowInvocation.id.asc())
-        # Immediately just load all ids into memory so time slicing logic
-        # is relatively intutitive.
-        with engine.connect() as conn:
-            return conn.scalars(stmt).all()
+        return and_(*and_conditions)
 
     def add_output(self, workflow_output, step, output_object):
         if not hasattr(output_object, "history_content_type"):
@@ -0,0 +1,56 @@
+"""Add user_dataset_usage table and disk_usage_reconcile_time column
+
+Revision ID: 3b8f1a6c0d2e
+Revises: a42a15bd390d
+Create Date: 2026-10-18 23:41:07.215874
+
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Numeric,
+    UniqueConstraint,
+)
+
+from galaxy.model.migrations.util import (
+    add_column,
+    create_table,
+    drop_column,
+    drop_table,
+    transaction,
+)
+
+# revision identifiers, used by Alembic.
+revision = "3b8f1a6c0d2e"
+down_revision = "a42a15bd390d"
+branch_labels = None
+depends_on = None
+
+# database object names used in this revision
+table_name = "user_dataset_usage"
+unique_constraint_name = "udu_unique_dataset_per_user"
+user_table_name = "galaxy_user"
+column_name = "disk_usage_reconcile_time"
+
+
+def upgrade():
+    with transaction():
+        create_table(
+            table_name,
+            Column("id", Integer, primary_key=True),
+            Column("user_id", Integer, ForeignKey("galaxy_user.id"), nullable=False),
+            Column("dataset_id", Integer, ForeignKey("dataset.id"), nullable=False, index=True),
+            Column("hda_count", Integer, nullable=False),
+            Column("disk_usage", Numeric(15, 0), nullable=False),
+            UniqueConstraint("user_id", "dataset_id", name=unique_constraint_name),
+        )
+        add_column(user_table_name, Column(column_name, DateTime))
+
+
+def downgrade():
+    with transaction():
+        drop_column(user_table_name, column_name)
+        drop_table(table_name)
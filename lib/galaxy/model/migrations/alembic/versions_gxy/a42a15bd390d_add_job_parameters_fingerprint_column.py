@@ -0,0 +1,41 @@
+"""Add parameters_fingerprint column to job table
+
+Revision ID: a42a15bd390d
+Revises: 25b092f7938b
+Create Date: 2026-10-18 10:12:41.527310
+
+"""
+
+from sqlalchemy import (
+    Column,
+    String,
+)
+
+from galaxy.model.database_object_names import build_index_name
+from galaxy.model.migrations.util import (
+    add_column,
+    drop_column,
+    drop_index,
+    transaction,
+)
+
+# revision identifiers, used by Alembic.
+revision = "a42a15bd390d"
+down_revision = "25b092f7938b"
+branch_labels = None
+depends_on = None
+
+# database object names used in this revision
+table_name = "job"
+column_name = "parameters_fingerprint"
+index_name = build_index_name(table_name, column_name)
+
+
+def upgrade():
+    add_column(table_name, Column(column_name, String(64), index=True))
+
+
+def downgrade():
+    with transaction():
+        drop_index(index_name, table_name)
+        drop_column(table_name, column_name)
@@ -944,6 +944,27 @@ WHERE history.user_id != :user_id and history_dataset_association.dataset_id = :
                 self.sa_session.commit()
         return ""
 
+    def set_new_datasets_permissions(self, datasets_and_permissions):
+        """
+        Set full permissions on many new, already flushed datasets with a single
+        bulk insert. Like set_all_dataset_permissions with new=True, datasets whose
+        permissions lack a manage permissions role are left without permissions.
+        """
+        insert_values = []
+        for dataset, permissions in datasets_and_permissions:
+            if not any(_walk_action_roles(permissions, self.permitted_actions.DATASET_MANAGE_PERMISSIONS)):
+                continue
+            for action, roles in permissions.items():
+                if isinstance(action, Action):
+                    action = action.action
+                for role in roles:
+                    role_id = role.id if hasattr(role, "id") else role
+                    insert_values.append({"action": action, "dataset_id": dataset.id, "role_id": role_id})
+        if insert_values:
+            self.sa_session.execute(insert(DatasetPermissions), insert_values)
+        for dataset, _ in datasets_and_permissions:
+            self.sa_session.expire(dataset, ["actions"])
+
     def set_dataset_permission(self, dataset, permission=None):
         """
         Set a specific permission on a dataset, leaving all other current permissions on the dataset alone.
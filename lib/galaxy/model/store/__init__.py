@@ -1262,6 +1262,7 @@ class ModelImportStore(metaclass=abc.ABCMeta):
             for name, value in params.items():
                 # Transform parameter values when necessary.
                 imported_job.add_parameter(name, dumps(value))
+            imported_job.set_parameters_fingerprint()
 
             self._connect_job_io(imported_job, job_attrs, _find_hda, _find_hdca, _find_dce)  # type: ignore[attr-defined]
 
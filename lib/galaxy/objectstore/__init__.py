@@ -347,6 +347,17 @@ class ObjectStore(metaclass=abc.ABCMeta):
     def is_private(self, obj) -> bool:
         """Return True iff supplied object is stored in private ConcreteObjectStore."""
 
+    def prefetch(self, obj) -> bool:
+        """Start pulling ``obj`` into the object store cache in the background.
+
+        Return True if a download was scheduled. Object stores without a
+        cache don't need to do anything.
+        """
+        return False
+
+    def cancel_prefetch(self, obj) -> None:
+        """Cancel a download scheduled with :meth:`prefetch` if it has not started yet."""
+
     def object_store_ids(self, private=None):
         """Return IDs of all concrete object stores - either private ones or non-private ones.
 
@@ -687,6 +698,18 @@ class BaseObjectStore(ObjectStore):
     def is_private(self, obj) -> bool:
         return self._invoke("is_private", obj)
 
+    def prefetch(self, obj) -> bool:
+        return self._invoke("prefetch", obj)
+
+    def cancel_prefetch(self, obj) -> None:
+        return self._invoke("cancel_prefetch", obj)
+
+    def _prefetch(self, obj, **kwargs) -> bool:
+        return False
+
+    def _cancel_prefetch(self, obj, **kwargs) -> None:
+        pass
+
     def cache_targets(self) -> List[CacheTarget]:
         return []
 
@@ -1262,6 +1285,12 @@ class NestedObjectStore(BaseObjectStore):
     def _is_private(self, obj) -> bool:
         return self._call_method("_is_private", obj, False, False)
 
+    def _prefetch(self, obj, **kwargs) -> bool:
+        return self._call_method("_prefetch", obj, False, False, **kwargs)
+
+    def _cancel_prefetch(self, obj, **kwargs) -> None:
+        return self._call_method("_cancel_prefetch", obj, None, False, **kwargs)
+
     def _get_store_by(self, obj):
         return self._call_method("_get_store_by", obj, None, False)
 
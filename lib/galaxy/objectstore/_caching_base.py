@@ -1,6 +1,11 @@
+import codecs
+import io
+import locale
 import logging
 import os
 import shutil
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from typing import (
     Any,
@@ -18,9 +23,19 @@ from galaxy.util import (
     unlink,
 )
 from galaxy.util.path import safe_relpath
+from ._transfer import (
+    DEFAULT_TRANSFER_CONCURRENCY,
+    DEFAULT_TRANSFER_RETRIES,
+    TransferEngine,
+)
 from ._util import fix_permissions
 from .caching import (
+    BlockCache,
+    CacheIndex,
     CacheTarget,
+    configured_cache_eviction_policy,
+    enable_block_cache,
+    enable_cache_index,
     InProcessCacheMonitor,
 )
 
@@ -36,6 +51,31 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
     cache_size: int
     cache_monitor: Optional[InProcessCacheMonitor] = None
     cache_monitor_interval: int
+    cache_index_enabled: bool = False
+    cache_eviction_policy: str = "lru"
+    _cache_index: Optional[CacheIndex] = None
+    block_cache: Optional[BlockCache] = None
+    # Set to True by object stores implementing _download_range
+    supports_ranged_reads: bool = False
+    transfer_concurrency: int = DEFAULT_TRANSFER_CONCURRENCY
+    transfer_retries: int = DEFAULT_TRANSFER_RETRIES
+    _transfer_engine: Optional[TransferEngine] = None
+
+    def __init__(self, config, config_dict):
+        super().__init__(config, config_dict)
+        self.cache_index_enabled = enable_cache_index(config_dict)
+        self.cache_eviction_policy = configured_cache_eviction_policy(config_dict)
+        self.block_cache = enable_block_cache(config_dict)
+        cache_config_dict = config_dict.get("cache") or {}
+        self.transfer_concurrency = int(cache_config_dict.get("transfer_concurrency") or DEFAULT_TRANSFER_CONCURRENCY)
+        self.transfer_retries = int(cache_config_dict.get("transfer_retries") or DEFAULT_TRANSFER_RETRIES)
+        # rel_path -> pending or running background download started by _prefetch
+        self._prefetches: Dict[str, Future] = {}
+        self._prefetch_lock = threading.Lock()
+
+    @property
+    def block_cache_blocks(self) -> int:
+        return self.block_cache.max_blocks if self.block_cache is not None else 0
 
     def _ensure_staging_path_writable(self):
         staging_path = self.staging_path
@@ -106,6 +146,32 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
     def _get_cache_path(self, rel_path: str) -> str:
         return os.path.abspath(os.path.join(self.staging_path, rel_path))
 
+    @property
+    def cache_index(self) -> Optional[CacheIndex]:
+        """Persistent index of the cache contents, if enabled for this object store."""
+        if self.cache_index_enabled and self._cache_index is None:
+            self._cache_index = CacheIndex(self.staging_path, self.cache_eviction_policy)
+        return self._cache_index
+
+    @property
+    def transfer_engine(self) -> TransferEngine:
+        """Thread pool used to move files between the cache and the remote store."""
+        if self._transfer_engine is None:
+            self._transfer_engine = TransferEngine(
+                self.transfer_concurrency,
+                self.transfer_retries,
+                name=f"{self.store_type} object store {self.name or self.staging_path}",
+            )
+        return self._transfer_engine
+
+    def _index_cache_file(self, rel_path: str, accessed: bool = False) -> None:
+        cache_index = self.cache_index
+        if cache_index is not None:
+            if accessed:
+                cache_index.touch(self._get_cache_path(rel_path))
+            else:
+                cache_index.add(self._get_cache_path(rel_path))
+
     def _in_cache(self, rel_path: str) -> bool:
         """Check if the given dataset is in the local cache and return True if so."""
         cache_path = self._get_cache_path(rel_path)
@@ -117,18 +183,74 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
         if not os.path.exists(self._get_cache_path(rel_path_dir)):
             os.makedirs(self._get_cache_path(rel_path_dir), exist_ok=True)
         # Now pull in the file
-        file_ok = self._download(rel_path)
+        try:
+            file_ok = self.transfer_engine.run(
+                self._download, rel_path, size=lambda: os.path.getsize(self._get_cache_path(rel_path))
+            )
+        except Exception:
+            log.exception("Problem pulling '%s' into the cache", rel_path)
+            file_ok = False
         if file_ok:
             fix_permissions(self.config, self._get_cache_path(rel_path_dir))
+            self._index_cache_file(rel_path)
         else:
             unlink(self._get_cache_path(rel_path), ignore_errors=True)
         return file_ok
 
+    def _prefetch(self, obj, **kwargs) -> bool:
+        rel_path = self._construct_path(obj, **kwargs)
+        with self._prefetch_lock:
+            if rel_path in self._prefetches or self._in_cache(rel_path):
+                return False
+            future = self.transfer_engine.submit(self._prefetch_into_cache, rel_path)
+            self._prefetches[rel_path] = future
+        future.add_done_callback(lambda _: self._forget_prefetch(rel_path, future))
+        return True
+
+    def _cancel_prefetch(self, obj, **kwargs) -> None:
+        rel_path = self._construct_path(obj, **kwargs)
+        with self._prefetch_lock:
+            future = self._prefetches.get(rel_path)
+        if future is not None:
+            future.cancel()
+
+    def _prefetch_into_cache(self, rel_path: str) -> bool:
+        if self._in_cache(rel_path) or not self._exists_remotely(rel_path):
+            return False
+        size = self._get_remote_size(rel_path)
+        if not self.cache_target.fits_in_cache(size):
+            log.debug("Not prefetching '%s', its size (%s bytes) exceeds the cache size", rel_path, size)
+            return False
+        return self._pull_into_cache(rel_path)
+
+    def _forget_prefetch(self, rel_path: str, future: Future) -> None:
+        with self._prefetch_lock:
+            if self._prefetches.get(rel_path) is future:
+                del self._prefetches[rel_path]
+
+    def _wait_for_prefetch(self, rel_path: str) -> None:
+        """Wait for a running prefetch of ``rel_path``, so a partially downloaded file is never served."""
+        with self._prefetch_lock:
+            future = self._prefetches.get(rel_path)
+        if future is not None and not future.cancel():
+            try:
+                future.result()
+            except Exception:
+                log.exception("Prefetching '%s' into the cache failed", rel_path)
+
     def _get_data(self, obj, start=0, count=-1, **kwargs):
         rel_path = self._construct_path(obj, **kwargs)
+        self._wait_for_prefetch(rel_path)
         # Check cache first and get file if not there
         if not self._in_cache(rel_path):
+            if count >= 0 and self.supports_ranged_reads:
+                # Serve partial reads from the remote store instead of downloading the whole object
+                content = self._read_text_range(rel_path, start, count)
+                if content is not None:
+                    return content
             self._pull_into_cache(rel_path, **kwargs)
+        else:
+            self._index_cache_file(rel_path, accessed=True)
         # Read the file content from cache
         data_file = open(self._get_cache_path(rel_path))
         data_file.seek(start)
@@ -136,6 +258,59 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
         data_file.close()
         return content
 
+    def _read_text_range(self, rel_path: str, start: int, count: int) -> Optional[str]:
+        """Read ``count`` characters at byte offset ``start`` of a remote object,
+        decoded like reading the cached file in text mode.
+
+        Returns None if the range could not be read.
+        """
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace"), translate=True
+        )
+        content = ""
+        while len(content) < count:
+            # each byte decodes to at most one character, read more if multibyte characters (or \r\n) are split
+            remaining = count - len(content)
+            data = self._read_range(rel_path, start, remaining)
+            if data is None:
+                return None
+            start += len(data)
+            at_end = len(data) < remaining
+            content += decoder.decode(data, final=at_end)
+            if at_end:
+                break
+        # a \r held back by the decoder can add two characters at once
+        return content[:count]
+
+    def _read_range(self, rel_path: str, start: int, count: int) -> Optional[bytes]:
+        """Read ``count`` bytes at offset ``start`` of a remote object.
+
+        Returns None if the range could not be read, in which case callers
+        should fall back to pulling the object into the cache.
+        """
+        if count == 0:
+            return b""
+        try:
+            block_cache = self.block_cache
+            if block_cache is None:
+                return self._download_range(rel_path, start, count)
+            block_size = block_cache.block_size
+            blocks = []
+            for block_index in range(start // block_size, (start + count - 1) // block_size + 1):
+                block = block_cache.get(rel_path, block_index)
+                if block is None:
+                    block = self._download_range(rel_path, block_index * block_size, block_size)
+                    block_cache.put(rel_path, block_index, block)
+                blocks.append(block)
+                if len(block) < block_size:
+                    # reached the end of the object
+                    break
+            offset = start % block_size
+            return b"".join(blocks)[offset : offset + count]
+        except Exception:
+            log.exception("Failed to read range of '%s', falling back to caching the whole object", rel_path)
+            return None
+
     def _exists(self, obj, **kwargs) -> bool:
         in_cache = exists_remotely = False
         rel_path = self._construct_path(obj, **kwargs)
@@ -226,6 +401,10 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
             )
             return True
 
+        if self._in_cache(rel_path):
+            self._index_cache_file(rel_path)
+        if self.block_cache is not None:
+            self.block_cache.invalidate(rel_path)
         if from_string is not None:
             return self._push_string_to_path(rel_path, from_string)
         else:
@@ -236,7 +415,13 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
                 os.path.getsize(source_file),
                 rel_path,
             )
-            success = self._push_file_to_path(rel_path, source_file)
+            try:
+                success = self.transfer_engine.run(
+                    self._push_file_to_path, rel_path, source_file, size=lambda: os.path.getsize(source_file)
+                )
+            except Exception:
+                log.exception("Trouble pushing cache file '%s' to '%s'", source_file, rel_path)
+                return False
             end_time = datetime.now()
             log.debug(
                 "Pushed cache file '%s' to blob '%s' (%s bytes transferred in %s sec)",
@@ -282,18 +467,24 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
         cache_path = self._get_cache_path(rel_path)
         if not sync_cache:
             return cache_path
+        self._wait_for_prefetch(rel_path)
 
         # Check if the file exists in the cache first, always pull if file size in cache is zero
         # For dir_only - the cache cleaning may have left empty directories so I think we need to
         # always resync the cache. Gotta make sure we're being judicious in out data.extra_files_path
         # calls I think.
         if not dir_only and self._in_cache(rel_path) and os.path.getsize(self._get_cache_path(rel_path)) > 0:
+            self._index_cache_file(rel_path, accessed=True)
             return cache_path
 
         # Check if the file exists in persistent storage and, if it does, pull it into cache
         elif self._exists(obj, **kwargs):
             if dir_only:
                 self._download_directory_into_cache(rel_path, cache_path)
+                if self.cache_index is not None:
+                    for dirpath, _, filenames in os.walk(cache_path):
+                        for filename in filenames:
+                            self.cache_index.add(os.path.join(dirpath, filename))
                 return cache_path
             else:
                 if self._pull_into_cache(rel_path, **kwargs):
@@ -313,6 +504,7 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
 
     def _delete(self, obj, entire_dir: bool = False, **kwargs) -> bool:
         rel_path = self._construct_path(obj, **kwargs)
+        self._wait_for_prefetch(rel_path)
         extra_dir = kwargs.get("extra_dir", None)
         base_dir = kwargs.get("base_dir", None)
         dir_only = kwargs.get("dir_only", False)
@@ -329,10 +521,14 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
             # but requires iterating through each individual key in S3 and deleing it.
             if entire_dir and extra_dir:
                 shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                if self.cache_index is not None:
+                    self.cache_index.remove_directory(self._get_cache_path(rel_path))
                 return self._delete_remote_all(rel_path)
             else:
                 # Delete from cache first
                 unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                if self.cache_index is not None:
+                    self.cache_index.remove(self._get_cache_path(rel_path))
                 # Delete from S3 as well
                 if self._exists_remotely(rel_path):
                     return self._delete_existing_remote(rel_path)
@@ -376,10 +572,13 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
             self.staging_path,
             self.cache_size,
             0.9,
+            self.cache_index_enabled,
+            self.cache_eviction_policy,
         )
 
     def _shutdown_cache_monitor(self) -> None:
         self.cache_monitor and self.cache_monitor.shutdown()
+        self._transfer_engine and self._transfer_engine.shutdown()
 
     def _start_cache_monitor_if_needed(self):
         if self.enable_cache_monitor:
@@ -391,9 +590,14 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
     def _exists_remotely(self, rel_path: str) -> bool:
         raise NotImplementedError()
 
+    # Raise on errors, return False only if the download is refused (e.g. doesn't fit in the cache)
     def _download(self, rel_path: str) -> bool:
         raise NotImplementedError()
 
+    # Only needs to be implemented if supports_ranged_reads is set
+    def _download_range(self, rel_path: str, start: int, count: int) -> bytes:
+        raise NotImplementedError()
+
     # Do not need to override these if instead replacing _delete
     def _delete_existing_remote(self, rel_path) -> bool:
         raise NotImplementedError()
@@ -405,5 +609,6 @@ class CachingConcreteObjectStore(ConcreteObjectStore):
     def _push_string_to_path(self, rel_path: str, from_string: str) -> bool:
         raise NotImplementedError()
 
+    # Raise on errors, like _download
     def _push_file_to_path(self, rel_path: str, target_file: str) -> bool:
         raise NotImplementedError()
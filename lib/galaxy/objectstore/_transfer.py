@@ -0,0 +1,203 @@
+"""Bounded thread pool used by caching object stores to move files around.
+
+Transfers of single files are run on the calling thread (with retries),
+transfers of many files (e.g. the extra files of a dataset) are spread over
+a bounded number of worker threads.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TRANSFER_CONCURRENCY = 1
+DEFAULT_TRANSFER_RETRIES = 0
+DEFAULT_TRANSFER_RETRY_BACKOFF = 1.0
+
+T = TypeVar("T")
+
+
+class TransferStats:
+    """Thread-safe counters of the transfers performed by an object store."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.transfers = 0
+        self.failures = 0
+        self.retries = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def record(self, size: int, seconds: float, success: bool = True) -> None:
+        with self._lock:
+            self.transfers += 1
+            if success:
+                self.bytes += size
+                self.seconds += seconds
+            else:
+                self.failures += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    @property
+    def throughput(self) -> float:
+        """Average throughput of successful transfers in bytes per second."""
+        with self._lock:
+            return self.bytes / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            as_dict = {
+                "transfers": self.transfers,
+                "failures": self.failures,
+                "retries": self.retries,
+                "bytes": self.bytes,
+                "seconds": self.seconds,
+            }
+        as_dict["throughput"] = self.throughput
+        return as_dict
+
+
+class TransferEngine:
+    """Run transfer callables with retries on a bounded thread pool.
+
+    A transfer fails if it raises an exception, failed transfers are retried
+    with exponential backoff and once ``retries`` is exhausted the last
+    exception is re-raised. Transfers return ``False`` if the object store
+    refused them (e.g. because the object doesn't fit in the cache), those are
+    not retried.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_TRANSFER_CONCURRENCY,
+        retries: int = DEFAULT_TRANSFER_RETRIES,
+        retry_backoff: float = DEFAULT_TRANSFER_RETRY_BACKOFF,
+        name: str = "objectstore",
+    ):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self.retry_backoff = retry_backoff
+        self.stats = TransferStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def run(self, transfer: Callable[..., T], *args, size: Optional[Callable[[], int]] = None) -> T:
+        """Run ``transfer(*args)`` on the calling thread.
+
+        ``size`` is called after a successful transfer to record the number
+        of bytes moved.
+        """
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                result = transfer(*args)
+            except Exception as e:
+                exception = e
+            else:
+                if result is not False:
+                    self.stats.record(size() if size is not None else 0, time.monotonic() - start)
+                return result
+            if attempt >= self.retries:
+                self.stats.record(0, time.monotonic() - start, success=False)
+                raise exception
+            delay = self.retry_backoff * 2**attempt
+            log.warning(
+                "Transfer %s%s failed, retrying in %s seconds",
+                getattr(transfer, "__name__", transfer),
+                args,
+                delay,
+                exc_info=exception,
+            )
+            self.stats.record_retry()
+            attempt += 1
+            time.sleep(delay)
+
+    def submit(self, transfer: Callable[..., T], *args, size: Optional[Callable[[], int]] = None) -> "Future[T]":
+        """Run ``transfer(*args)`` in the background, see :meth:`run`."""
+        return self._get_executor().submit(self.run, transfer, *args, size=size)
+
+    def map(
+        self,
+        transfer: Callable[..., T],
+        args_list: Iterable[tuple],
+        size: Optional[Callable[..., int]] = None,
+    ) -> List[T]:
+        """Run ``transfer(*args)`` for each tuple in ``args_list``.
+
+        Transfers are spread over up to ``concurrency`` threads, results are
+        returned in the order of ``args_list``. If any transfer fails the
+        first exception is raised once all transfers finished.
+        """
+        args_list = list(args_list)
+
+        def run_one(args: tuple) -> T:
+            size_of = (lambda: size(*args)) if size is not None else None
+            return self.run(transfer, *args, size=size_of)
+
+        start = time.monotonic()
+        if self.concurrency == 1 or len(args_list) <= 1:
+            results = [run_one(args) for args in args_list]
+        else:
+            futures = [self._get_executor().submit(run_one, args) for args in args_list]
+            # wait for all transfers, so no worker writes into a directory that is about to be cleaned up
+            exceptions = [future.exception() for future in futures]
+            for exception in exceptions:
+                if exception is not None:
+                    raise exception
+            results = [future.result() for future in futures]
+        log.debug(
+            "%s transferred %s files in %.2f seconds with %s threads",
+            self.name,
+            len(args_list),
+            time.monotonic() - start,
+            min(self.concurrency, len(args_list)),
+        )
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="objectstore-transfer"
+                )
+            return self._executor
+
+    def log_stats(self) -> None:
+        """Log the transfers performed so far."""
+        stats = self.stats.to_dict()
+        if stats["transfers"]:
+            log.info(
+                "%s transfers: %s (%s failed, %s retries), %s bytes at %.0f bytes/second",
+                self.name,
+                stats["transfers"],
+                stats["failures"],
+                stats["retries"],
+                stats["bytes"],
+                stats["throughput"],
+            )
+
+    def shutdown(self) -> None:
+        self.log_stats()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -11,6 +11,7 @@ from datetime import (
 
 try:
     from azure.common import AzureHttpError
+    from azure.core.exceptions import HttpResponseError
     from azure.storage.blob import (
         BlobSasPermissions,
         BlobServiceClient,
@@ -108,6 +109,7 @@ class AzureBlobObjectStore(CachingConcreteObjectStore):
     """
 
     store_type = "azure_blob"
+    supports_ranged_reads = True
     cloud = True
 
     def __init__(self, config, config_dict):
@@ -171,6 +173,11 @@ class AzureBlobObjectStore(CachingConcreteObjectStore):
                     "size": self.cache_size,
                     "path": self.staging_path,
                     "cache_updated_data": self.cache_updated_data,
+                    "index": self.cache_index_enabled,
+                    "eviction_policy": self.cache_eviction_policy,
+                    "block_cache_blocks": self.block_cache_blocks,
+                    "transfer_concurrency": self.transfer_concurrency,
+                    "transfer_retries": self.transfer_retries,
                 },
             }
         )
@@ -240,16 +247,11 @@ class AzureBlobObjectStore(CachingConcreteObjectStore):
 
     def _download(self, rel_path):
         local_destination = self._get_cache_path(rel_path)
-        try:
-            log.debug("Pulling '%s' into cache to %s", rel_path, local_destination)
-            if not self._caching_allowed(rel_path):
-                return False
-            else:
-                self._download_to_file(rel_path, local_destination)
-                return True
-        except AzureHttpError:
-            log.exception("Problem downloading '%s' from Azure", rel_path)
-        return False
+        log.debug("Pulling '%s' into cache to %s", rel_path, local_destination)
+        if not self._caching_allowed(rel_path):
+            return False
+        self._download_to_file(rel_path, local_destination)
+        return True
 
     def _download_to_file(self, rel_path, local_destination):
         kwd = {}
@@ -261,7 +263,17 @@ class AzureBlobObjectStore(CachingConcreteObjectStore):
         with open(local_destination, "wb") as f:
             self._blob_client(rel_path).download_blob().download_to_stream(f, **kwd)
 
+    def _download_range(self, rel_path: str, start: int, count: int) -> bytes:
+        try:
+            return self._blob_client(rel_path).download_blob(offset=start, length=count).readall()
+        except HttpResponseError as e:
+            if e.status_code == 416:
+                # start is beyond the end of the blob
+                return b""
+            raise
+
     def _download_directory_into_cache(self, rel_path, cache_path):
+        downloads = []
         blobs = self._blobs_from(rel_path)
         for blob in blobs:
             key = blob.name
@@ -269,9 +281,14 @@ class AzureBlobObjectStore(CachingConcreteObjectStore):
 
             # Create directories if they don't exist
             os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
+            downloads.append((key, local_file_path))
 
-            # Download the file
-            self._download_to_file(key, local_file_path)
+        # Download the files
+        self.transfer_engine.map(
+            self._download_to_file,
+            downloads,
+            size=lambda key, local_file_path: os.path.getsize(local_file_path),
+        )
 
     def _push_string_to_path(self, rel_path: str, from_string: str) -> bool:
         try:
@@ -282,19 +299,15 @@ class AzureBlobObjectStore(CachingConcreteObjectStore):
             return False
 
     def _push_file_to_path(self, rel_path: str, source_file: str) -> bool:
-        try:
-            with open(source_file, "rb") as f:
-                kwd = {}
-                max_concurrency = self.transfer_dict.get("upload_max_concurrency") or self.transfer_dict.get(
-                    "max_concurrency"
-                )
-                if max_concurrency is not None:
-                    kwd["max_concurrency"] = max_concurrency
-                self._blob_client(rel_path).upload_blob(f, overwrite=True, **kwd)
-            return True
-        except AzureHttpError:
-            log.exception("Trouble pushing to Azure Blob '%s' from file '%s'", rel_path, source_file)
-            return False
+        with open(source_file, "rb") as f:
+            kwd = {}
+            max_concurrency = self.transfer_dict.get("upload_max_concurrency") or self.transfer_dict.get(
+                "max_concurrency"
+            )
+            if max_concurrency is not None:
+                kwd["max_concurrency"] = max_concurrency
+            self._blob_client(rel_path).upload_blob(f, overwrite=True, **kwd)
+        return True
 
     def _delete_remote_all(self, rel_path: str) -> bool:
         try:
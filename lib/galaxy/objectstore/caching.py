@@ -3,8 +3,10 @@
 
 import logging
 import os
+import sqlite3
 import threading
 import time
+from collections import OrderedDict
 from math import inf
 from typing import (
     List,
@@ -24,6 +26,9 @@ log = logging.getLogger(__name__)
 
 
 ONE_GIGA_BYTE = 1024 * 1024 * 1024
+CACHE_INDEX_FILENAME = ".galaxy_cache_index.sqlite"
+CACHE_EVICTION_POLICIES = ("lru", "lfu")
+DEFAULT_BLOCK_SIZE = 1024 * 1024
 
 
 FileListT = List[Tuple[time.struct_time, str, int]]
@@ -33,6 +38,8 @@ class CacheTarget(NamedTuple):
     path: str
     size: int  # cache size in gigabytes
     limit: float  # cache limit as a percent
+    index: bool = False  # track cache contents in a persistent CacheIndex
+    eviction_policy: str = "lru"  # files the CacheIndex evicts first, least recently or least frequently used
 
     def fits_in_cache(self, bytes: int) -> bool:
         # if we don't have a positive cache size - interpret it as an unbounded
@@ -56,6 +63,9 @@ def check_caches(targets: List[CacheTarget]):
 
 def check_cache(cache_target: CacheTarget):
     """Run a step of the cache monitor."""
+    if cache_target.index:
+        _check_cache_with_index(cache_target)
+        return
     total_size, file_list = _get_cache_size_files(cache_target.path)
     # Sort the file list (based on access time)
     file_list.sort()
@@ -77,7 +87,34 @@ def check_cache(cache_target: CacheTarget):
         _clean_cache(file_list, delete_this_much)
 
 
+def _check_cache_with_index(cache_target: CacheTarget):
+    cache_index = CacheIndex(cache_target.path, cache_target.eviction_policy)
+    try:
+        if not cache_index.built:
+            cache_index.rebuild()
+        total_size = cache_index.total_size
+        cache_limit = cache_target.size * ONE_GIGA_BYTE * cache_target.limit
+        if total_size > cache_limit:
+            log.debug(
+                "Initiating cache cleaning: current cache size: %s; clean until smaller than: %s",
+                nice_size(total_size),
+                nice_size(cache_limit),
+            )
+            deleted_amount = cache_index.evict(total_size - cache_limit)
+            log.debug("Cache cleaning done. Total space freed: %s", nice_size(deleted_amount))
+    finally:
+        cache_index.close()
+
+
 def reset_cache(cache_target: CacheTarget):
+    if cache_target.index:
+        cache_index = CacheIndex(cache_target.path, cache_target.eviction_policy)
+        try:
+            cache_index.rebuild()
+            cache_index.evict(inf)
+        finally:
+            cache_index.close()
+        return
     _, file_list = _get_cache_size_files(cache_target.path)
     _clean_cache(file_list, inf)
 
@@ -116,6 +153,8 @@ def _get_cache_size_files(cache_path) -> Tuple[int, FileListT]:
 
     for dirpath, _, filenames in os.walk(cache_path):
         for filename in filenames:
+            if filename.startswith(CACHE_INDEX_FILENAME):
+                continue
             file_path = os.path.join(dirpath, filename)
             file_size = os.path.getsize(file_path)
             cache_size += file_size
@@ -127,6 +166,228 @@ def _get_cache_size_files(cache_path) -> Tuple[int, FileListT]:
     return cache_size, file_list
 
 
+class CacheIndex:
+    """Persistent index of the files in an object store cache.
+
+    The index is a SQLite database stored next to the cached files. Caching
+    object stores record files as they are pulled into or pushed from the cache
+    and when they are accessed, so the cache monitor can track the size of the
+    cache and find files to evict without walking the cache directory. A
+    running total of the cache size is maintained by triggers and eviction walks
+    an index on the access time (or access count for ``lfu``), so neither
+    depends on the number of cached files. The cache directory is only walked
+    to (re)build the index.
+    """
+
+    def __init__(self, cache_path: str, policy: str = "lru"):
+        assert policy in CACHE_EVICTION_POLICIES, f"Unknown cache eviction policy '{policy}'"
+        self.cache_path = os.path.abspath(cache_path)
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            os.path.join(self.cache_path, CACHE_INDEX_FILENAME),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entry (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    access_count INTEGER NOT NULL DEFAULT 1
+                );
+                CREATE INDEX IF NOT EXISTS ix_cache_entry_last_access ON cache_entry (last_access);
+                CREATE INDEX IF NOT EXISTS ix_cache_entry_access_count ON cache_entry (access_count, last_access);
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    total_size INTEGER NOT NULL,
+                    built INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO cache_stats (id, total_size, built) VALUES (0, 0, 0);
+                CREATE TRIGGER IF NOT EXISTS cache_entry_insert AFTER INSERT ON cache_entry BEGIN
+                    UPDATE cache_stats SET total_size = total_size + NEW.size WHERE id = 0;
+                END;
+                CREATE TRIGGER IF NOT EXISTS cache_entry_update AFTER UPDATE OF size ON cache_entry BEGIN
+                    UPDATE cache_stats SET total_size = total_size - OLD.size + NEW.size WHERE id = 0;
+                END;
+                CREATE TRIGGER IF NOT EXISTS cache_entry_delete AFTER DELETE ON cache_entry BEGIN
+                    UPDATE cache_stats SET total_size = total_size - OLD.size WHERE id = 0;
+                END;
+                """
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _execute(self, sql: str, parameters=()) -> int:
+        with self._lock:
+            return self._connection.execute(sql, parameters).rowcount
+
+    def _query(self, sql: str, parameters=()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    @property
+    def built(self) -> bool:
+        return bool(self._query("SELECT built FROM cache_stats WHERE id = 0")[0][0])
+
+    @property
+    def total_size(self) -> int:
+        return self._query("SELECT total_size FROM cache_stats WHERE id = 0")[0][0]
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM cache_entry")[0][0]
+
+    def add(self, file_path: str, size: Optional[int] = None) -> None:
+        """Record ``file_path`` as (re)written to the cache."""
+        file_path = os.path.abspath(file_path)
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                return
+        self._execute(
+            "INSERT INTO cache_entry (path, size, last_access) VALUES (?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET size = excluded.size, last_access = excluded.last_access, "
+            "access_count = access_count + 1",
+            (file_path, size, time.time()),
+        )
+
+    def touch(self, file_path: str) -> None:
+        """Record an access of ``file_path``, adding it to the index if untracked."""
+        file_path = os.path.abspath(file_path)
+        updated = self._execute(
+            "UPDATE cache_entry SET last_access = ?, access_count = access_count + 1 WHERE path = ?",
+            (time.time(), file_path),
+        )
+        if not updated:
+            self.add(file_path)
+
+    def remove(self, file_path: str) -> None:
+        self._execute("DELETE FROM cache_entry WHERE path = ?", (os.path.abspath(file_path),))
+
+    def remove_directory(self, directory: str) -> None:
+        """Forget all files below ``directory``."""
+        prefix = os.path.join(os.path.abspath(directory), "")
+        # Range scan on the primary key, "0" is the character after the path separator
+        self._execute(
+            "DELETE FROM cache_entry WHERE path >= ? AND path < ?",
+            (prefix, f"{prefix[:-1]}0"),
+        )
+
+    def rebuild(self) -> None:
+        """Rebuild the index by walking the cache directory."""
+        _, file_list = _get_cache_size_files(self.cache_path)
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM cache_entry")
+                self._connection.executemany(
+                    "INSERT INTO cache_entry (path, size, last_access) VALUES (?, ?, ?)",
+                    ((path, size, time.mktime(last_access)) for last_access, path, size in file_list),
+                )
+                self._connection.execute("UPDATE cache_stats SET built = 1 WHERE id = 0")
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def evict(self, delete_this_much: float, batch_size: int = 1000) -> int:
+        """Delete the least recently (or least frequently) used files until
+        at least ``delete_this_much`` bytes have been freed.
+
+        Returns the number of bytes freed.
+        """
+        if self.policy == "lfu":
+            order_by = "access_count, last_access"
+        else:
+            order_by = "last_access"
+        deleted_amount = 0
+        while deleted_amount < delete_this_much:
+            entries = self._query(f"SELECT path, size FROM cache_entry ORDER BY {order_by} LIMIT ?", (batch_size,))
+            if not entries:
+                break
+            evicted = []
+            for path, size in entries:
+                if deleted_amount >= delete_this_much:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    log.exception("Failed to remove cached file '%s'", path)
+                else:
+                    deleted_amount += size
+                evicted.append((path,))
+            with self._lock:
+                self._connection.executemany("DELETE FROM cache_entry WHERE path = ?", evicted)
+        return deleted_amount
+
+
+class BlockCache:
+    """Bounded in-memory LRU cache of fixed-size blocks of remote objects.
+
+    Used to serve ranged reads of objects that are not in the object store
+    cache, so repeated peeks into the same region of an object do not hit the
+    remote store again.
+    """
+
+    def __init__(self, max_blocks: int, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.max_blocks = max_blocks
+        self.block_size = block_size
+        self._blocks: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, rel_path: str, block_index: int) -> Optional[bytes]:
+        with self._lock:
+            block = self._blocks.get((rel_path, block_index))
+            if block is not None:
+                self._blocks.move_to_end((rel_path, block_index))
+            return block
+
+    def put(self, rel_path: str, block_index: int, block: bytes) -> None:
+        with self._lock:
+            self._blocks[(rel_path, block_index)] = block
+            self._blocks.move_to_end((rel_path, block_index))
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+
+    def invalidate(self, rel_path: str) -> None:
+        with self._lock:
+            for key in [key for key in self._blocks if key[0] == rel_path]:
+                del self._blocks[key]
+
+
+def enable_block_cache(config_dict) -> Optional[BlockCache]:
+    cache_config_dict = config_dict.get("cache") or {}
+    block_cache_blocks = int(cache_config_dict.get("block_cache_blocks") or 0)
+    if block_cache_blocks > 0:
+        return BlockCache(block_cache_blocks)
+    return None
+
+
+def enable_cache_index(config_dict) -> bool:
+    cache_config_dict = config_dict.get("cache") or {}
+    return string_as_bool(cache_config_dict.get("index", False))
+
+
+def configured_cache_eviction_policy(config_dict) -> str:
+    cache_config_dict = config_dict.get("cache") or {}
+    eviction_policy = cache_config_dict.get("eviction_policy") or "lru"
+    if eviction_policy not in CACHE_EVICTION_POLICIES:
+        raise Exception(
+            f"Unknown cache eviction policy '{eviction_policy}', must be one of {', '.join(CACHE_EVICTION_POLICIES)}"
+        )
+    return eviction_policy
+
+
 def parse_caching_config_dict_from_xml(config_xml):
     cache_els = config_xml.findall("cache")
     if len(cache_els) > 0:
@@ -135,12 +396,22 @@ def parse_caching_config_dict_from_xml(config_xml):
         staging_path = c_xml.get("path", None)
         monitor = c_xml.get("monitor", "auto")
         cache_updated_data = string_as_bool(c_xml.get("cache_updated_data", "True"))
+        index = string_as_bool(c_xml.get("index", "False"))
+        eviction_policy = c_xml.get("eviction_policy", "lru")
+        block_cache_blocks = int(c_xml.get("block_cache_blocks", 0))
+        transfer_concurrency = int(c_xml.get("transfer_concurrency", 1))
+        transfer_retries = int(c_xml.get("transfer_retries", 0))
 
         cache_dict = {
             "size": cache_size,
             "path": staging_path,
             "monitor": monitor,
             "cache_updated_data": cache_updated_data,
+            "index": index,
+            "eviction_policy": eviction_policy,
+            "block_cache_blocks": block_cache_blocks,
+            "transfer_concurrency": transfer_concurrency,
+            "transfer_retries": transfer_retries,
         }
     else:
         cache_dict = {}
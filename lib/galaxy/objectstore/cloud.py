@@ -202,6 +202,11 @@ class Cloud(CachingConcreteObjectStore, UsesAxel):
                 "size": self.cache_size,
                 "path": self.staging_path,
                 "cache_updated_data": self.cache_updated_data,
+                "index": self.cache_index_enabled,
+                "eviction_policy": self.cache_eviction_policy,
+                "block_cache_blocks": self.block_cache_blocks,
+                "transfer_concurrency": self.transfer_concurrency,
+                "transfer_retries": self.transfer_retries,
             },
         }
 
@@ -250,37 +255,40 @@ class Cloud(CachingConcreteObjectStore, UsesAxel):
 
     def _download(self, rel_path):
         local_destination = self._get_cache_path(rel_path)
-        try:
-            log.debug("Pulling key '%s' into cache to %s", rel_path, local_destination)
-            key = self.bucket.objects.get(rel_path)
-            remote_size = key.size
-            if not self._caching_allowed(rel_path, remote_size):
-                return False
-            log.debug("Pulled key '%s' into cache to %s", rel_path, local_destination)
-            self._download_to(key, local_destination)
-            return True
-        except Exception:
-            log.exception("Problem downloading key '%s' from S3 bucket '%s'", rel_path, self.bucket.name)
-        return False
+        log.debug("Pulling key '%s' into cache to %s", rel_path, local_destination)
+        key = self.bucket.objects.get(rel_path)
+        remote_size = key.size
+        if not self._caching_allowed(rel_path, remote_size):
+            return False
+        log.debug("Pulled key '%s' into cache to %s", rel_path, local_destination)
+        self._download_to(key, local_destination)
+        return True
 
     def _download_directory_into_cache(self, rel_path, cache_path):
         # List objects in the specified cloud folder
         objects = self.bucket.objects.list(prefix=rel_path)
 
+        downloads = []
         for obj in objects:
             remote_file_path = obj.name
             local_file_path = os.path.join(cache_path, os.path.relpath(remote_file_path, rel_path))
 
             # Create directories if they don't exist
             os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
+            downloads.append((obj, local_file_path))
 
-            # Download the file
-            self._download_to(obj, local_file_path)
+        # Download the files
+        self.transfer_engine.map(
+            self._download_to,
+            downloads,
+            size=lambda obj, local_file_path: os.path.getsize(local_file_path),
+        )
 
     def _download_to(self, key, local_destination):
         if self.use_axel:
             url = key.generate_url(7200)
-            return self._axel_download(url, local_destination)
+            if not self._axel_download(url, local_destination):
+                raise Exception(f"Parallel download to '{local_destination}' failed")
         else:
             with open(local_destination, "wb+") as downloaded_file_handle:
                 key.save_content(downloaded_file_handle)
@@ -298,16 +306,12 @@ class Cloud(CachingConcreteObjectStore, UsesAxel):
             return False
 
     def _push_file_to_path(self, rel_path: str, source_file: str) -> bool:
-        try:
-            if not self.bucket.objects.get(rel_path):
-                created_obj = self.bucket.objects.create(rel_path)
-                created_obj.upload_from_file(source_file)
-            else:
-                self.bucket.objects.get(rel_path).upload_from_file(source_file)
-            return True
-        except Exception:
-            log.exception("Trouble pushing to cloud '%s' from file '%s'", rel_path, source_file)
-            return False
+        if not self.bucket.objects.get(rel_path):
+            created_obj = self.bucket.objects.create(rel_path)
+            created_obj.upload_from_file(source_file)
+        else:
+            self.bucket.objects.get(rel_path).upload_from_file(source_file)
+        return True
 
     def _delete_remote_all(self, rel_path: str) -> bool:
         try:
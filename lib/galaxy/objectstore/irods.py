@@ -77,6 +77,11 @@ def parse_config_xml(config_xml):
         cache_size = float(c_xml[0].get("size", -1))
         staging_path = c_xml[0].get("path", None)
         cache_updated_data = string_as_bool(c_xml[0].get("cache_updated_data", "True"))
+        cache_index = string_as_bool(c_xml[0].get("index", "False"))
+        cache_eviction_policy = c_xml[0].get("eviction_policy", "lru")
+        block_cache_blocks = int(c_xml[0].get("block_cache_blocks", 0))
+        transfer_concurrency = int(c_xml[0].get("transfer_concurrency", 1))
+        transfer_retries = int(c_xml[0].get("transfer_retries", 0))
 
         attrs = ("type", "path")
         e_xml = config_xml.findall("extra_dir")
@@ -106,6 +111,11 @@ def parse_config_xml(config_xml):
                 "size": cache_size,
                 "path": staging_path,
                 "cache_updated_data": cache_updated_data,
+                "index": cache_index,
+                "eviction_policy": cache_eviction_policy,
+                "block_cache_blocks": block_cache_blocks,
+                "transfer_concurrency": transfer_concurrency,
+                "transfer_retries": transfer_retries,
             },
             "extra_dirs": extra_dirs,
             "private": CachingConcreteObjectStore.parse_private_from_config_xml(config_xml),
@@ -123,6 +133,7 @@ class IRODSObjectStore(CachingConcreteObjectStore):
     """
 
     store_type = "irods"
+    supports_ranged_reads = True
 
     def __init__(self, config, config_dict):
         ipt_timer = ExecutionTimer()
@@ -229,6 +240,7 @@ class IRODSObjectStore(CachingConcreteObjectStore):
             if self.connection_pool_monitor_thread is not None:
                 self.connection_pool_monitor_thread.join(5)
 
+        self._transfer_engine and self._transfer_engine.shutdown()
         log.debug("irods_pt shutdown: %s", ipt_timer)
 
     @classmethod
@@ -302,6 +314,11 @@ class IRODSObjectStore(CachingConcreteObjectStore):
                 "size": self.cache_size,
                 "path": self.staging_path,
                 "cache_updated_data": self.cache_updated_data,
+                "index": self.cache_index_enabled,
+                "eviction_policy": self.cache_eviction_policy,
+                "block_cache_blocks": self.block_cache_blocks,
+                "transfer_concurrency": self.transfer_concurrency,
+                "transfer_retries": self.transfer_retries,
             },
         }
 
@@ -371,6 +388,34 @@ class IRODSObjectStore(CachingConcreteObjectStore):
         finally:
             log.debug("irods_pt _download: %s", ipt_timer)
 
+    def _download_directory_into_cache(self, rel_path, cache_path):
+        collection_path = f"{self.home}/{rel_path}"
+        try:
+            collection = self.session.collections.get(collection_path)
+        except CollectionDoesNotExist:
+            log.warning("Collection (%s) does not exist", collection_path)
+            return
+        downloads = []
+        for _, _, data_objects in collection.walk():
+            for data_object in data_objects:
+                file_rel_path = os.path.join(rel_path, os.path.relpath(data_object.path, collection_path))
+                os.makedirs(os.path.dirname(self._get_cache_path(file_rel_path)), exist_ok=True)
+                downloads.append((file_rel_path,))
+
+        # Download the data objects
+        self.transfer_engine.map(
+            self._download,
+            downloads,
+            size=lambda file_rel_path: os.path.getsize(self._get_cache_path(file_rel_path)),
+        )
+
+    def _download_range(self, rel_path: str, start: int, count: int) -> bytes:
+        p = Path(rel_path)
+        data_object_path = f"{self.home}/{p.parent}/{p.stem + p.suffix}"
+        with self.session.data_objects.open(data_object_path, "r", **{kw.DEST_RESC_NAME_KW: self.resource}) as f:
+            f.seek(start)
+            return f.read(count)
+
     def _push_to_storage(self, rel_path, source_file=None, from_string=None):
         """
         Push the file pointed to by ``rel_path`` to the iRODS. Extract folder name
@@ -436,7 +481,10 @@ class IRODSObjectStore(CachingConcreteObjectStore):
                 )
 
                 # Add the source file to the irods collection
-                self.session.data_objects.put(source_file, data_object_path, **options)
+                self.transfer_engine.run(
+                    lambda: self.session.data_objects.put(source_file, data_object_path, **options),
+                    size=lambda: os.path.getsize(source_file),
+                )
 
                 end_time = datetime.now()
                 log.debug(
@@ -160,6 +160,11 @@ class OnedataObjectStore(CachingConcreteObjectStore):
                     "size": self.cache_size,
                     "path": self.staging_path,
                     "cache_updated_data": self.cache_updated_data,
+                    "index": self.cache_index_enabled,
+                    "eviction_policy": self.cache_eviction_policy,
+                    "block_cache_blocks": self.block_cache_blocks,
+                    "transfer_concurrency": self.transfer_concurrency,
+                    "transfer_retries": self.transfer_retries,
                 },
             }
         )
@@ -189,31 +194,69 @@ class OnedataObjectStore(CachingConcreteObjectStore):
             return False
 
     def _download(self, rel_path):
-        try:
-            dst_path = self._get_cache_path(rel_path)
-
-            log.debug("Pulling file '%s' into cache to %s", rel_path, dst_path)
-
-            remote_path = self._build_remote_path(rel_path)
-            file_size = self._client.get_attributes(self.space_name, attributes=["size"], file_path=remote_path)["size"]
-
-            # Test if cache is large enough to hold the new file
-            if not self._caching_allowed(rel_path, file_size):
-                return False
+        dst_path = self._get_cache_path(rel_path)
 
-            with open(dst_path, "wb") as dst:
-                for chunk in self._client.iter_file_content(
-                    self.space_name, chunk_size=STREAM_CHUNK_SIZE, file_path=remote_path
-                ):
-                    dst.write(chunk)
+        log.debug("Pulling file '%s' into cache to %s", rel_path, dst_path)
 
-            log.debug("Pulled '%s' into cache to %s", rel_path, dst_path)
+        remote_path = self._build_remote_path(rel_path)
+        file_size = self._client.get_attributes(self.space_name, attributes=["size"], file_path=remote_path)["size"]
 
-            return True
-        except OnedataError:
-            log.exception("Problem downloading file '%s'", rel_path)
+        # Test if cache is large enough to hold the new file
+        if not self._caching_allowed(rel_path, file_size):
             return False
 
+        self._download_to_file(rel_path, dst_path)
+
+        log.debug("Pulled '%s' into cache to %s", rel_path, dst_path)
+
+        return True
+
+    def _download_to_file(self, rel_path, local_destination):
+        remote_path = self._build_remote_path(rel_path)
+        with open(local_destination, "wb") as dst:
+            for chunk in self._client.iter_file_content(
+                self.space_name, chunk_size=STREAM_CHUNK_SIZE, file_path=remote_path
+            ):
+                dst.write(chunk)
+
+    def _list_remote_files(self, rel_path):
+        """Yield the paths of the files below the remote directory ``rel_path``."""
+        directories = [rel_path]
+        while directories:
+            directory = directories.pop()
+            continuation_token = None
+            while True:
+                result = self._client.list_children(
+                    self.space_name,
+                    file_path=self._build_remote_path(directory),
+                    continuation_token=continuation_token,
+                )
+                for child in result["children"]:
+                    child_rel_path = os.path.join(directory, child["name"])
+                    if child["type"] == "DIR":
+                        directories.append(child_rel_path)
+                    else:
+                        yield child_rel_path
+                if result["isLast"]:
+                    break
+                continuation_token = result["nextPageToken"]
+
+    def _download_directory_into_cache(self, rel_path, cache_path):
+        downloads = []
+        for file_rel_path in self._list_remote_files(rel_path):
+            local_file_path = os.path.join(cache_path, os.path.relpath(file_rel_path, rel_path))
+
+            # Create directories if they don't exist
+            os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
+            downloads.append((file_rel_path, local_file_path))
+
+        # Download the files
+        self.transfer_engine.map(
+            self._download_to_file,
+            downloads,
+            size=lambda file_rel_path, local_file_path: os.path.getsize(local_file_path),
+        )
+
     def _push_to_storage(self, rel_path, source_file=None, from_string=None):
         """
         Push the file pointed to by ``rel_path`` to the object store under ``rel_path``.
@@ -18,6 +18,7 @@ except ImportError:
 
 from galaxy.util import directory_hash_id
 from ._caching_base import CachingConcreteObjectStore
+from .caching import parse_caching_config_dict_from_xml
 
 NO_KAMAKI_ERROR_MESSAGE = (
     "ObjectStore configured, but no kamaki.clients dependency available."
@@ -69,6 +70,9 @@ def parse_config_xml(config_xml):
             raise Exception(msg)
         r["extra_dirs"] = [{k: e.get(k) for k in attrs} for e in extra_dirs]
         r["private"] = CachingConcreteObjectStore.parse_private_from_config_xml(config_xml)
+        cache_dict = parse_caching_config_dict_from_xml(config_xml)
+        if cache_dict:
+            r["cache"] = cache_dict
         if "job_work" not in (d["type"] for d in r["extra_dirs"]):
             msg = f'No value for {tag}:type="job_work" in XML tree'
             log.error(msg)
@@ -112,6 +116,11 @@ class PithosObjectStore(CachingConcreteObjectStore):
     def to_dict(self):
         as_dict = super().to_dict()
         as_dict.update(self.config_dict)
+        as_dict["cache"] = {
+            **(self.config_dict.get("cache") or {}),
+            "index": self.cache_index_enabled,
+            "eviction_policy": self.cache_eviction_policy,
+        }
         return as_dict
 
     def _authenticate(self):
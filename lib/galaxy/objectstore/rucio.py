@@ -283,7 +283,11 @@ class RucioObjectStore(CachingConcreteObjectStore):
     def to_dict(self):
         rval = super().to_dict()
         rval["rucio"] = self.rucio_config
-        rval["cache"] = self.cache_config
+        rval["cache"] = {
+            **self.cache_config,
+            "index": self.cache_index_enabled,
+            "eviction_policy": self.cache_eviction_policy,
+        }
         rval["oidc_provider"] = self.oidc_provider
         rval["enable_cache_monitor"] = self.enable_cache_monitor
         return rval
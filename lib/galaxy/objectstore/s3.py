@@ -140,6 +140,11 @@ class CloudConfigMixin:
                 "size": self.cache_size,
                 "path": self.staging_path,
                 "cache_updated_data": self.cache_updated_data,
+                "index": self.cache_index_enabled,
+                "eviction_policy": self.cache_eviction_policy,
+                "block_cache_blocks": self.block_cache_blocks,
+                "transfer_concurrency": self.transfer_concurrency,
+                "transfer_retries": self.transfer_retries,
             },
         }
 
@@ -303,28 +308,26 @@ class S3ObjectStore(CachingConcreteObjectStore, CloudConfigMixin, UsesAxel):
 
     def _download(self, rel_path):
         local_destination = self._get_cache_path(rel_path)
-        try:
-            log.debug("Pulling key '%s' into cache to %s", rel_path, local_destination)
-            key = self._bucket.get_key(rel_path)
-            if key is None:
-                message = f"Attempting to download an invalid key for path {rel_path}."
-                log.critical(message)
-                raise Exception(message)
-            remote_size = key.size
-            if not self._caching_allowed(rel_path, remote_size):
-                return False
-            if self.use_axel:
-                log.debug("Parallel pulled key '%s' into cache to %s", rel_path, local_destination)
-                url = key.generate_url(7200)
-                return self._axel_download(url, local_destination)
-            else:
-                log.debug("Pulled key '%s' into cache to %s", rel_path, local_destination)
-                self.transfer_progress = 0  # Reset transfer progress counter
-                key.get_contents_to_filename(local_destination, cb=self._transfer_cb, num_cb=10)
-                return True
-        except S3ResponseError:
-            log.exception("Problem downloading key '%s' from S3 bucket '%s'", rel_path, self._bucket.name)
-        return False
+        log.debug("Pulling key '%s' into cache to %s", rel_path, local_destination)
+        key = self._bucket.get_key(rel_path)
+        if key is None:
+            message = f"Attempting to download an invalid key for path {rel_path}."
+            log.critical(message)
+            raise Exception(message)
+        remote_size = key.size
+        if not self._caching_allowed(rel_path, remote_size):
+            return False
+        if self.use_axel:
+            log.debug("Parallel pulled key '%s' into cache to %s", rel_path, local_destination)
+            url = key.generate_url(7200)
+            if not self._axel_download(url, local_destination):
+                raise Exception(f"Parallel download of key '{rel_path}' failed")
+            return True
+        else:
+            log.debug("Pulled key '%s' into cache to %s", rel_path, local_destination)
+            self.transfer_progress = 0  # Reset transfer progress counter
+            key.get_contents_to_filename(local_destination, cb=self._transfer_cb, num_cb=10)
+            return True
 
     def _push_to_storage(self, rel_path, source_file=None, from_string=None):
         """
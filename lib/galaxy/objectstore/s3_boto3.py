@@ -155,6 +155,7 @@ class S3ObjectStore(CachingConcreteObjectStore):
 
     _client: "S3Client"
     store_type = "boto3"
+    supports_ranged_reads = True
     cloud = True
 
     def __init__(self, config, config_dict):
@@ -286,6 +287,11 @@ class S3ObjectStore(CachingConcreteObjectStore):
                 "size": self.cache_size,
                 "path": self.staging_path,
                 "cache_updated_data": self.cache_updated_data,
+                "index": self.cache_index_enabled,
+                "eviction_policy": self.cache_eviction_policy,
+                "block_cache_blocks": self.block_cache_blocks,
+                "transfer_concurrency": self.transfer_concurrency,
+                "transfer_retries": self.transfer_retries,
             },
         }
 
@@ -316,16 +322,24 @@ class S3ObjectStore(CachingConcreteObjectStore):
 
     def _download(self, rel_path: str) -> bool:
         local_destination = self._get_cache_path(rel_path)
+        log.debug("Pulling key '%s' into cache to %s", rel_path, local_destination)
+        if not self._caching_allowed(rel_path):
+            return False
+        config = self._transfer_config("download")
+        self._client.download_file(self.bucket, rel_path, local_destination, Config=config)
+        return True
+
+    def _download_range(self, rel_path: str, start: int, count: int) -> bytes:
         try:
-            log.debug("Pulling key '%s' into cache to %s", rel_path, local_destination)
-            if not self._caching_allowed(rel_path):
-                return False
-            config = self._transfer_config("download")
-            self._client.download_file(self.bucket, rel_path, local_destination, Config=config)
-            return True
-        except ClientError:
-            log.exception("Failed to download file from S3")
-        return False
+            response = self._client.get_object(
+                Bucket=self.bucket, Key=rel_path, Range=f"bytes={start}-{start + count - 1}"
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "InvalidRange":
+                # start is beyond the end of the object
+                return b""
+            raise
+        return response["Body"].read()
 
     def _push_string_to_path(self, rel_path: str, from_string: str) -> bool:
         try:
@@ -336,13 +350,9 @@ class S3ObjectStore(CachingConcreteObjectStore):
             return False
 
     def _push_file_to_path(self, rel_path: str, source_file: str) -> bool:
-        try:
-            config = self._transfer_config("upload")
-            self._client.upload_file(source_file, self.bucket, rel_path, Config=config)
-            return True
-        except ClientError:
-            log.exception("Trouble pushing to S3 '%s' from file '%s'", rel_path, source_file)
-            return False
+        config = self._transfer_config("upload")
+        self._client.upload_file(source_file, self.bucket, rel_path, Config=config)
+        return True
 
     def _delete_remote_all(self, rel_path: str) -> bool:
         try:
@@ -371,14 +381,21 @@ class S3ObjectStore(CachingConcreteObjectStore):
                 yield content["Key"]
 
     def _download_directory_into_cache(self, rel_path, cache_path):
+        downloads = []
         for key in self._keys(rel_path):
             local_file_path = os.path.join(cache_path, os.path.relpath(key, rel_path))
 
             # Create directories if they don't exist
             os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-
-            # Download the file
-            self._client.download_file(self.bucket, key, local_file_path)
+            downloads.append((key, local_file_path))
+
+        # Download the files
+        config = self._transfer_config("download")
+        self.transfer_engine.map(
+            lambda key, local_file_path: self._client.download_file(self.bucket, key, local_file_path, Config=config),
+            downloads,
+            size=lambda key, local_file_path: os.path.getsize(local_file_path),
+        )
 
     def _get_object_url(self, obj, **kwargs):
         try:
@@ -220,7 +220,7 @@ def recalculate_user_disk_usage(app, **kwargs):
     if user_id := kwargs.get("user_id", None):
         user = sa_session.get(User, user_id)
         if user:
-            user.calculate_and_set_disk_usage(app.object_store)
+            user.reconcile_disk_usage(app.object_store)
         else:
             log.error(f"Recalculate user disk usage task failed, user {user_id} not found")
     else:
@@ -117,5 +117,12 @@ class ComputeDatasetHashTaskRequest(Model):
     user: Optional[RequestUser] = None  # access checks should be done pre-celery so this is optional
 
 
+class ComputeDatasetHashesTaskRequest(Model):
+    dataset_id: int
+    hash_functions: List[HashFunctionNameEnum]
+    include_extra_files: bool = True
+    user: Optional[RequestUser] = None  # access checks should be done pre-celery so this is optional
+
+
 class PurgeDatasetsTaskRequest(Model):
     dataset_ids: List[int]
@@ -30,6 +30,7 @@ from galaxy.model import (
     History,
     HistoryDatasetAssociation,
     Job,
+    job_parameters_fingerprint,
     LibraryDatasetDatasetAssociation,
     WorkflowRequestInputParameter,
 )
@@ -49,6 +50,7 @@ from galaxy.tools.execute import (
     JobCallbackT,
 )
 from galaxy.tools.execution_helpers import (
+    BulkJobRecords,
     filter_output,
     on_text_for_names,
     ToolExecutionCache,
@@ -566,9 +568,12 @@ class DefaultToolAction(ToolAction):
                     dataset_collection_elements[name].hda = data
                 trans.sa_session.add(data)
                 if not completed_job:
-                    trans.app.security_agent.set_all_dataset_permissions(
-                        data.dataset, output_permissions, new=True, flush=False
-                    )
+                    if execution_cache.bulk_records is not None:
+                        execution_cache.bulk_records.add_dataset_permissions(data.dataset, output_permissions)
+                    else:
+                        trans.app.security_agent.set_all_dataset_permissions(
+                            data.dataset, output_permissions, new=True, flush=False
+                        )
             data.copy_tags_to(preserved_tags.values())
 
             # This may not be necessary with the new parent/child associations
@@ -714,7 +719,9 @@ class DefaultToolAction(ToolAction):
             for data in out_data.values():
                 data.set_skipped(object_store_populator)
         job.preferred_object_store_id = preferred_object_store_id
-        self._record_inputs(trans, tool, job, incoming, inp_data, inp_dataset_collections)
+        self._record_inputs(
+            trans, tool, job, incoming, inp_data, inp_dataset_collections, bulk_records=execution_cache.bulk_records
+        )
         self._record_outputs(job, out_data, output_collections)
         # execute immediate post job actions and associate post job actions that are to be executed after the job is complete
         if job_callback:
@@ -915,7 +922,16 @@ class DefaultToolAction(ToolAction):
         job.dynamic_tool = tool.dynamic_tool
         return job, galaxy_session
 
-    def _record_inputs(self, trans, tool, job, incoming, inp_data, inp_dataset_collections):
+    def _record_inputs(
+        self,
+        trans,
+        tool,
+        job,
+        incoming,
+        inp_data,
+        inp_dataset_collections,
+        bulk_records: Optional[BulkJobRecords] = None,
+    ):
         # FIXME: Don't need all of incoming here, just the defined parameters
         #        from the tool. We need to deal with tools that pass all post
         #        parameters to the command as a special case.
@@ -952,8 +968,15 @@ class DefaultToolAction(ToolAction):
         if reductions:
             tool.visit_inputs(incoming, restore_reduction_visitor)
 
-        for name, value in tool.params_to_strings(incoming, trans.app).items():
-            job.add_parameter(name, value)
+        parameters = list(tool.params_to_strings(incoming, trans.app).items())
+        if bulk_records is not None:
+            # parameters are inserted along with those of the other jobs of this request
+            bulk_records.add_job_parameters(job, parameters)
+            job.parameters_fingerprint = job_parameters_fingerprint(parameters)
+        else:
+            for name, value in parameters:
+                job.add_parameter(name, value)
+            job.set_parameters_fingerprint()
         self._record_input_datasets(trans, job, inp_data)
 
     def _record_outputs(self, job, out_data, output_collections):
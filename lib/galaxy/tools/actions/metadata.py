@@ -186,6 +186,7 @@ class SetMetadataToolAction(ToolAction):
             include_command=False,
             max_metadata_value_size=app.config.max_metadata_value_size,
             max_discovered_files=app.config.max_discovered_files,
+            max_metadata_processes=app.config.max_metadata_processes,
             validate_outputs=validate_outputs,
             job=job,
             kwds={"overwrite": overwrite},
@@ -120,7 +120,9 @@ class ModelOperationToolAction(DefaultToolAction):
             hdca_tags=preserved_hdca_tags,
             skip=skip,
         )
-        self._record_inputs(trans, tool, job, incoming, inp_data, inp_dataset_collections)
+        self._record_inputs(
+            trans, tool, job, incoming, inp_data, inp_dataset_collections, bulk_records=execution_cache.bulk_records
+        )
         self._record_outputs(job, out_data, output_collections)
         if job_callback:
             job_callback(job)
@@ -1,17 +1,15 @@
 import json
 import logging
 import os
-import shutil
 import sqlite3
-import tempfile
 import zlib
 from threading import Lock
 from typing import (
+    Any,
     Dict,
     Optional,
 )
-
-from sqlitedict import SqliteDict
+from urllib.request import pathname2url
 
 from galaxy.util import unicodify
 from galaxy.util.hash_util import md5_hash_file
@@ -19,6 +17,9 @@ from galaxy.util.hash_util import md5_hash_file
 log = logging.getLogger(__name__)
 
 CURRENT_TOOL_CACHE_VERSION = 0
+# table name used by earlier (sqlitedict based) versions of the cache, so existing caches remain valid
+CACHE_TABLE = "unnamed"
+SQLITE_TIMEOUT = 30
 
 
 def encoder(obj):
@@ -30,104 +31,136 @@ def decoder(obj):
 
 
 class ToolDocumentCache:
+    """Cache expanded tool documents in a SQLite database shared by Galaxy processes.
+
+    The database is used in WAL mode so that processes can read it while
+    another one updates it in place. Updates are buffered and written in a
+    single short transaction by :meth:`persist`. Modification times of tool
+    and macro files are checked at most once per path between two calls of
+    :meth:`persist`, since macro files are shared by many tools.
+    """
+
     def __init__(self, cache_dir):
         self.cache_dir = cache_dir
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
         self.cache_file = os.path.join(self.cache_dir, "cache.sqlite")
-        self.writeable_cache_file = None
-        self._cache = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+        # config file -> tool document to write, None to delete
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._modtimes: Dict[str, float] = {}
         self.disabled = False
-        self._get_cache(create_if_necessary=True)
+        self._connect()
 
     def close(self):
-        self._cache and self._cache.close()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
 
-    def _get_cache(self, flag="r", create_if_necessary=False):
+    def _connect(self):
         try:
-            if create_if_necessary and not os.path.exists(self.cache_file):
-                # Create database if necessary using 'c' flag
-                self._cache = SqliteDict(self.cache_file, flag="c", encode=encoder, decode=decoder, autocommit=False)
-                if flag == "r":
-                    self._cache.flag = flag
+            if self.cache_file_is_writeable or not os.path.exists(self.cache_file):
+                connection = sqlite3.connect(
+                    self.cache_file, timeout=SQLITE_TIMEOUT, isolation_level=None, check_same_thread=False
+                )
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(f'CREATE TABLE IF NOT EXISTS "{CACHE_TABLE}" (key TEXT PRIMARY KEY, value BLOB)')
             else:
-                cache_file = self.writeable_cache_file.name if self.writeable_cache_file else self.cache_file
-                self._cache = SqliteDict(cache_file, flag=flag, encode=encoder, decode=decoder, autocommit=False)
-        except (sqlite3.OperationalError, RuntimeError):
+                # Can't take the locks required for reading a WAL database, the database file
+                # is checkpointed on persist so reading it as immutable is fine.
+                connection = sqlite3.connect(
+                    f"file:{pathname2url(self.cache_file)}?mode=ro&immutable=1",
+                    uri=True,
+                    isolation_level=None,
+                    check_same_thread=False,
+                )
+        except sqlite3.Error:
             log.warning("Tool document cache unavailable")
-            self._cache = None
+            self._connection = None
             self.disabled = True
+            return
+        self._connection = connection
 
     @property
     def cache_file_is_writeable(self):
         return os.access(self.cache_file, os.W_OK)
 
     def reopen_ro(self):
-        self._get_cache(flag="r")
-        self.writeable_cache_file = None
+        self.close()
+        self._connect()
 
     def get(self, config_file):
-        try:
-            tool_document = self._cache.get(config_file)
-        except sqlite3.OperationalError:
-            log.debug("Tool document cache unavailable")
-            return None
+        if config_file in self._pending:
+            tool_document = self._pending[config_file]
+        else:
+            try:
+                with self._lock:
+                    if self._connection is None:
+                        return None
+                    row = self._connection.execute(
+                        f'SELECT value FROM "{CACHE_TABLE}" WHERE key = ?', (config_file,)
+                    ).fetchone()
+            except sqlite3.Error:
+                log.debug("Tool document cache unavailable")
+                return None
+            tool_document = decoder(row[0]) if row else None
         if not tool_document:
             return None
         if tool_document.get("tool_cache_version") != CURRENT_TOOL_CACHE_VERSION:
             return None
         if self.cache_file_is_writeable:
             for path, modtime in tool_document["paths_and_modtimes"].items():
-                if os.path.getmtime(path) != modtime:
+                if self._getmtime(path) != modtime:
                     return None
         return tool_document
 
-    def _make_writable(self):
-        if not self.writeable_cache_file:
-            self.writeable_cache_file = tempfile.NamedTemporaryFile(
-                dir=self.cache_dir, suffix="cache.sqlite.tmp", delete=False
-            )
-            if os.path.exists(self.cache_file):
-                shutil.copy(self.cache_file, self.writeable_cache_file.name)
-            self._get_cache(flag="c")
+    def _getmtime(self, path):
+        modtime = self._modtimes.get(path)
+        if modtime is None:
+            modtime = self._modtimes[path] = os.path.getmtime(path)
+        return modtime
 
     def persist(self):
-        if self.writeable_cache_file:
-            self._cache.commit()
-            os.rename(self.writeable_cache_file.name, self.cache_file)
-            self.reopen_ro()
+        with self._lock:
+            self._modtimes.clear()
+            if not self._pending or self._connection is None:
+                return
+            pending, self._pending = self._pending, {}
+            try:
+                self._connection.execute("BEGIN IMMEDIATE")
+                try:
+                    self._connection.executemany(
+                        f'DELETE FROM "{CACHE_TABLE}" WHERE key = ?',
+                        [(key,) for key, value in pending.items() if value is None],
+                    )
+                    self._connection.executemany(
+                        f'REPLACE INTO "{CACHE_TABLE}" (key, value) VALUES (?, ?)',
+                        [(key, encoder(value)) for key, value in pending.items() if value is not None],
+                    )
+                except BaseException:
+                    self._connection.execute("ROLLBACK")
+                    raise
+                self._connection.execute("COMMIT")
+                self._connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except sqlite3.Error:
+                log.debug("Tool document cache not writeable")
 
     def set(self, config_file, tool_source):
-        try:
-            if self.cache_file_is_writeable:
-                self._make_writable()
-                to_persist = {
-                    "document": tool_source.to_string(),
-                    "macro_paths": tool_source.macro_paths,
-                    "paths_and_modtimes": tool_source.paths_and_modtimes(),
-                    "tool_cache_version": CURRENT_TOOL_CACHE_VERSION,
-                }
-                try:
-                    self._cache[config_file] = to_persist
-                except RuntimeError:
-                    log.debug("Tool document cache not writeable")
-        except sqlite3.OperationalError:
-            log.debug("Tool document cache unavailable")
+        if self.cache_file_is_writeable:
+            self._pending[config_file] = {
+                "document": tool_source.to_string(),
+                "macro_paths": tool_source.macro_paths,
+                "paths_and_modtimes": tool_source.paths_and_modtimes(),
+                "tool_cache_version": CURRENT_TOOL_CACHE_VERSION,
+            }
 
     def delete(self, config_file):
         if self.cache_file_is_writeable:
-            self._make_writable()
-            try:
-                del self._cache[config_file]
-            except (KeyError, RuntimeError):
-                pass
-
-    def __del__(self):
-        if self.writeable_cache_file:
-            try:
-                os.unlink(self.writeable_cache_file.name)
-            except Exception:
-                pass
+            self._pending[config_file] = None
+            # tool or macro files have changed
+            self._modtimes.clear()
 
 
 class ToolCache:
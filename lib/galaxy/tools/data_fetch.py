@@ -1,6 +1,7 @@
 import argparse
 import errno
 import json
+import multiprocessing
 import os
 import shutil
 import sys
@@ -8,6 +9,7 @@ import tempfile
 from io import StringIO
 from typing import (
     Any,
+    Callable,
     Dict,
     List,
     Optional,
@@ -39,6 +41,9 @@ from galaxy.util.hash_util import (
 
 DESCRIPTION = """Data Import Script"""
 
+# set in worker processes of UploadConfig.map_elements
+_worker_function: Optional[Callable] = None
+
 
 def main(argv=None):
     if argv is None:
@@ -46,7 +51,12 @@ def main(argv=None):
     args = _arg_parser().parse_args(argv)
     registry = Registry()
     registry.load_datatypes(root_dir=args.galaxy_root, config=args.datatypes_registry)
-    do_fetch(args.request, working_directory=args.working_directory or os.getcwd(), registry=registry)
+    do_fetch(
+        args.request,
+        working_directory=args.working_directory or os.getcwd(),
+        registry=registry,
+        processes=args.processes,
+    )
 
 
 def do_fetch(
@@ -54,6 +64,7 @@ def do_fetch(
     working_directory: str,
     registry: Registry,
     file_sources_dict: Optional[Dict] = None,
+    processes: int = 1,
 ):
     assert os.path.exists(request_path)
     with open(request_path) as f:
@@ -66,6 +77,7 @@ def do_fetch(
         working_directory,
         allow_failed_collections,
         file_sources_dict,
+        processes=processes,
     )
     galaxy_json = _request_to_galaxy_json(upload_config, request)
     galaxy_json_path = os.path.join(working_directory, "galaxy.json")
@@ -387,16 +399,24 @@ def _fetch_target(upload_config: "UploadConfig", target):
         return _copy_and_validate_simple_attributes(item, rval)
 
     def _resolve_item_capture_error(item):
+        # may run in a worker process, so report failures as part of the result
         try:
-            return _resolve_item(item)
+            return _resolve_item(item), False
         except Exception as e:
             rval = {"error_message": str(e)}
             rval = _copy_and_validate_simple_attributes(item, rval)
-            failed_elements.append(rval)
-            return rval
+            return rval, True
+
+    def _resolve_items(f, items):
+        rvals = []
+        for rval, failed in upload_config.map_elements(f, items):
+            if failed:
+                failed_elements.append(rval)
+            rvals.append(rval)
+        return rvals
 
     if expansion_error is None:
-        elements = elements_tree_map(_resolve_item_capture_error, items)
+        elements = elements_tree_map(_resolve_item_capture_error, items, map_function=_resolve_items)
         if is_collection and not upload_config.allow_failed_collections and len(failed_elements) > 0:
             element_error = "Failed to fetch collection element(s):\n"
             for failed_element in failed_elements:
@@ -431,16 +451,36 @@ def _decompress_target(upload_config: "UploadConfig", target):
     return result if fuzzy_root else temp_directory
 
 
-def elements_tree_map(f, items):
-    new_items = []
-    for item in items:
-        if "elements" in item:
-            new_item = item.copy()
-            new_item["elements"] = elements_tree_map(f, item["elements"])
-            new_items.append(new_item)
-        else:
-            new_items.append(f(item))
-    return new_items
+def elements_tree_map(f, items, map_function: Callable = map):
+    """Apply ``f`` to the leaves of a (nested) elements tree.
+
+    The leaves are handed to ``map_function`` all at once, so it may process
+    them concurrently as long as it returns the results in order.
+    """
+    leaves: List[Dict[str, Any]] = []
+
+    def collect_leaves(items):
+        for item in items:
+            if "elements" in item:
+                collect_leaves(item["elements"])
+            else:
+                leaves.append(item)
+
+    collect_leaves(items)
+    results = iter(map_function(f, leaves))
+
+    def rebuild(items):
+        new_items = []
+        for item in items:
+            if "elements" in item:
+                new_item = item.copy()
+                new_item["elements"] = rebuild(item["elements"])
+                new_items.append(new_item)
+            else:
+                new_items.append(next(results))
+        return new_items
+
+    return rebuild(items)
 
 
 def _directory_to_items(directory):
@@ -525,6 +565,7 @@ def _arg_parser():
     parser.add_argument("--request-version")
     parser.add_argument("--request")
     parser.add_argument("--working-directory")
+    parser.add_argument("--processes", type=int, default=1)
     return parser
 
 
@@ -553,6 +594,7 @@ class UploadConfig:
         working_directory,
         allow_failed_collections,
         file_sources_dict=None,
+        processes=1,
     ):
         self.registry = registry
         self.working_directory = working_directory
@@ -566,9 +608,11 @@ class UploadConfig:
         self.link_data_only = _link_data_only(request)
         self.file_sources_dict = file_sources_dict
         self._file_sources = None
+        self.processes = max(1, processes)
 
         self.__workdir = os.path.abspath(working_directory)
         self.__upload_count = 0
+        self.__pid = os.getpid()
 
     @property
     def file_sources(self):
@@ -587,8 +631,27 @@ class UploadConfig:
         else:
             return getattr(self, key)
 
+    def map_elements(self, f, items):
+        """Return ``[f(item) for item in items]``, using up to ``processes`` worker processes.
+
+        Workers are forked so ``f`` doesn't need to be picklable, its arguments
+        and results do.
+        """
+        items = list(items)
+        if self.processes == 1 or len(items) <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            return [f(item) for item in items]
+        context = multiprocessing.get_context("fork")
+        processes = min(self.processes, len(items))
+        with context.Pool(processes, initializer=_init_worker, initargs=(f,)) as pool:
+            return pool.map(_call_worker_function, items, chunksize=1)
+
     def __new_dataset_path(self):
-        path = os.path.join(self.working_directory, f"gxupload_{self.__upload_count}")
+        if os.getpid() == self.__pid:
+            name = f"gxupload_{self.__upload_count}"
+        else:
+            # in a worker process of map_elements, counters of workers are independent
+            name = f"gxupload_{os.getpid()}_{self.__upload_count}"
+        path = os.path.join(self.working_directory, name)
         self.__upload_count += 1
         return path
 
@@ -615,6 +678,16 @@ class UploadConfig:
         return new_path
 
 
+def _init_worker(f):
+    global _worker_function
+    _worker_function = f
+
+
+def _call_worker_function(item):
+    assert _worker_function is not None
+    return _worker_function(item)
+
+
 def _link_data_only(has_config_dict):
     link_data_only = has_config_dict.get("link_data_only", False)
     if not isinstance(link_data_only, bool):
@@ -32,6 +32,7 @@ from galaxy.model.dataset_collections.structure import (
 )
 from galaxy.tool_util.parser import ToolOutputCollectionPart
 from galaxy.tools.execution_helpers import (
+    BulkJobRecords,
     filter_output,
     on_text_for_names,
     ToolExecutionCache,
@@ -112,6 +113,10 @@ def execute(
             trans, tool, mapping_params, collection_info, invocation_step, completed_jobs=completed_jobs
         )
     execution_cache = ToolExecutionCache(trans)
+    if collection_info is not None:
+        # mapping over a collection creates many similar jobs, insert their parameters
+        # and output permissions in bulk
+        execution_cache.bulk_records = BulkJobRecords()
 
     def execute_single_job(execution_slice: "ExecutionSlice", completed_job: Optional[model.Job], skip: bool = False):
         job_timer = tool.app.execution_timer_factory.get_timer(
@@ -192,9 +197,13 @@ def execute(
             execute_single_job(execution_slice, completed_jobs[i], skip=skip)
             history = execution_slice.history or history
             jobs_executed += 1
+            if execution_cache.bulk_records is not None and execution_cache.bulk_records.full:
+                execution_cache.bulk_records.write(trans.sa_session, tool.app.security_agent)
 
     if execution_slice:
         history.add_pending_items()
+    if execution_cache.bulk_records is not None:
+        execution_cache.bulk_records.write(trans.sa_session, tool.app.security_agent)
     # Make sure collections, implicit jobs etc are flushed even if there are no precreated output datasets
     with transaction(trans.sa_session):
         trans.sa_session.commit()
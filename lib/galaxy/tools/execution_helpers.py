@@ -5,9 +5,22 @@ tool execution code, and tool action code.
 """
 
 import logging
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy import insert
+
+from galaxy import model
 
 log = logging.getLogger(__name__)
 
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
 
 class ToolExecutionCache:
     """An object meant to cache calculation caused by repeatedly evaluting
@@ -19,6 +32,7 @@ class ToolExecutionCache:
         self.current_user_roles = trans.get_current_user_roles()
         self.chrom_info = {}
         self.cached_collection_elements = {}
+        self.bulk_records: Optional[BulkJobRecords] = None
 
     def get_chrom_info(self, tool_id, input_dbkey):
         genome_builds = self.trans.app.genome_builds
@@ -37,6 +51,50 @@ class ToolExecutionCache:
         return chrom_info_pair
 
 
+class BulkJobRecords:
+    """Collect the rows that are created many times per job (job parameters and
+    output dataset permissions) while mapping a tool over a collection, so they
+    can be written with one executemany INSERT per chunk of jobs instead of one
+    ORM object per row.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_BULK_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.job_parameters: List[Tuple[model.Job, List[Tuple[str, Any]]]] = []
+        self.dataset_permissions: List[Tuple[model.Dataset, Dict]] = []
+
+    def add_job_parameters(self, job: model.Job, parameters: List[Tuple[str, Any]]):
+        self.job_parameters.append((job, parameters))
+
+    def add_dataset_permissions(self, dataset: model.Dataset, permissions: Dict):
+        self.dataset_permissions.append((dataset, permissions))
+
+    @property
+    def full(self) -> bool:
+        return len(self.job_parameters) >= self.chunk_size
+
+    def write(self, sa_session, security_agent):
+        """Flush pending jobs and datasets and insert the collected rows."""
+        if not self.job_parameters and not self.dataset_permissions:
+            return
+        # jobs and datasets need ids before rows referencing them can be inserted
+        sa_session.flush()
+        if self.job_parameters:
+            rows = [
+                {"job_id": job.id, "name": name, "value": value}
+                for job, parameters in self.job_parameters
+                for name, value in parameters
+            ]
+            if rows:
+                sa_session.execute(insert(model.JobParameter), rows)
+            for job, _ in self.job_parameters:
+                sa_session.expire(job, ["parameters"])
+            self.job_parameters = []
+        if self.dataset_permissions:
+            security_agent.set_new_datasets_permissions(self.dataset_permissions)
+            self.dataset_permissions = []
+
+
 def filter_output(tool, output, incoming):
     for filter in output.filters:
         try:
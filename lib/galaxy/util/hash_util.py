@@ -6,12 +6,14 @@ introduced hashlib which replaced sha in Python 2.4 and previous versions.
 import hashlib
 import hmac
 import logging
+import mmap
 import os
 from enum import Enum
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Tuple,
@@ -23,6 +25,8 @@ from . import smart_str
 log = logging.getLogger(__name__)
 
 BLOCK_SIZE = 1024 * 1024
+# reads of several hash functions at once are larger, and a multiple of the page size
+MULTI_HASH_BLOCK_SIZE = 16 * BLOCK_SIZE
 
 HashFunctionT = Callable[[], "hashlib._Hash"]
 
@@ -82,16 +86,43 @@ def memory_bound_hexdigest(
         file.close()
 
 
+def memory_bound_hexdigests(
+    hash_func_names: Iterable[HashFunctionNameEnum],
+    path: Optional[str] = None,
+    file=None,
+    block_size: int = MULTI_HASH_BLOCK_SIZE,
+) -> Dict[HashFunctionNameEnum, str]:
+    """
+    Return hex digests for each of the requested hash functions, reading the file only once.
+
+    Blocks are read into a single reusable, page aligned buffer and fed to every hasher in
+    turn. Files opened from `path` are unbuffered, so blocks are read straight into it.
+    """
+    hashers = {name: HASH_NAME_MAP[name]() for name in map(HashFunctionNameEnum, hash_func_names)}
+    if file is None:
+        assert path is not None
+        file = open(path, "rb", buffering=0)
+    else:
+        assert path is None, "Cannot specify path and path keyword arguments."
+
+    # round up to whole pages, anonymous maps start on a page boundary
+    block_size = -(-block_size // mmap.PAGESIZE) * mmap.PAGESIZE
+    try:
+        with mmap.mmap(-1, block_size) as buffer, memoryview(buffer) as view:
+            while read := file.readinto(view):
+                for hasher in hashers.values():
+                    hasher.update(view[:read])
+        return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+    finally:
+        file.close()
+
+
 def md5_hash_file(path: Union[str, os.PathLike]) -> Optional[str]:
     """
     Return a md5 hashdigest for a file or None if path could not be read.
     """
-    hasher = hashlib.md5()
     try:
-        with open(path, "rb") as afile:
-            buf = afile.read()
-            hasher.update(buf)
-            return hasher.hexdigest()
+        return memory_bound_hexdigest(hash_func=md5, file=open(path, "rb"))
     except OSError:
         # This may happen if path has been deleted
         return None
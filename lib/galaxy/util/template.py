@@ -1,7 +1,14 @@
 """Entry point for the usage of Cheetah templating within Galaxy."""
 
+import hashlib
+import threading
 import traceback
+from collections import OrderedDict
 from lib2to3.refactor import RefactoringTool
+from typing import (
+    Dict,
+    Type,
+)
 
 from Cheetah.Compiler import Compiler
 from Cheetah.NameMapper import NotFound
@@ -18,6 +25,8 @@ from . import unicodify
 myfixes = [f for f in myfixes if not f.startswith("libpasteurize")]
 refactoring_tool = RefactoringTool(myfixes, {"print_function": True})
 
+DEFAULT_COMPILED_TEMPLATE_CACHE_SIZE = 1000
+
 
 class InputNotFoundSyntaxError(SyntaxError):
     pass
@@ -39,6 +48,67 @@ def create_compiler_class(module_code):
     return CustomCompilerClass
 
 
+class CompiledTemplateCache:
+    """Bounded LRU cache of compiled Cheetah template classes.
+
+    Classes are keyed by a hash of the template text, so the command line,
+    config file and environment templates of a tool are only compiled once
+    per process instead of for every job.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_COMPILED_TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._classes: "OrderedDict[str, Type[Template]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._classes)
+
+    def compile(self, template_text: str, compiler_class=Compiler) -> Type[Template]:
+        if compiler_class is not Compiler:
+            # Compiler classes with fixed module code are only created when retrying a failing template
+            return _compile_template(template_text, compiler_class)
+        key = hashlib.sha256(template_text.encode("utf-8")).hexdigest()
+        with self._lock:
+            klass = self._classes.get(key)
+            if klass is not None:
+                self._classes.move_to_end(key)
+                self.hits += 1
+                return klass
+        klass = _compile_template(template_text, compiler_class)
+        with self._lock:
+            self.misses += 1
+            self._classes[key] = klass
+            while len(self._classes) > self.max_size:
+                self._classes.popitem(last=False)
+        return klass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._classes.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._classes)}
+
+
+def _compile_template(template_text: str, compiler_class) -> Type[Template]:
+    # Cheetah's own compilation cache is unbounded, CompiledTemplateCache is used instead
+    return Template.compile(
+        source=template_text,
+        compilerClass=compiler_class,
+        cacheCompilationResults=False,
+        useCache=False,
+        keepRefToGeneratedCode=True,
+    )
+
+
+compiled_template_cache = CompiledTemplateCache()
+
+
 def fill_template(
     template_text,
     context=None,
@@ -62,7 +132,7 @@ def fill_template(
     if isinstance(python_template_version, str):
         python_template_version = Version(python_template_version)
     try:
-        klass = Template.compile(source=template_text, compilerClass=compiler_class)
+        klass = compiled_template_cache.compile(template_text, compiler_class)
     except ParseError as e:
         # Might happen on invalid syntax within a cheetah statement, like `#if $smxsize <> 128.0`
         if first_exception is None:
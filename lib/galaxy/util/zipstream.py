@@ -15,6 +15,8 @@ from .path import safe_walk
 
 CRC32_MIN = 1444
 CRC32_MAX = 1459
+# Members with these extensions are already compressed, deflating them again only burns CPU.
+COMPRESSED_EXTENSIONS = (".bam", ".bcf", ".bgz", ".bz2", ".cram", ".gz", ".xz", ".zip", ".zst")
 
 
 class ZipstreamWrapper:
@@ -67,7 +69,8 @@ class ZipstreamWrapper:
             self.files.append(line)
         else:
             self.size += size
-            self.archive.write(path, archive_name)
+            compress_type = zipstream.ZIP_STORED if archive_name.lower().endswith(COMPRESSED_EXTENSIONS) else None
+            self.archive.write(path, archive_name, compress_type=compress_type)
 
     def write(self, path: str, archive_name: Optional[str] = None) -> None:
         if os.path.isdir(path):
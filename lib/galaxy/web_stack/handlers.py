@@ -15,6 +15,7 @@ from sqlalchemy.orm import object_session
 from galaxy.exceptions import HandlerAssignmentError
 from galaxy.model.base import transaction
 from galaxy.util import (
+    asbool,
     ExecutionTimer,
     listify,
 )
@@ -87,6 +88,15 @@ class ConfiguresHandlers:
             ready_window_size_str = config_element.attrib.get("ready_window_size", None)
             if ready_window_size_str:
                 handling_config_dict["ready_window_size"] = int(ready_window_size_str)
+            incremental_ready_check_str = config_element.attrib.get("incremental_ready_check", None)
+            if incremental_ready_check_str:
+                handling_config_dict["incremental_ready_check"] = asbool(incremental_ready_check_str)
+            ready_reconcile_interval_str = config_element.attrib.get("ready_reconcile_interval", None)
+            if ready_reconcile_interval_str:
+                handling_config_dict["ready_reconcile_interval"] = int(ready_reconcile_interval_str)
+            prefetch_inputs_str = config_element.attrib.get("prefetch_inputs", None)
+            if prefetch_inputs_str:
+                handling_config_dict["prefetch_inputs"] = asbool(prefetch_inputs_str)
 
         return handling_config_dict
 
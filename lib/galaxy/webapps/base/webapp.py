@@ -803,8 +803,7 @@ class GalaxyWebTransaction(base.DefaultWebTransaction, context.ProvidesHistoryCo
             if prev_galaxy_session.user is None:
                 # Increase the user's disk usage by the amount of the previous history's datasets if they didn't already
                 # own it.
-                for hda in history.datasets:
-                    user.adjust_total_disk_usage(hda.quota_amount(user), hda.dataset.quota_source_info.label)
+                user.adjust_dataset_usage(history.datasets, 1)
                 # Only set default history permissions if the history is from the previous session and anonymous
                 set_permissions = True
         elif self.galaxy_session.current_history:
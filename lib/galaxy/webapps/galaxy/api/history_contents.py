@@ -178,18 +178,28 @@ def get_index_query_params(
         ),
         deprecated=True,  # TODO: remove 'dataset_details' when the UI doesn't need it
     ),
+    after: Optional[str] = Query(
+        default=None,
+        title="After",
+        description=(
+            "The `type_id` of the last item of the previous page. Only items following it in `hid` order are "
+            "returned. Use instead of `offset` to page through large histories, requires ordering by `hid`."
+        ),
+    ),
 ) -> HistoryContentsIndexParams:
     """This function is meant to be used as a dependency to render the OpenAPI documentation
     correctly"""
     return parse_index_query_params(
         v=v,
         dataset_details=dataset_details,
+        after=after,
     )
 
 
 def parse_index_query_params(
     v: Optional[str] = None,
     dataset_details: Optional[str] = None,
+    after: Optional[str] = None,
     **_,  # Additional params are ignored
 ) -> HistoryContentsIndexParams:
     """Parses query parameters for the history contents `index` operation
@@ -198,6 +208,7 @@ def parse_index_query_params(
         return HistoryContentsIndexParams(
             v=v,
             dataset_details=parse_dataset_details(dataset_details),
+            after=after,
         )
     except ValidationError as e:
         raise validation_error_to_message_exception(e)
@@ -27,7 +27,10 @@ from galaxy import (
     util,
     web,
 )
-from galaxy.celery.tasks import compute_dataset_hash
+from galaxy.celery.tasks import (
+    compute_dataset_hash,
+    compute_dataset_hashes,
+)
 from galaxy.datatypes.binary import Binary
 from galaxy.datatypes.dataproviders.exceptions import NoProviderAvailable
 from galaxy.managers.base import ModelSerializer
@@ -72,7 +75,10 @@ from galaxy.schema.schema import (
     Model,
     UpdateDatasetPermissionsPayload,
 )
-from galaxy.schema.tasks import ComputeDatasetHashTaskRequest
+from galaxy.schema.tasks import (
+    ComputeDatasetHashesTaskRequest,
+    ComputeDatasetHashTaskRequest,
+)
 from galaxy.schema.types import RelativeUrl
 from galaxy.security.idencoding import IdEncodingHelper
 from galaxy.util.hash_util import HashFunctionNameEnum
@@ -497,13 +503,23 @@ class DatasetsService(ServiceBase, UsesVisualizationMixin):
         hda_ldda: DatasetSourceType = DatasetSourceType.hda,
     ) -> AsyncTaskResultSummary:
         dataset_instance = self.dataset_manager_by_type[hda_ldda].get_accessible(dataset_id, trans.user)
-        request = ComputeDatasetHashTaskRequest(
-            dataset_id=dataset_instance.dataset.id,
-            extra_files_path=payload.extra_files_path,
-            hash_function=payload.hash_function,
-            user=trans.async_request_user,
-        )
-        result = compute_dataset_hash.delay(request=request, task_user_id=getattr(trans.user, "id", None))
+        task_user_id = getattr(trans.user, "id", None)
+        if payload.extra_files_path:
+            request = ComputeDatasetHashTaskRequest(
+                dataset_id=dataset_instance.dataset.id,
+                extra_files_path=payload.extra_files_path,
+                hash_function=payload.hash_function,
+                user=trans.async_request_user,
+            )
+            result = compute_dataset_hash.delay(request=request, task_user_id=task_user_id)
+        else:
+            hashes_request = ComputeDatasetHashesTaskRequest(
+                dataset_id=dataset_instance.dataset.id,
+                hash_functions=[payload.hash_function],
+                include_extra_files=False,
+                user=trans.async_request_user,
+            )
+            result = compute_dataset_hashes.delay(request=hashes_request, task_user_id=task_user_id)
         return async_task_summary(result)
 
     def drs_dataset_instance(self, object_id: str) -> Tuple[int, DatasetSourceType]:
@@ -537,14 +553,14 @@ class DatasetsService(ServiceBase, UsesVisualizationMixin):
             checksums.append(Checksum(type=type, checksum=checksum))
 
         if len(checksums) == 0:
-            hash_funciton = HashFunctionNameEnum.md5
-            request = ComputeDatasetHashTaskRequest(
+            # SHA-256 is the checksum recommended by DRS, both are computed in a single read of the dataset
+            request = ComputeDatasetHashesTaskRequest(
                 dataset_id=dataset_instance.dataset.id,
-                extra_files_path=None,
-                hash_function=hash_funciton,
+                hash_functions=[HashFunctionNameEnum.md5, HashFunctionNameEnum.sha256],
+                include_extra_files=False,
                 user=None,
             )
-            compute_dataset_hash.delay(request=request, task_user_id=getattr(trans.user, "id", None))
+            compute_dataset_hashes.delay(request=request, task_user_id=getattr(trans.user, "id", None))
             raise galaxy_exceptions.AcceptedRetryLater(
                 "required checksum task for DRS object response launched.", retry_after=60
             )
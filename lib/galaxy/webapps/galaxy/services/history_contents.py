@@ -135,12 +135,30 @@ log = logging.getLogger(__name__)
 
 DatasetDetailsType = Union[Set[DecodedDatabaseIdField], Literal["all"]]
 
+# orders that can be paginated with the `after` cursor, mapped to whether they are descending
+KEYSET_ORDERS = {"hid": True, "hid-dsc": True, "hid-asc": False}
+# keys that can be serialized straight from the history contents query rows, these are
+# also visible to users without access to a dataset (see the `inaccessible` HDA view)
+PROJECTED_CONTENT_KEYS = {
+    "id",
+    "type_id",
+    "name",
+    "history_id",
+    "hid",
+    "history_content_type",
+    "state",
+    "populated_state",
+    "deleted",
+    "visible",
+}
+
 
 class HistoryContentsIndexParams(Model):
     """Query parameters exclusively used by the *new version* of `index` operation."""
 
     v: Optional[Literal["dev"]]
     dataset_details: Optional[DatasetDetailsType]
+    after: Optional[str] = None
 
 
 class LegacyHistoryContentsIndexParams(Model):
@@ -988,23 +1006,49 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         serialization_params = self._handle_extra_serialization_for_media_type(serialization_params, accept)
         filter_query_params.order = filter_query_params.order or "hid-asc"
         order_by = self.build_order_by(self.history_contents_manager, filter_query_params.order)
+        after = None
+        descending = False
+        if params.after:
+            if filter_query_params.order not in KEYSET_ORDERS:
+                raise exceptions.RequestParameterInvalidException(
+                    f"The `after` parameter can only be used when ordering by one of {list(KEYSET_ORDERS)}"
+                )
+            if filter_query_params.offset:
+                raise exceptions.RequestParameterInvalidException("Use either `after` or `offset`, not both")
+            content_type, content_id = self.history_contents_filters.decode_type_id(params.after).split("-", 1)
+            after = self.history_contents_manager.keyset_for(history, content_type, int(content_id))
+            descending = KEYSET_ORDERS[filter_query_params.order]
+        # summary keys that can be built from the contents query rows, without loading models
+        project_rows = (
+            not params.dataset_details
+            and not serialization_params.view
+            and bool(serialization_params.keys)
+            and set(serialization_params.keys or []) <= PROJECTED_CONTENT_KEYS
+            and not self.history_contents_filters.contains_non_orm_filter(filters)
+        )
         contents = self.history_contents_manager.contents(
             history,
             filters=filters,
             limit=filter_query_params.limit,
             offset=filter_query_params.offset,
             order_by=order_by,
+            after=after,
+            descending=descending,
+            expand_models=not project_rows,
             serialization_params=serialization_params,
         )
-        items = [
-            self._serialize_content_item(
-                trans,
-                content,
-                dataset_details=params.dataset_details,
-                serialization_params=serialization_params,
-            )
-            for content in contents
-        ]
+        if project_rows:
+            items = [self._serialize_content_row(row, serialization_params.keys or []) for row in contents]
+        else:
+            items = [
+                self._serialize_content_item(
+                    trans,
+                    content,
+                    dataset_details=params.dataset_details,
+                    serialization_params=serialization_params,
+                )
+                for content in contents
+            ]
         if stats_requested:
             total_matches = self.history_contents_manager.contents_count(
                 history,
@@ -1088,6 +1132,28 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
                 )
         return rval
 
+    def _serialize_content_row(self, row, keys: List[str]) -> Dict[str, Any]:
+        """
+        Serialize a row of the history contents query to the requested `keys`, which
+        must be in `PROJECTED_CONTENT_KEYS`, matching what the HDA and HDCA serializers return.
+        """
+        is_dataset = row.history_content_type == "dataset"
+        values = {
+            "id": row.id,
+            "type_id": f"{row.history_content_type}-{self.encode_id(row.id)}",
+            "name": row.name,
+            "history_id": row.history_id,
+            "hid": -1 if row.hid is None and is_dataset else row.hid,
+            "history_content_type": row.history_content_type,
+            "deleted": row.deleted,
+            "visible": row.visible,
+        }
+        if is_dataset:
+            values["state"] = row._state or row.state
+        else:
+            values["populated_state"] = row.state
+        return {key: values[key] for key in keys if key in values}
+
     def __collection_dict(self, trans, dataset_collection_instance, **kwds):
         return dictify_dataset_collection_instance(
             dataset_collection_instance,
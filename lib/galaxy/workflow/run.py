@@ -3,7 +3,9 @@ import uuid
 from typing import (
     Any,
     Dict,
+    Iterator,
     List,
+    Mapping,
     Optional,
     Tuple,
     TYPE_CHECKING,
@@ -59,7 +61,12 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
-WorkflowOutputsType = Dict[int, Any]
+WorkflowOutputsType = Mapping[int, Any]
+
+# Scheduled steps of these types are recovered on every scheduling iteration, they set runtime
+# replacements or may cancel the invocation. Outputs of other scheduled steps are only recovered
+# once a remaining step (or the parent workflow) needs them.
+EAGERLY_RECOVERED_STEP_TYPES = frozenset(["data_input", "data_collection_input", "parameter_input", "pause"])
 
 
 # Entry point for core workflow scheduler.
@@ -95,7 +102,7 @@ def __invoke(
         workflow_invocation=workflow_invocation,
     )
     workflow_invocation = invoker.workflow_invocation
-    outputs = {}
+    outputs: WorkflowOutputsType = {}
     try:
         outputs = invoker.invoke()
     except modules.CancelWorkflowEvaluation as e:
@@ -194,7 +201,7 @@ class WorkflowInvoker:
             )
         self.progress = progress
 
-    def invoke(self) -> Dict[int, Any]:
+    def invoke(self) -> WorkflowOutputsType:
         workflow_invocation = self.workflow_invocation
         config = self.trans.app.config
         maximum_duration = getattr(config, "maximum_workflow_invocation_duration", -1)
@@ -208,7 +215,7 @@ class WorkflowInvoker:
 
             # Not flushing in here, because web controller may create multiple
             # invocations.
-            return self.progress.outputs
+            return self.progress.step_outputs
 
         if workflow_invocation.history.deleted:
             raise modules.CancelWorkflowEvaluation(
@@ -285,7 +292,7 @@ class WorkflowInvoker:
 
         # Not flushing in here, because web controller may create multiple
         # invocations.
-        return self.progress.outputs
+        return self.progress.step_outputs
 
     def __check_implicitly_dependent_steps(self, step):
         """Method will delay the workflow evaluation if implicitly dependent
@@ -354,6 +361,30 @@ class ModuleInjector(Protocol):
         pass
 
 
+class RecoveringStepOutputs(Mapping[int, Any]):
+    """Outputs of the steps of a workflow invocation by step id.
+
+    Outputs of scheduled steps that have not been recovered yet are recovered
+    when they are accessed.
+    """
+
+    def __init__(self, progress: "WorkflowProgress") -> None:
+        self.progress = progress
+
+    def __getitem__(self, step_id: int) -> Any:
+        self.progress._recover_outputs(step_id)
+        return self.progress.outputs[step_id]
+
+    def __contains__(self, step_id: object) -> bool:
+        return step_id in self.progress.outputs or step_id in self.progress._unrecovered_steps
+
+    def __iter__(self) -> Iterator[int]:
+        return iter([*self.progress.outputs, *self.progress._unrecovered_steps])
+
+    def __len__(self) -> int:
+        return len(self.progress.outputs) + len(self.progress._unrecovered_steps)
+
+
 class WorkflowProgress:
     def __init__(
         self,
@@ -382,6 +413,8 @@ class WorkflowProgress:
         self.subworkflow_collection_info = subworkflow_collection_info
         self.subworkflow_structure = subworkflow_collection_info.structure if subworkflow_collection_info else None
         self.when_values = when_values
+        # scheduled steps whose outputs have not been recovered yet, by step id
+        self._unrecovered_steps: Dict[int, WorkflowInvocationStep] = {}
 
     @property
     def maximum_jobs_to_schedule_or_none(self) -> Optional[int]:
@@ -407,24 +440,42 @@ class WorkflowProgress:
         self.module_injector.inject_all(self.workflow_invocation.workflow, param_map=self.param_map)
         for step in steps:
             step_id = step.id
-            step_args = self.param_map.get(step_id, {})
-            self.module_injector.compute_runtime_state(step, step_args=step_args)
             if step_id not in step_states:
                 # Can this ever happen?
                 public_message = f"Workflow invocation has no step state for step {step.order_index + 1}"
                 log.error(f"{public_message}. State is known for these step ids: {list(step_states.keys())}.")
                 raise MessageException(public_message)
+            invocation_step = step_invocations_by_id.get(step_id, None)
+            scheduled = invocation_step is not None and invocation_step.state == "scheduled"
+            if scheduled and step.type not in EAGERLY_RECOVERED_STEP_TYPES:
+                assert invocation_step
+                self._unrecovered_steps[step_id] = invocation_step
+                continue
+
+            step_args = self.param_map.get(step_id, {})
+            self.module_injector.compute_runtime_state(step, step_args=step_args)
             runtime_state = step_states[step_id].value
             assert step.module
             step.state = step.module.decode_runtime_state(step, runtime_state)
 
-            invocation_step = step_invocations_by_id.get(step_id, None)
-            if invocation_step and invocation_step.state == "scheduled":
+            if scheduled:
+                assert invocation_step
                 self._recover_mapping(invocation_step)
             else:
                 remaining_steps.append((step, invocation_step))
         return remaining_steps
 
+    @property
+    def step_outputs(self) -> RecoveringStepOutputs:
+        """Outputs of all steps, including scheduled steps whose outputs have not been recovered yet."""
+        return RecoveringStepOutputs(self)
+
+    def _recover_outputs(self, step_id: int) -> None:
+        """Recover outputs of scheduled step ``step_id`` if this hasn't happened yet."""
+        invocation_step = self._unrecovered_steps.pop(step_id, None)
+        if invocation_step is not None:
+            self._recover_mapping(invocation_step)
+
     def replacement_for_input(self, trans, step: "WorkflowStep", input_dict: Dict[str, Any]):
         replacement: Union[
             modules.NoReplacement,
@@ -465,6 +516,7 @@ class WorkflowProgress:
     def replacement_for_connection(self, connection: "WorkflowStepConnection", is_data: bool = True):
         output_step_id = connection.output_step.id
         output_name = connection.output_name
+        self._recover_outputs(output_step_id)
         if output_step_id not in self.outputs:
             raise modules.FailWorkflowEvaluation(
                 why=InvocationFailureOutputNotFound(
@@ -548,6 +600,7 @@ class WorkflowProgress:
     def get_replacement_workflow_output(self, workflow_output: "WorkflowOutput"):
         step = workflow_output.workflow_step
         output_name = workflow_output.output_name
+        self._recover_outputs(step.id)
         step_outputs = self.outputs[step.id]
         if step_outputs is STEP_OUTPUT_DELAYED:
             delayed_why = f"depends on workflow output [{output_name}] but that output has not been created yet"
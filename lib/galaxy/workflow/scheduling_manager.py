@@ -1,5 +1,16 @@
 import os
+import threading
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+)
 from functools import partial
+from itertools import zip_longest
+from typing import (
+    List,
+    Optional,
+    Set,
+)
 
 import galaxy.workflow.schedulers
 from galaxy import model
@@ -283,6 +294,16 @@ class WorkflowRequestMonitor(Monitors):
             name="WorkflowRequestMonitor.monitor_thread", target=self.__monitor, config=app.config
         )
         self.invocation_grabber = None
+        self.scheduling_pool: Optional[ThreadPoolExecutor] = None
+        scheduling_threads = getattr(app.config, "workflow_scheduling_threads", 1)
+        if scheduling_threads > 1:
+            self.scheduling_pool = ThreadPoolExecutor(
+                max_workers=scheduling_threads, thread_name_prefix="WorkflowRequestMonitor.scheduling_thread"
+            )
+        # ids of invocations submitted to scheduling_pool that are not done yet
+        self._invocations_in_progress: Set[int] = set()
+        self._invocations_in_progress_lock = threading.Lock()
+        self._round_robin_offset = 0
         self_handler_tags = set(self.app.job_config.self_handler_tags)
         self_handler_tags.add(self.workflow_scheduling_manager.default_handler_id)
         handler_assignment_method = InvocationGrabber.get_grabbable_handler_assignment_method(
@@ -319,6 +340,9 @@ class WorkflowRequestMonitor(Monitors):
             self._monitor_sleep(self.app.config.workflow_monitor_sleep)
 
     def __schedule(self, workflow_scheduler_id, workflow_scheduler):
+        if self.scheduling_pool is not None:
+            self.__schedule_concurrently(workflow_scheduler_id, workflow_scheduler)
+            return
         invocation_ids = self.__active_invocation_ids(workflow_scheduler_id)
         for invocation_id in invocation_ids:
             log.debug("Attempting to schedule workflow invocation [%s]", invocation_id)
@@ -326,6 +350,43 @@ class WorkflowRequestMonitor(Monitors):
             if not self.monitor_running:
                 return
 
+    def __schedule_concurrently(self, workflow_scheduler_id, workflow_scheduler):
+        ids_by_user = model.WorkflowInvocation.poll_active_workflow_ids_by_user(
+            self.app.model.engine,
+            scheduler=workflow_scheduler_id,
+            handler=self.app.config.server_name,
+        )
+        # Interleave invocations of different users and start with a different user in every iteration,
+        # so users with many (or large) invocations don't delay everyone else.
+        invocation_ids = round_robin(list(ids_by_user.values()), self._round_robin_offset)
+        self._round_robin_offset += 1
+        futures = []
+        for invocation_id in invocation_ids:
+            with self._invocations_in_progress_lock:
+                if invocation_id in self._invocations_in_progress:
+                    # still being scheduled by a thread of a previous iteration
+                    continue
+                self._invocations_in_progress.add(invocation_id)
+            log.debug("Attempting to schedule workflow invocation [%s]", invocation_id)
+            future = self.scheduling_pool.submit(self.__attempt_schedule_if_running, invocation_id, workflow_scheduler)
+            future.add_done_callback(partial(self.__invocation_done, invocation_id))
+            futures.append(future)
+        budget = self.app.config.workflow_scheduling_iteration_budget
+        _, not_done = wait(futures, timeout=budget if budget > 0 else None)
+        for future in not_done:
+            # Not started yet, reconsidered in the next iteration. Invocations
+            # being scheduled keep their thread and are skipped until done.
+            future.cancel()
+
+    def __invocation_done(self, invocation_id, future):
+        with self._invocations_in_progress_lock:
+            self._invocations_in_progress.discard(invocation_id)
+
+    def __attempt_schedule_if_running(self, invocation_id, workflow_scheduler):
+        if not self.monitor_running:
+            return False
+        return self.__attempt_schedule(invocation_id, workflow_scheduler)
+
     def __attempt_schedule(self, invocation_id, workflow_scheduler):
         with self.app.model.context() as session:
             workflow_invocation = session.get(model.WorkflowInvocation, invocation_id)
@@ -369,3 +430,20 @@ class WorkflowRequestMonitor(Monitors):
 
     def shutdown(self):
         self.shutdown_monitor()
+        if self.scheduling_pool is not None:
+            self.scheduling_pool.shutdown(wait=False)
+
+
+def round_robin(groups: List[List[int]], offset: int = 0) -> List[int]:
+    """Interleave ``groups``, starting with the group at index ``offset`` (modulo the number of groups).
+
+    >>> round_robin([[1, 2, 3], [4], [5, 6]])
+    [1, 4, 5, 2, 6, 3]
+    >>> round_robin([[1, 2, 3], [4], [5, 6]], offset=4)
+    [4, 5, 1, 6, 2, 3]
+    """
+    if not groups:
+        return []
+    offset %= len(groups)
+    groups = groups[offset:] + groups[:offset]
+    return [item for items in zip_longest(*groups) for item in items if item is not None]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Record parameter fingerprints of jobs created before fingerprints were
+recorded at job creation, so they can be found by the job cache without
+falling back to matching parameters one by one.
+"""
+
+import argparse
+import os
+import sys
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "lib")))
+
+from sqlalchemy import (
+    bindparam,
+    select,
+    update,
+)
+
+import galaxy.config
+from galaxy.model import (
+    Job,
+    job_parameters_fingerprint,
+    JobParameter,
+)
+from galaxy.model.base import transaction
+from galaxy.model.mapping import init_models_from_config
+from galaxy.util.script import (
+    app_properties_from_args,
+    populate_config_args,
+)
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--batch-size", type=int, default=1000, help="Number of jobs updated per transaction")
+populate_config_args(parser)
+args = parser.parse_args()
+
+
+def init():
+    app_properties = app_properties_from_args(args)
+    config = galaxy.config.Configuration(**app_properties)
+    return init_models_from_config(config)
+
+
+if __name__ == "__main__":
+    print("Loading Galaxy model...")
+    model = init()
+    session = model.context.current()
+
+    updated = 0
+    last_id = 0
+    while True:
+        job_ids = session.scalars(
+            select(Job.id)
+            .where(Job.parameters_fingerprint.is_(None), Job.id > last_id)
+            .order_by(Job.id)
+            .limit(args.batch_size)
+        ).all()
+        if not job_ids:
+            break
+        last_id = job_ids[-1]
+        parameters_by_job: Dict[int, List[Tuple[str, Optional[str]]]] = {job_id: [] for job_id in job_ids}
+        for job_id, name, value in session.execute(
+            select(JobParameter.job_id, JobParameter.name, JobParameter.value).where(JobParameter.job_id.in_(job_ids))
+        ):
+            parameters_by_job[job_id].append((name, value))
+        session.execute(
+            update(Job.table)
+            .where(Job.table.c.id == bindparam("job_id"))
+            .values(parameters_fingerprint=bindparam("fingerprint")),
+            [
+                {"job_id": job_id, "fingerprint": job_parameters_fingerprint(parameters)}
+                for job_id, parameters in parameters_by_job.items()
+            ],
+        )
+        with transaction(session):
+            session.commit()
+        updated += len(job_ids)
+        print(f"\rUpdated {updated} jobs", end=" ")
+        sys.stdout.flush()
+    print(f"\rUpdated {updated} jobs")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Time the creation of large list collections from existing datasets.
+
+Runs in process against an in-memory database using the mock app of the unit
+tests, and reports wall time and the number of SQL statements executed while
+creating each collection.
+
+% python test/manual/collection_creation_scaling.py --sizes 1000 10000 100000
+"""
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from uuid import uuid4
+
+from sqlalchemy import (
+    event,
+    insert,
+)
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib"), os.path.join(galaxy_root, "test")]
+
+from galaxy import model
+from galaxy.app_unittest_utils import galaxy_mock
+from galaxy.managers.collections import DatasetCollectionManager
+from galaxy.model.base import transaction
+
+DESCRIPTION = "Script to time the creation of large list collections."
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    arg_parser.add_argument("--copy_elements", default=False, action="store_true")
+    arg_parser.add_argument("--hide_source_items", default=False, action="store_true")
+    args = arg_parser.parse_args(argv)
+
+    trans = galaxy_mock.MockTrans(admin_users_list=[])
+    trans.init_user_in_database()
+    session = trans.sa_session
+    collection_manager = trans.app[DatasetCollectionManager]
+    statements = []
+    event.listen(session.bind, "before_cursor_execute", lambda *a, **kw: statements.append(1))
+
+    for size in args.sizes:
+        history = model.History(name=f"history of {size}", user=trans.user)
+        session.add(history)
+        with transaction(session):
+            session.commit()
+        # insert the source datasets in bulk, creating them through the ORM one by one takes longer than the benchmark
+        dataset_ids = session.scalars(
+            insert(model.Dataset).returning(model.Dataset.id),
+            [{"state": model.Dataset.states.OK, "uuid": uuid4(), "file_size": 0, "total_size": 0} for _ in range(size)],
+        ).all()
+        hda_ids = session.scalars(
+            insert(model.HistoryDatasetAssociation).returning(model.HistoryDatasetAssociation.id),
+            [
+                {
+                    "history_id": history.id,
+                    "dataset_id": dataset_id,
+                    "hid": i + 1,
+                    "name": f"dataset {i}",
+                    "extension": "txt",
+                    "visible": True,
+                    "deleted": False,
+                    "purged": False,
+                }
+                for i, dataset_id in enumerate(dataset_ids)
+            ],
+        ).all()
+        history.hid_counter = size + 1
+        with transaction(session):
+            session.commit()
+        element_identifiers = [{"src": "hda", "name": f"element {i}", "id": hda_id} for i, hda_id in enumerate(hda_ids)]
+        history_id, user_id = history.id, trans.user.id
+        # start from an empty session, as a new request would
+        session.expunge_all()
+        trans.set_user(session.get(model.User, user_id))
+        trans.set_history(session.get(model.History, history_id))
+        statements.clear()
+        start = time.perf_counter()
+        collection_manager.create(
+            trans,
+            trans.history,
+            f"list of {size}",
+            "list",
+            element_identifiers=element_identifiers,
+            copy_elements=args.copy_elements,
+            hide_source_items=args.hide_source_items,
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{size} elements: {elapsed:.2f}s, {len(statements)} SQL statements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Time setting metadata on large synthetic tabular files.
+
+Writes a tab separated file of about --size megabytes (mixing int, float, list
+and str columns, comment and blank lines) and reports the wall time and
+throughput of Text.count_data_lines and Tabular.set_meta, the latter both
+with the default max_data_lines and reading the whole file.
+
+% python test/manual/tabular_set_meta_scaling.py --size 2048 4096
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib"), os.path.join(galaxy_root, "test")]
+
+from unit.data.datatypes.util import MockDataset
+
+from galaxy.datatypes.data import Text
+from galaxy.datatypes.tabular import Tabular
+
+DESCRIPTION = "Script to time Tabular.set_meta on large synthetic tabular files."
+
+
+def write_tabular(path, size):
+    rng = random.Random(size)
+    lines = ["#chrom\tstart\tend\tname\tscore\tstrand\tblocks\n"]
+    for i in range(10000):
+        start = rng.randint(0, 10**8)
+        score = f"{rng.random():.4f}" if i % 1000 else "NA"
+        blocks = ",".join(str(rng.randint(1, 500)) for _ in range(rng.randint(1, 4)))
+        lines.append(f"chr{rng.randint(1, 22)}\t{start}\t{start + 500}\tfeature_{i}\t{score}\t+\t{blocks}\n")
+        if i % 2500 == 0:
+            lines.append("\n")
+    chunk = "".join(lines[1:]).encode()
+    with open(path, "wb") as fh:
+        fh.write(lines[0].encode())
+        while fh.tell() < size:
+            fh.write(chunk)
+
+
+def time_call(label, size, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label}: {elapsed:.2f}s ({size / elapsed / 2**20:.0f} MB/s)")
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--size", type=int, nargs="+", default=[2048], help="file sizes in megabytes")
+    args = arg_parser.parse_args(argv)
+
+    for size_mb in args.size:
+        size = size_mb * 2**20
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "data.tabular")
+            write_tabular(path, size)
+            dataset = MockDataset(id=1)
+            dataset.set_file_name(path)
+            print(f"{size_mb} MB:")
+            time_call("count_data_lines", size, lambda: Text().count_data_lines(dataset))
+            time_call("set_meta", size, lambda: Tabular().set_meta(dataset))
+            time_call("set_meta (all lines)", size, lambda: Tabular().set_meta(dataset, max_data_lines=None))
+            print(f"  {dataset.metadata.data_lines} data lines, column types {dataset.metadata.column_types}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from galaxy.jobs.dependency_index import JobDependencyIndex
+
+
+def test_job_without_blocking_datasets_is_ready():
+    index = JobDependencyIndex()
+    index.add_job(1)
+    assert 1 in index
+    assert index.ready_job_ids == {1}
+    assert not index.blocking_dataset_ids
+
+
+def test_job_ready_once_all_inputs_changed():
+    index = JobDependencyIndex()
+    index.add_job(1, [10, 11])
+    index.add_job(2, [11])
+    assert index.ready_job_ids == set()
+    assert index.blocking_dataset_ids == {10, 11}
+    assert index.datasets_changed([11]) == {2}
+    assert index.ready_job_ids == {2}
+    assert index.blocking_dataset_ids == {10}
+    assert index.datasets_changed([10]) == {1}
+    assert index.ready_job_ids == {1, 2}
+    assert not index.blocking_dataset_ids
+
+
+def test_untracked_dataset_change_is_ignored():
+    index = JobDependencyIndex()
+    index.add_job(1, [10])
+    assert index.datasets_changed([12]) == set()
+    assert index.ready_job_ids == set()
+
+
+def test_remove_jobs():
+    index = JobDependencyIndex()
+    index.add_job(1, [10])
+    index.add_job(2)
+    index.add_job(3, [10, 11])
+    index.remove_jobs([1, 2])
+    assert index.job_ids == {3}
+    assert index.blocking_dataset_ids == {10, 11}
+    index.remove_jobs([3])
+    assert len(index) == 0
+    assert not index.blocking_dataset_ids
+
+
+def test_add_job_replaces_previous_entry():
+    index = JobDependencyIndex()
+    index.add_job(1, [10])
+    index.add_job(1, [11])
+    assert index.blocking_dataset_ids == {11}
+    assert index.datasets_changed([10]) == set()
+    assert index.datasets_changed([11]) == {1}
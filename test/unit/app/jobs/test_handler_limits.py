@@ -0,0 +1,227 @@
+import datetime
+
+from galaxy import model
+from galaxy.jobs.handler import (
+    JOB_READY,
+    JOB_WAIT,
+    JobHandlerQueue,
+)
+from galaxy.model import mapping
+from galaxy.model.base import transaction
+from galaxy.util import bunch
+
+
+def test_prefetched_user_job_counts():
+    app = MockApp(registered_user_concurrent_jobs=5)
+    user = model.User(email="u1@example.com", password="password")
+    other_user = model.User(email="u2@example.com", password="password")
+    app.add(
+        __new_job(user=user, state="running", destination_id="cluster1"),
+        __new_job(user=user, state="queued", destination_id="cluster1"),
+        __new_job(user=user, state="queued", destination_id="local"),
+        __new_job(user=user, state="queued"),
+        __new_job(user=user, state="ok", destination_id="local"),
+        __new_job(user=other_user, state="running", destination_id="local"),
+    )
+    new_job = __new_job(user=user, state="new")
+    app.add(new_job)
+    queue = __queue(app)
+    queue._JobHandlerQueue__prefetch_job_readiness([new_job])
+    assert queue.prefetched_user_job_count == {user.id: 4}
+    assert queue.get_user_job_count(user.id) == 4
+    # jobs without a destination are not counted towards any destination
+    assert queue.get_user_job_count_per_destination(user.id) == {"cluster1": 2, "local": 1, None: 0}
+    queue.increase_running_job_count(user.id, "local")
+    assert queue.get_user_job_count(user.id) == 5
+    assert queue.get_user_job_count_per_destination(user.id)["local"] == 2
+    assert queue._JobHandlerQueue__check_user_jobs(new_job, __job_wrapper("local")) == JOB_WAIT
+
+
+def test_destination_user_concurrent_jobs():
+    app = MockApp(destination_user_concurrent_jobs={"local": 2})
+    user = model.User(email="u1@example.com", password="password")
+    app.add(__new_job(user=user, state="running", destination_id="local"))
+    jobs = [__new_job(user=user, state="new") for _ in range(2)]
+    app.add(*jobs)
+    queue = __queue(app)
+    queue._JobHandlerQueue__prefetch_job_readiness(jobs)
+    job_wrapper = __job_wrapper("local")
+    assert queue._JobHandlerQueue__check_user_jobs(jobs[0], job_wrapper) == JOB_READY
+    queue.increase_running_job_count(user.id, "local")
+    assert queue._JobHandlerQueue__check_user_jobs(jobs[1], job_wrapper) == JOB_WAIT
+    assert queue._JobHandlerQueue__check_user_jobs(jobs[1], __job_wrapper("cluster1")) == JOB_READY
+
+
+def test_anonymous_user_concurrent_jobs():
+    app = MockApp(anonymous_user_concurrent_jobs=2)
+    galaxy_session = model.GalaxySession()
+    other_session = model.GalaxySession()
+    app.add(
+        __new_job(galaxy_session=galaxy_session, state="running", destination_id="local"),
+        __new_job(galaxy_session=other_session, state="running", destination_id="local"),
+    )
+    jobs = [__new_job(galaxy_session=galaxy_session, state="new") for _ in range(2)]
+    other_job = __new_job(galaxy_session=other_session, state="new")
+    app.add(*jobs, other_job)
+    queue = __queue(app)
+    queue._JobHandlerQueue__prefetch_job_readiness(jobs + [other_job])
+    job_wrapper = __job_wrapper("local")
+    assert queue._JobHandlerQueue__check_user_jobs(jobs[0], job_wrapper) == JOB_READY
+    # a job dispatched in this iteration counts towards the limit of its session
+    queue.increase_running_job_count(None, "local", session_id=galaxy_session.id)
+    assert queue._JobHandlerQueue__check_user_jobs(jobs[1], job_wrapper) == JOB_WAIT
+    assert queue._JobHandlerQueue__check_user_jobs(other_job, job_wrapper) == JOB_READY
+
+
+def test_total_walltime_spent():
+    app = MockApp()
+    app.job_config.limits.total_walltime.update(window=30, delta=datetime.timedelta(hours=1))
+    user = model.User(email="u1@example.com", password="password")
+    galaxy_session = model.GalaxySession()
+    anonymous_session = model.GalaxySession()
+    app.add(user, galaxy_session, anonymous_session)
+    # a job of a registered user also references the user's session
+    __add_finished_job(app, datetime.timedelta(minutes=20), user=user, galaxy_session=galaxy_session)
+    __add_finished_job(app, datetime.timedelta(minutes=5), galaxy_session=anonymous_session)
+    jobs = [
+        __new_job(user=user, galaxy_session=galaxy_session, state="new"),
+        __new_job(galaxy_session=galaxy_session, state="new"),
+        __new_job(galaxy_session=anonymous_session, state="new"),
+    ]
+    app.add(*jobs)
+    queue = __queue(app)
+    queue._JobHandlerQueue__prefetch_job_readiness(jobs)
+    assert queue.total_walltime_spent == {
+        ("user", user.id): datetime.timedelta(minutes=20),
+        ("session", galaxy_session.id): datetime.timedelta(0),
+        ("session", anonymous_session.id): datetime.timedelta(minutes=5),
+    }
+    # computed on demand without prefetching
+    queue = __queue(app)
+    assert queue._JobHandlerQueue__get_total_walltime_spent(jobs[1]) == datetime.timedelta(0)
+    assert queue._JobHandlerQueue__get_total_walltime_spent(jobs[0]) == datetime.timedelta(minutes=20)
+
+
+def test_incremental_ready_jobs():
+    app = MockApp(job_config={"handler_incremental_ready_check": True, "handler_ready_reconcile_interval": 3600})
+    user = model.User(email="u1@example.com", password="password")
+    hda = __new_hda(state="queued")
+    job = __new_job(user=user, state="new", handler="handler0")
+    job.add_input_dataset("input1", hda)
+    app.add(job)
+    queue = __queue(app)
+    assert queue._JobHandlerQueue__get_ready_jobs_incremental() == []
+    # the job becomes ready once its input is ok
+    hda.dataset.state = "ok"
+    app.add(hda)
+    assert [j.id for j in queue._JobHandlerQueue__get_ready_jobs_incremental()] == [job.id]
+
+
+def test_incremental_ready_jobs_reconcile():
+    app = MockApp(job_config={"handler_incremental_ready_check": True, "handler_ready_reconcile_interval": 3600})
+    user = model.User(email="u1@example.com", password="password")
+    job = __new_job(user=user, state="new", handler="handler0")
+    job_to_input = model.JobToInputDatasetAssociation("input1", __new_hda(state="queued"))
+    job.input_datasets.append(job_to_input)
+    app.add(job)
+    queue = __queue(app)
+    assert queue._JobHandlerQueue__get_ready_jobs_incremental() == []
+    # the index doesn't notice the input being replaced until it is rebuilt
+    job_to_input.dataset = __new_hda(state="ok")
+    app.add(job_to_input)
+    assert queue._JobHandlerQueue__get_ready_jobs_incremental() == []
+    queue._last_ready_reconcile -= 3600
+    assert [j.id for j in queue._JobHandlerQueue__get_ready_jobs_incremental()] == [job.id]
+
+
+def test_incremental_ready_jobs_window():
+    app = MockApp(
+        job_config={"handler_incremental_ready_check": True, "handler_ready_window_size": 2},
+        registered_user_concurrent_jobs=1,
+    )
+    user = model.User(email="u1@example.com", password="password")
+    other_user = model.User(email="u2@example.com", password="password")
+    galaxy_session = model.GalaxySession()
+    jobs = [__new_job(user=user, state="new", handler="handler0") for _ in range(3)]
+    other_jobs = [
+        __new_job(user=other_user, state="new", handler="handler0"),
+        __new_job(galaxy_session=galaxy_session, state="new", handler="handler0"),
+        __new_job(user=other_user, state="new", handler="other_handler"),
+    ]
+    app.add(*jobs, *other_jobs)
+    queue = __queue(app)
+    expected = [jobs[0].id, jobs[1].id, other_jobs[0].id, other_jobs[1].id]
+    assert [j.id for j in queue._JobHandlerQueue__get_ready_jobs_incremental()] == expected
+    # jobs held back by limits stay ready, the window still only includes the first jobs of each owner
+    assert [j.id for j in queue._JobHandlerQueue__get_ready_jobs_incremental()] == expected
+    jobs[0].state = "queued"
+    app.add(jobs[0])
+    expected = [jobs[1].id, jobs[2].id, other_jobs[0].id, other_jobs[1].id]
+    assert [j.id for j in queue._JobHandlerQueue__get_ready_jobs_incremental()] == expected
+
+
+def __add_finished_job(app, walltime, **kwds):
+    job = __new_job(state="running", **kwds)
+    app.add(job)
+    finished = datetime.datetime.now()
+    running_state = model.JobStateHistory(job)
+    running_state.create_time = finished - walltime
+    job.state = "ok"
+    ok_state = model.JobStateHistory(job)
+    ok_state.create_time = finished
+    app.add(running_state, ok_state)
+
+
+def __new_job(**kwds):
+    job = model.Job()
+    for key, value in kwds.items():
+        setattr(job, key, value)
+    return job
+
+
+def __new_hda(state):
+    hda = model.HistoryDatasetAssociation(create_dataset=True, flush=False)
+    hda.dataset.state = state
+    return hda
+
+
+def __job_wrapper(destination_id):
+    return bunch.Bunch(job_destination=bunch.Bunch(id=destination_id, tags=None))
+
+
+def __queue(app):
+    return JobHandlerQueue(app, None)
+
+
+class MockApp:
+    def __init__(self, job_config=None, **limits):
+        self.config = bunch.Bunch(
+            server_name="handler0",
+            user_activation_on=False,
+            track_jobs_in_database=True,
+            cache_user_job_count=False,
+            monitor_thread_join_timeout=0,
+        )
+        self.job_config = bunch.Bunch(
+            limits=bunch.Bunch(
+                registered_user_concurrent_jobs=None,
+                anonymous_user_concurrent_jobs=None,
+                total_walltime={},
+                destination_user_concurrent_jobs={},
+                destination_total_concurrent_jobs={},
+            ),
+            handler_incremental_ready_check=False,
+            handler_ready_window_size=100,
+            handler_ready_reconcile_interval=0,
+            handler_assignment_methods=None,
+        )
+        self.job_config.__dict__.update(job_config or {})
+        self.job_config.limits.__dict__.update(limits)
+        self.model = mapping.init("/tmp", "sqlite:///:memory:", create_tables=True)
+
+    def add(self, *args):
+        for arg in args:
+            self.model.context.add(arg)
+        session = self.model.context
+        with transaction(session):
+            session.commit()
@@ -0,0 +1,98 @@
+import queue
+import time
+
+from galaxy.jobs.runners.util.pykube_util import KubernetesObjectCache
+from galaxy.util import bunch
+
+
+def _obj(name, resource_version, job_name=None):
+    labels = {"job-name": job_name} if job_name else {}
+    return {"metadata": {"name": name, "resourceVersion": resource_version, "labels": labels}}
+
+
+class StubApiServer:
+    """Serves list and watch requests for one kind of object from a script of events."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.events: "queue.Queue" = queue.Queue()
+        self.list_calls = 0
+        self.watch_calls = []
+
+    def send(self, type, obj):
+        self.events.put(bunch.Bunch(type=type, object=bunch.Bunch(obj=obj)))
+
+
+class StubQuery:
+    def __init__(self, server, filter_kwds):
+        self.server = server
+        self.filter_kwds = filter_kwds
+
+    @property
+    def response(self):
+        self.server.list_calls += 1
+        return {"metadata": {"resourceVersion": "1"}, "items": list(self.server.objects)}
+
+    def watch(self, since=None):
+        self.server.watch_calls.append(since)
+        while True:
+            event = self.server.events.get()
+            if event is None:
+                return
+            yield event
+
+
+class StubObjectClass:
+    __name__ = "Pod"
+
+    def __init__(self, server):
+        self.server = server
+
+    def objects(self, api):
+        return bunch.Bunch(filter=lambda **kwds: StubQuery(self.server, kwds))
+
+
+def _wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_object_cache_list_and_watch():
+    server = StubApiServer([_obj("pod-a", "1", job_name="job-a")])
+    cache = KubernetesObjectCache(
+        None,
+        StubObjectClass(server),
+        namespace="default",
+        selector="app.kubernetes.io/managed-by=galaxy",
+        key=lambda obj: obj["metadata"]["labels"].get("job-name"),
+        retry_interval=0,
+    )
+    assert cache.get("job-a") is None
+    cache.start()
+    try:
+        assert cache.synced.wait(5)
+        assert [pod["metadata"]["name"] for pod in cache.get("job-a")] == ["pod-a"]
+        assert cache.get("job-b") == []
+
+        server.send("ADDED", _obj("pod-b", "2", job_name="job-b"))
+        _wait_for(lambda: cache.get("job-b"))
+        server.send("MODIFIED", _obj("pod-a", "3", job_name="job-a"))
+        server.send("DELETED", _obj("pod-b", "4", job_name="job-b"))
+        _wait_for(lambda: not cache.get("job-b"))
+        assert cache.get("job-a")[0]["metadata"]["resourceVersion"] == "3"
+
+        # stream closed by the server, watch is resumed from the last version seen
+        server.events.put(None)
+        _wait_for(lambda: len(server.watch_calls) == 2)
+        assert server.watch_calls == ["1", "4"]
+        assert server.list_calls == 1
+
+        # expired resource version, relist
+        server.send("ERROR", {"kind": "Status", "code": 410})
+        _wait_for(lambda: server.list_calls == 2)
+    finally:
+        cache.shutdown()
+        server.events.put(None)
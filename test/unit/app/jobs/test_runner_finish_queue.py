@@ -0,0 +1,50 @@
+import threading
+
+from galaxy.app_unittest_utils.galaxy_mock import MockApp
+from galaxy.jobs.runners import (
+    AsynchronousJobRunner,
+    BaseJobRunner,
+)
+from galaxy.util import bunch
+
+
+class RecordingJobRunner(AsynchronousJobRunner):
+    runner_name = "RecordingRunner"
+
+    def __init__(self, app, nworkers, **kwargs):
+        super().__init__(app, nworkers, **kwargs)
+        self.finished = threading.Event()
+        self.finish_thread_name = None
+
+    def finish_job(self, job_state):
+        self.finish_thread_name = threading.current_thread().name
+        self.finished.set()
+
+
+def _job_state():
+    return bunch.Bunch(job_wrapper=bunch.Bunch(get_id_tag=lambda: "1", _job_io=None))
+
+
+def _finish_thread_name(**kwargs):
+    app = MockApp()
+    app.config.monitor_thread_join_timeout = 0
+    runner = RecordingJobRunner(app, 1, **kwargs)
+    runner._init_worker_threads()
+    try:
+        runner.mark_as_finished(_job_state())
+        assert runner.finished.wait(10)
+        return runner.finish_thread_name
+    finally:
+        # stop worker threads only, the monitor thread is never started
+        BaseJobRunner.shutdown(runner)
+
+
+def test_finish_on_work_threads_by_default():
+    assert _finish_thread_name() == "RecordingRunner.work_thread-0"
+
+
+def test_finish_on_finish_threads():
+    assert _finish_thread_name(finish_workers=2, finish_queue_size=4) in (
+        "RecordingRunner.finish_thread-0",
+        "RecordingRunner.finish_thread-1",
+    )
@@ -0,0 +1,135 @@
+from galaxy.jobs.runners import slurm
+from galaxy.util import (
+    bunch,
+    commands,
+)
+
+
+class FakeSqueue:
+    """Stand-in for squeue that knows the state of a fixed set of jobs."""
+
+    def __init__(self, states):
+        self.states = states
+        self.calls = []
+
+    def execute(self, cmd):
+        self.calls.append(cmd)
+        assert cmd[0] == "squeue"
+        job_ids = cmd[cmd.index("-j") + 1].split(",")
+        lines = [f"{job_id} {self.states[job_id]}" for job_id in job_ids if job_id in self.states]
+        if not lines:
+            raise commands.CommandLineException(cmd, "", "slurm_load_jobs error: Invalid job id specified\n", 1)
+        if "-M" in cmd:
+            lines.insert(0, f"CLUSTER: {cmd[cmd.index('-M') + 1]}")
+        return "\n".join(lines)
+
+
+def test_get_slurm_job_states(monkeypatch):
+    fake_squeue = FakeSqueue({str(i): "RUNNING" if i % 2 else "PENDING" for i in range(2500)})
+    monkeypatch.setattr(commands, "execute", fake_squeue.execute)
+    job_ids = [str(i) for i in range(2600)]
+    states = slurm.get_slurm_job_states(job_ids)
+    assert len(fake_squeue.calls) == 3
+    assert len(states) == 2500
+    assert states["1"] == "RUNNING"
+    assert states["2"] == "PENDING"
+    assert "2500" not in states
+
+
+def test_get_slurm_job_states_clusters(monkeypatch):
+    fake_squeue = FakeSqueue({"1": "COMPLETED", "2": "CANCELLED+"})
+    monkeypatch.setattr(commands, "execute", fake_squeue.execute)
+    states = slurm.get_slurm_job_states(["1", "2.other", "3.other"])
+    assert states == {"1": "COMPLETED", "2.other": "CANCELLED"}
+    assert len(fake_squeue.calls) == 2
+    assert fake_squeue.calls[1][-4:] == ["-M", "other", "-j", "2,3"]
+
+
+def test_get_slurm_job_states_unknown_jobs(monkeypatch):
+    fake_squeue = FakeSqueue({})
+    monkeypatch.setattr(commands, "execute", fake_squeue.execute)
+    assert slurm.get_slurm_job_states(["1", "2"]) == {}
+
+
+class FakeJobState:
+    QUEUED_ACTIVE = "queued_active"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class FakeDrmaaSession:
+    def __init__(self, states):
+        self.states = states
+        self.calls = []
+
+    def job_status(self, external_job_id):
+        self.calls.append(external_job_id)
+        return self.states[external_job_id]
+
+
+def _slurm_runner(batch_state_check=True, drmaa_states=None):
+    # DRMAAJobRunner.__init__ requires the drmaa library and a DRMAA session
+    runner = object.__new__(slurm.SlurmJobRunner)
+    runner.runner_params = bunch.Bunch(batch_state_check=batch_state_check)
+    runner.drmaa_job_states = FakeJobState
+    runner.ds = FakeDrmaaSession(drmaa_states or {})
+    runner._batch_job_states = {}
+    return runner
+
+
+def _watched(job_id):
+    return bunch.Bunch(job_id=job_id, job_wrapper=bunch.Bunch(get_id_tag=lambda: f"galaxy_{job_id}"))
+
+
+def test_get_job_states(monkeypatch):
+    fake_squeue = FakeSqueue(
+        {
+            "1": "PENDING",
+            "2": "REQUEUED",
+            "3": "RUNNING",
+            "4": "COMPLETING",
+            "5": "COMPLETED",
+            "6": "FAILED",
+            "7": "CANCELLED",
+            "8": "TIMEOUT",
+            "9": "OUT_OF_MEMORY",
+            "10": "SUSPENDED",
+        }
+    )
+    monkeypatch.setattr(commands, "execute", fake_squeue.execute)
+    runner = _slurm_runner()
+    watched = [_watched(str(i)) for i in range(1, 12)]
+    assert runner.get_job_states(watched) == {
+        "1": FakeJobState.QUEUED_ACTIVE,
+        "2": FakeJobState.QUEUED_ACTIVE,
+        "3": FakeJobState.RUNNING,
+        "4": FakeJobState.RUNNING,
+        "5": FakeJobState.DONE,
+        "6": FakeJobState.DONE,
+        "7": FakeJobState.FAILED,
+        "8": FakeJobState.FAILED,
+        "9": FakeJobState.FAILED,
+        # suspended jobs and jobs unknown to squeue are checked through DRMAA
+    }
+    assert len(fake_squeue.calls) == 1
+
+
+def test_get_job_states_disabled(monkeypatch):
+    fake_squeue = FakeSqueue({"1": "RUNNING"})
+    monkeypatch.setattr(commands, "execute", fake_squeue.execute)
+    assert _slurm_runner(batch_state_check=False).get_job_states([_watched("1")]) == {}
+    assert _slurm_runner().get_job_states([]) == {}
+    assert not fake_squeue.calls
+
+
+def test_check_watched_item_uses_batched_states():
+    runner = _slurm_runner(drmaa_states={"2": FakeJobState.DONE})
+    runner._batch_job_states = {"1": FakeJobState.RUNNING}
+    new_watched = []
+    assert runner.check_watched_item(_watched("1"), new_watched) == FakeJobState.RUNNING
+    assert not runner.ds.calls
+    # jobs missing from the batched states are checked individually
+    assert runner.check_watched_item(_watched("2"), new_watched) == FakeJobState.DONE
+    assert runner.ds.calls == ["2"]
+    assert not new_watched
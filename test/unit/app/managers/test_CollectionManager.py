@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 """
 """
-from galaxy import model
+from galaxy import (
+    exceptions,
+    model,
+)
 from galaxy.managers.collections import DatasetCollectionManager
 from galaxy.managers.datasets import DatasetManager
 from galaxy.managers.hdas import HDAManager
@@ -79,6 +82,56 @@ class TestDatasetCollectionManager(BaseTestCase, CreatesCollectionsMixin):
         hdca2 = self.collection_manager.create(self.trans, history, "test collection 2", "list", elements=elements)
         assert isinstance(hdca2, model.HistoryDatasetCollectionAssociation)
 
+    def test_create_list_copying_elements(self):
+        owner = self.user_manager.create(**user2_data)
+        self.trans.set_user(owner)
+        history = self.history_manager.create(name="history1", user=owner)
+        self.trans.set_history(history)
+        hdas = [
+            self.hda_manager.create(name=name, history=history, dataset=self.dataset_manager.create())
+            for name in ("one", "two", "three")
+        ]
+        self.trans.tag_handler.apply_item_tags(user=owner, item=hdas[0], tags_str="name:one")
+        self.hda_manager.annotate(hdas[1], "annotation two", user=owner)
+
+        self.log("should copy the elements, with their tags and annotations, and hide the sources")
+        element_identifiers = self.build_element_identifiers(hdas)
+        hdca = self.collection_manager.create(
+            self.trans,
+            history,
+            "copied collection",
+            "list",
+            element_identifiers=element_identifiers,
+            copy_elements=True,
+            hide_source_items=True,
+        )
+        copies = [element.element_object for element in hdca.collection.elements]
+        assert [copy.name for copy in copies] == ["one", "two", "three"]
+        assert [copy.copied_from_history_dataset_association for copy in copies] == hdas
+        assert copies[0].make_tag_string_list() == ["name:one"]
+        assert self.hda_manager.annotation(copies[1]) == "annotation two"
+        assert not any(hda.visible for hda in hdas)
+
+        self.log("should raise if an element id does not exist")
+        element_identifiers = self.build_element_identifiers(hdas) + [dict(src="hda", name="missing", id=-1)]
+        with self.assertRaises(exceptions.ObjectNotFound):
+            self.collection_manager.create(
+                self.trans, history, "missing", "list", element_identifiers=element_identifiers, copy_elements=True
+            )
+
+        self.log("should raise if an element is not accessible to the user")
+        other_user = self.user_manager.create(**user3_data)
+        other_history = self.history_manager.create(name="history2", user=other_user)
+        private_hda = self.hda_manager.create(
+            name="private", history=other_history, dataset=self.dataset_manager.create()
+        )
+        self.dataset_manager.permissions.set_private_to_one_user(private_hda.dataset, other_user)
+        element_identifiers = self.build_element_identifiers(hdas + [private_hda])
+        with self.assertRaises(exceptions.ItemAccessibilityException):
+            self.collection_manager.create(
+                self.trans, history, "inaccessible", "list", element_identifiers=element_identifiers, copy_elements=True
+            )
+
     def test_update_from_dict(self):
         owner = self.user_manager.create(**user2_data)
         self.trans.set_user(owner)
@@ -1,6 +1,7 @@
 """
 """
 
+import tempfile
 from unittest import mock
 
 import sqlalchemy
@@ -17,6 +18,12 @@ from galaxy.managers.datasets import (
     DatasetSerializer,
 )
 from galaxy.managers.roles import RoleManager
+from galaxy.schema.tasks import ComputeDatasetHashesTaskRequest
+from galaxy.util.hash_util import (
+    HashFunctionNameEnum,
+    md5,
+    sha256,
+)
 from .base import BaseTestCase
 
 # =============================================================================
@@ -96,6 +103,43 @@ class TestDatasetManager(BaseTestCase):
             self.dataset_manager.purge(item1)
         assert not item1.purged
 
+    def test_compute_hashes(self):
+        dataset = self.dataset_manager.create()
+        object_store = self.app.object_store
+        contents = {None: b"primary contents", "nested/extra.txt": b"extra contents"}
+        for extra_files_path, content in contents.items():
+            with tempfile.NamedTemporaryFile() as f:
+                f.write(content)
+                f.flush()
+                if extra_files_path is None:
+                    object_store.update_from_file(dataset, file_name=f.name, create=True)
+                else:
+                    object_store.update_from_file(
+                        dataset,
+                        extra_dir=dataset.extra_files_path_name,
+                        alt_name=extra_files_path,
+                        file_name=f.name,
+                        create=True,
+                    )
+        hash_functions = [HashFunctionNameEnum.md5, HashFunctionNameEnum.sha256]
+        request = ComputeDatasetHashesTaskRequest(dataset_id=dataset.id, hash_functions=hash_functions)
+        self.dataset_manager.compute_hashes(request)
+        self.trans.sa_session.refresh(dataset)
+        hashes = {(h.extra_files_path, h.hash_function): h.hash_value for h in dataset.hashes}
+        assert hashes == {
+            (extra_files_path, hash_function): hash_func(content).hexdigest()
+            for extra_files_path, content in contents.items()
+            for hash_function, hash_func in zip(hash_functions, (md5, sha256))
+        }
+
+        self.log("should not record a hash twice and may skip extra files")
+        request = ComputeDatasetHashesTaskRequest(
+            dataset_id=dataset.id, hash_functions=[HashFunctionNameEnum.md5], include_extra_files=False
+        )
+        self.dataset_manager.compute_hashes(request)
+        self.trans.sa_session.refresh(dataset)
+        assert len(dataset.hashes) == 4
+
     def test_create_with_no_permissions(self):
         self.log("should be able to create a new Dataset without any permissions")
         dataset = self.dataset_manager.create()
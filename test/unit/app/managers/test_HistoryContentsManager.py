@@ -11,6 +11,10 @@ from sqlalchemy import (
     true,
 )
 
+from galaxy import (
+    exceptions,
+    model,
+)
 from galaxy.managers import (
     base,
     collections,
@@ -19,6 +23,12 @@ from galaxy.managers import (
 )
 from galaxy.managers.histories import HistoryManager
 from galaxy.model.base import transaction
+from galaxy.objectstore import BaseObjectStore
+from galaxy.schema import SerializationParams
+from galaxy.webapps.galaxy.services.history_contents import (
+    HistoriesContentsService,
+    PROJECTED_CONTENT_KEYS,
+)
 from .base import (
     BaseTestCase,
     CreatesCollectionsMixin,
@@ -106,6 +116,39 @@ class TestHistoryAsContainer(HistoryAsContainerBaseTestCase):
         assert self.contents_manager.contents(history, limit=0) == []
         assert self.contents_manager.contents(history, offset=len(contents)) == []
 
+    def test_keyset_pagination(self):
+        user2 = self.user_manager.create(**user2_data)
+        self.trans.set_user(user2)
+        history = self.history_manager.create(name="history", user=user2)
+        contents = []
+        contents.extend([self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(3)])
+        contents.append(self.add_list_collection_to_history(history, contents[:3]))
+        contents.extend([self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(4, 6)])
+        contents.append(self.add_list_collection_to_history(history, contents[4:6]))
+
+        def keyset(content):
+            return self.contents_manager.keyset_for(history, content.history_content_type, content.id)
+
+        self.log("should be able to page through contents after a given item")
+        pages = []
+        after = None
+        while page := self.contents_manager.contents(history, limit=3, after=after):
+            pages.append(page)
+            after = keyset(page[-1])
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [content for page in pages for content in page] == contents
+
+        self.log("should be able to page in descending order")
+        after = keyset(contents[4])
+        assert self.contents_manager.contents(history, after=after, descending=True) == contents[3::-1]
+        assert self.contents_manager.contents(history, limit=1, after=after, descending=True) == [contents[3]]
+
+        self.log("should be able to project rows instead of loading models")
+        rows = self.contents_manager.contents(history, after=keyset(contents[2]), expand_models=False)
+        assert [(row.history_content_type, row.id) for row in rows] == [
+            (content.history_content_type, content.id) for content in contents[3:]
+        ]
+
     def test_orm_filtering(self):
         parse_filter = self.history_contents_filters.parse_filter
         user2 = self.user_manager.create(**user2_data)
@@ -370,3 +413,50 @@ class TestHistoryContentsFilterParser(HistoryAsContainerBaseTestCase):
             self.filter_parser.parse_date("2009-02-13 18:13:00.")
         with self.assertRaises(ValueError):
             self.filter_parser.parse_date("2009-02-13 18:13:00.1234567")
+
+    def test_decode_type_id(self):
+        encoded_id = self.app.security.encode_id(1)
+        assert self.filter_parser.decode_type_id(f"dataset-{encoded_id}") == "dataset-1"
+        assert self.filter_parser.parse_type_id_list(f"dataset-{encoded_id},dataset_collection-{encoded_id}") == [
+            "dataset-1",
+            "dataset_collection-1",
+        ]
+
+        self.log("should error if the type or id is missing")
+        for type_id in (encoded_id, "dataset-", f"-{encoded_id}", ""):
+            with self.assertRaises(exceptions.RequestParameterInvalidException):
+                self.filter_parser.decode_type_id(type_id)
+
+
+class TestHistoryContentsService(HistoryAsContainerBaseTestCase):
+    def set_up_managers(self):
+        super().set_up_managers()
+        self.app[BaseObjectStore] = self.app.object_store
+        # genomes aren't used to serialize contents
+        self.app.genomes = None
+        self.service = self.app[HistoriesContentsService]
+
+    def test_serialize_content_row(self):
+        user2 = self.user_manager.create(**user2_data)
+        self.trans.set_user(user2)
+        history = self.history_manager.create(name="history", user=user2)
+        hdas = [self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(2)]
+        hdas[1].visible = False
+        hdas[1].state = model.Dataset.states.FAILED_METADATA
+        self.add_list_collection_to_history(history, hdas)
+        session = self.trans.sa_session
+        with transaction(session):
+            session.commit()
+
+        keys = sorted(PROJECTED_CONTENT_KEYS)
+        serialization_params = SerializationParams(keys=keys)
+        rows = self.contents_manager.contents(history, expand_models=False)
+        contents = self.contents_manager.contents(history)
+        assert len(rows) == len(contents) == 3
+        for row, content in zip(rows, contents):
+            item = self.service._serialize_content_item(
+                self.trans, content, dataset_details=None, serialization_params=serialization_params
+            )
+            row_item = self.service._serialize_content_row(row, keys)
+            assert row_item == {key: item[key] for key in keys if key in item}
+        assert self.service._serialize_content_row(rows[1], ["state"]) == {"state": "failed_metadata"}
@@ -15,7 +15,11 @@ from galaxy.tools.actions import (
     DefaultToolAction,
     determine_output_format,
 )
-from galaxy.tools.execution_helpers import on_text_for_names
+from galaxy.tools.execution_helpers import (
+    BulkJobRecords,
+    on_text_for_names,
+    ToolExecutionCache,
+)
 from galaxy.util import XML
 from galaxy.util.unittest import TestCase
 
@@ -115,6 +119,25 @@ class TestDefaultToolAction(TestCase, tools_support.UsesTools):
         # Again this is a stupid way to ensure data parameters are wrapped.
         assert output["out1"].name == f"Output ({hda1.dataset.get_file_name()})"
 
+    def test_bulk_job_records(self):
+        job, _ = self._simple_execute()
+        bulk_records = BulkJobRecords()
+        execution_cache = ToolExecutionCache(self.trans)
+        execution_cache.bulk_records = bulk_records
+        bulk_job, _, _ = self.action.execute(
+            tool=self.tool,
+            trans=self.trans,
+            history=self.history,
+            incoming=dict(param1="moo"),
+            execution_cache=execution_cache,
+        )
+        assert len(bulk_records.job_parameters) == 1
+        bulk_records.write(self.app.model.context, self.app.security_agent)
+        assert not bulk_records.job_parameters
+        assert bulk_job.id
+        assert {(p.name, p.value) for p in bulk_job.parameters} == {(p.name, p.value) for p in job.parameters}
+        assert bulk_job.parameters_fingerprint == job.parameters_fingerprint
+
     def test_inactive_user_job_create_failure(self):
         self.trans.user_is_active = False
         try:
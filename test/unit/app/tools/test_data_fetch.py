@@ -239,6 +239,37 @@ def test_hdca_failed_expansion():
         assert "Expected bagit.txt does not exist" in output["error_message"]
 
 
+def test_hdca_nested_elements_processes():
+    with _execute_context() as execute_context:
+        job_directory = execute_context.job_directory
+        elements = []
+        for i in range(4):
+            example_path = os.path.join(job_directory, f"example_file_{i}")
+            with open(example_path, "w") as f:
+                f.write("chr1\t1\t10\n" if i % 2 else "sample data\nhello world")
+            elements.append({"name": f"inner_{i}", "elements": [{"src": "path", "path": example_path}]})
+        elements.append({"src": "path", "path": os.path.join(job_directory, "missing_file")})
+        request = {
+            "allow_failed_collections": True,
+            "targets": [
+                {
+                    "destination": {
+                        "type": "hdca",
+                    },
+                    "elements": elements,
+                }
+            ],
+        }
+        execute_context.execute_request(request, processes=2)
+        output = _unnamed_output(execute_context)
+        elements = output["elements"]
+        assert len(elements) == 5
+        assert [element["name"] for element in elements[:4]] == [f"inner_{i}" for i in range(4)]
+        assert [element["elements"][0]["ext"] for element in elements[:4]] == ["txt", "bed", "txt", "bed"]
+        assert [element["elements"][0]["name"] for element in elements[:4]] == [f"example_file_{i}" for i in range(4)]
+        assert "error_message" in elements[4]
+
+
 @contextmanager
 def _execute_context():
     job_directory = mkdtemp()
@@ -268,11 +299,11 @@ class ExecuteContext:
         self.job_directory = directory
         self.galaxy_json_path = os.path.join(directory, "galaxy.json")
 
-    def execute_request(self, request):
+    def execute_request(self, request, processes=1):
         request_path = os.path.join(self.job_directory, "request.json")
         with open(request_path, "w") as f:
             json.dump(request, f)
-        self._execute(["--request", request_path])
+        self._execute(["--request", request_path, "--processes", str(processes)])
 
     def _execute(self, args):
         args.extend(["--working-directory", self.job_directory])
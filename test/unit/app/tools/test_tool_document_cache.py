@@ -0,0 +1,67 @@
+import os
+import time
+
+from galaxy.tool_util.parser import get_tool_source
+from galaxy.tools.cache import ToolDocumentCache
+
+TOOL_XML = """<tool id="cached_tool" name="Cached Tool" version="1.0">
+    <command>echo $input</command>
+    <inputs>
+        <param name="input" type="integer" value="1" />
+    </inputs>
+    <outputs />
+</tool>
+"""
+
+
+def _write_tool(tmp_path, name="tool.xml"):
+    tool_path = tmp_path / name
+    tool_path.write_text(TOOL_XML)
+    return str(tool_path)
+
+
+def test_set_and_persist_visible_to_other_process(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    tool_path = _write_tool(tmp_path)
+    cache = ToolDocumentCache(cache_dir)
+    other_cache = ToolDocumentCache(cache_dir)
+    cache.set(tool_path, get_tool_source(tool_path))
+    # pending documents are visible to the writer only
+    assert cache.get(tool_path)["document"]
+    assert other_cache.get(tool_path) is None
+    cache.persist()
+    tool_document = other_cache.get(tool_path)
+    assert tool_document
+    assert tool_document["paths_and_modtimes"] == {tool_path: os.path.getmtime(tool_path)}
+    cache.close()
+    other_cache.close()
+
+
+def test_modified_tool_invalidates_document(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    tool_path = _write_tool(tmp_path)
+    cache = ToolDocumentCache(cache_dir)
+    cache.set(tool_path, get_tool_source(tool_path))
+    cache.persist()
+    assert cache.get(tool_path)
+    modtime = os.path.getmtime(tool_path) + 10
+    os.utime(tool_path, (time.time(), modtime))
+    # modification times are checked once until the next persist
+    assert cache.get(tool_path)
+    cache.persist()
+    assert cache.get(tool_path) is None
+    cache.close()
+
+
+def test_delete(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    tool_path = _write_tool(tmp_path)
+    cache = ToolDocumentCache(cache_dir)
+    cache.set(tool_path, get_tool_source(tool_path))
+    cache.persist()
+    cache.delete(tool_path)
+    assert cache.get(tool_path) is None
+    cache.persist()
+    cache.reopen_ro()
+    assert cache.get(tool_path) is None
+    cache.close()
@@ -0,0 +1,89 @@
+"""
+Unit tests for line indexes.
+.. seealso:: galaxy.datatypes.dataproviders.line_index
+"""
+
+import gzip
+from types import SimpleNamespace
+
+import pytest
+
+from galaxy.datatypes.dataproviders import (
+    column,
+    dataset,
+    line,
+    line_index,
+)
+
+LINES = [f"{i}\tdata {i}\n" if i % 7 else "# comment\n" if i % 2 else "  \n" for i in range(200)]
+LINES[50] = "é\tunicode\r\n"
+LINES[51] = "\x1c\n"
+DATA_LINES = [data_line.strip() for data_line in LINES if data_line.strip() and not data_line.startswith("#")]
+
+
+def _write(path, compression):
+    content = "".join(LINES).encode()
+    if compression == "gzip":
+        content = gzip.compress(content)
+    elif compression == "bgzip":
+        # several members, as written by bgzip
+        content = b"".join(gzip.compress(content[i : i + 300]) for i in range(0, len(content), 300))
+    path.write_bytes(content)
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "bgzip"])
+def test_open_at_data_line(tmp_path, compression):
+    path = tmp_path / "data.tabular"
+    _write(path, compression)
+    index = line_index.build_line_index(str(path), interval=10)
+    assert index
+    assert index["data_lines"] == len(DATA_LINES)
+    assert len(index["checkpoints"]) == (len(DATA_LINES) - 1) // 10
+    if compression == "bgzip":
+        assert index["checkpoints"][-1][2] > 0
+    assert line_index.open_at_data_line(str(path), index, 9) is None
+    for data_line in range(10, len(DATA_LINES)):
+        reopened = line_index.open_at_data_line(str(path), index, data_line)
+        assert reopened
+        fh, skipped = reopened
+        with fh:
+            assert data_line - 10 < skipped <= data_line
+            rest = [data_line.strip() for data_line in fh if data_line.strip() and not data_line.startswith("#")]
+        assert rest == DATA_LINES[skipped:]
+
+
+def test_get_line_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(line_index, "LINE_INDEX_CACHE_SIZE", 1)
+    path = tmp_path / "data.tabular"
+    _write(path, None)
+    index = line_index.get_line_index(str(path), interval=10)
+    assert index == line_index.build_line_index(str(path), interval=10)
+    assert line_index.get_line_index(str(path), interval=10) is index
+    # rebuilt once the file changes
+    path.write_text("".join(LINES[:20]))
+    assert line_index.get_line_index(str(path), interval=10)["data_lines"] == len(DATA_LINES[:17])
+    assert len(line_index._line_index_cache) == 1
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_providers_use_line_index(tmp_path, monkeypatch, compression):
+    monkeypatch.setattr(line_index, "LINE_INDEX_INTERVAL", 10)
+    path = tmp_path / "data.tabular"
+    _write(path, compression)
+    hda = SimpleNamespace(
+        id=1,
+        datatype=SimpleNamespace(is_binary=False),
+        get_file_name=lambda: str(path),
+    )
+
+    provider = line.FilteredLineDataProvider(dataset.DatasetDataProvider(hda), offset=95, limit=5)
+    assert provider.can_use_line_index()
+    assert list(provider) == DATA_LINES[95:100]
+    assert provider.num_valid_data_read == 100
+    provider = column.ColumnarDataProvider(dataset.DatasetDataProvider(hda), offset=150, limit=2, column_count=1)
+    assert provider.can_use_line_index()
+    assert list(provider) == [[DATA_LINES[150].split("\t")[0]], [DATA_LINES[151].split("\t")[0]]]
+    # filtering providers don't count data lines and have to read from the start
+    provider = line.RegexLineDataProvider(dataset.DatasetDataProvider(hda), regex_list=["1"], offset=10, limit=2)
+    assert not provider.can_use_line_index()
+    assert list(provider) == [data_line for data_line in DATA_LINES if data_line.startswith("1")][10:12]
@@ -1,3 +1,5 @@
+import os
+
 from galaxy.datatypes import sniff
 from galaxy.datatypes.registry import example_datatype_registry_for_sample
 
@@ -114,3 +116,15 @@ def test_sniff_compressed_dynamic_datatypes_default_off():
     assert "fastq" not in sniff.guess_ext(fname, sniff_order)
     fname = sniff.get_test_fname("1.fastqsanger.bz2")
     assert "fastq" not in sniff.guess_ext(fname, sniff_order)
+
+
+def test_sniff_index_matches_sniff_order():
+    datatypes_registry = example_datatype_registry_for_sample()
+    test_data_dir = os.path.dirname(sniff.get_test_fname("1.bam"))
+    for fname in sorted(os.listdir(test_data_dir)):
+        path = os.path.join(test_data_dir, fname)
+        if not os.path.isfile(path):
+            continue
+        file_prefix = sniff.FilePrefix(path)
+        expected = sniff.guess_ext(file_prefix, datatypes_registry.sniff_order)
+        assert sniff.guess_ext(file_prefix, datatypes_registry.sniff_index) == expected, fname
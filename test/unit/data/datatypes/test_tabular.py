@@ -112,3 +112,26 @@ def test_tabular_column_types_override():
         assert dataset.metadata.columns == 6
         assert dataset.metadata.delimiter == "\t"
         assert not hasattr(dataset.metadata, "column_names")
+
+
+def test_tabular_column_types_many_lines():
+    """
+    check the types guessed for the values of whole columns at once
+    - 'na' and numbers with surrounding whitespace are floats, numbers are lists
+    - comment and empty lines (including Windows line endings) are counted between data lines
+    """
+    with tempfile.NamedTemporaryFile(mode="w", newline="") as test_file:
+        test_file.write("#header\n")
+        for i in range(1000):
+            test_file.write(f"{i}\t{i}.5\t{i},{i + 1}\tfeature_{i}\t{i}\n")
+            if i % 100 == 0:
+                test_file.write("# comment\r\n\r\n")
+        test_file.write(" 7 \tNA\t42\tinf\t1e5\n")
+        test_file.flush()
+        dataset = MockDataset(id=1)
+        dataset.set_file_name(test_file.name)
+        Tabular().set_meta(dataset)  # type: ignore [arg-type]
+        assert dataset.metadata.data_lines == 1001
+        assert dataset.metadata.comment_lines == 21
+        assert dataset.metadata.column_types == ["int", "float", "list", "str", "float"]
+        assert dataset.metadata.columns == 5
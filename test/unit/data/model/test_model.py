@@ -18,3 +18,30 @@ def test_get_uuid():
 def test_permitted_actions():
     actions = model.Dataset.permitted_actions
     assert actions and len(actions.values()) == 2
+
+
+def test_job_parameters_fingerprint():
+    parameters = [
+        ("input", '{"values": [{"id": 1, "src": "hda"}]}'),
+        ("threshold", "0.5"),
+        ("dbkey", '"hg19"'),
+        ("__workflow_invocation_uuid__", '"abc"'),
+    ]
+    fingerprint = model.job_parameters_fingerprint(parameters)
+    # ids of inputs and ignored parameters don't contribute to the fingerprint
+    assert fingerprint == model.job_parameters_fingerprint(
+        [
+            ("threshold", "0.5"),
+            ("input", '{"values": [{"src": "hda", "id": 2}]}'),
+            ("dbkey", '"hg38"'),
+        ]
+    )
+    assert fingerprint != model.job_parameters_fingerprint(parameters + [("extra", "null")])
+    assert fingerprint != model.job_parameters_fingerprint(
+        [("input", '{"values": [{"id": 1, "src": "hda"}]}'), ("threshold", "0.6")]
+    )
+    job = model.Job()
+    for name, value in parameters:
+        job.add_parameter(name, value)
+    job.set_parameters_fingerprint()
+    assert job.parameters_fingerprint == fingerprint
@@ -1,5 +1,8 @@
+import time
 import uuid
 
+from sqlalchemy import select
+
 from galaxy import model
 from galaxy.model.unittest_utils.utils import random_email
 from galaxy.objectstore import (
@@ -64,6 +67,31 @@ class TestPurgeUsage(BaseModelTestCase):
         assert usages[1].quota_source_label == "myquotalabel"
         assert usages[1].total_disk_usage == 114
 
+    def test_copy_history_usage(self):
+        model = self.model
+        d1 = self._setup_dataset()
+        d2 = self._setup_dataset()
+        d2.dataset.total_size = 20
+        purged = self._setup_dataset()
+        purged.purged = True
+        self.persist(d2, purged)
+
+        other_user = model.User(email=random_email(), password="password")
+        other_user.disk_usage = 5
+        other_history = model.History(name="History of other user", user=other_user)
+        self.persist(other_user, other_history)
+        # the other user already has the first dataset, so copying it is free
+        self.persist(model.HistoryDatasetAssociation(extension="txt", history=other_history, dataset=d1.dataset))
+
+        new_history = self.h.copy(target_user=other_user, all_datasets=True)
+        assert len(new_history.datasets) == 3
+        self.model.session.refresh(other_user)
+        assert int(other_user.disk_usage) == 25
+        # copying to the same user doesn't change usage
+        self.h.copy(target_user=self.u)
+        self.model.session.refresh(self.u)
+        assert int(self.u.disk_usage) == 25
+
 
 class TestCalculateUsage(BaseModelTestCase):
     def setUp(self):
@@ -341,6 +369,91 @@ class TestCalculateUsage(BaseModelTestCase):
         self._refresh_user_and_assert_disk_usage_is(25, "alt_source")
         self._refresh_user_and_assert_disk_usage_is(0, None)
 
+    def test_calculate_usage_several_stores_per_quota_source(self):
+        u = self.u
+
+        self._add_dataset(10)
+        self._add_dataset(15, "alt_source_store")
+        self._add_dataset(20, "other_alt_source_store")
+        self._add_dataset(40, "default_store")
+
+        quota_source_map = QuotaSourceMap(None, True)
+        alt_source = QuotaSourceMap("alt_source", True)
+        quota_source_map.backends["alt_source_store"] = alt_source
+        quota_source_map.backends["other_alt_source_store"] = alt_source
+        quota_source_map.backends["default_store"] = QuotaSourceMap(None, True)
+
+        object_store = MockObjectStore(quota_source_map)
+        u.calculate_and_set_disk_usage(object_store)
+        self._refresh_user_and_assert_disk_usage_is(50)
+        self._refresh_user_and_assert_disk_usage_is(35, "alt_source")
+        assert u.calculate_disk_usage_default_source(object_store) == 50
+
+    def test_dataset_usage_counted_once(self):
+        model = self.model
+        u = self.u
+        u.calculate_and_set_disk_usage(MockObjectStore())
+
+        d1 = model.HistoryDatasetAssociation(extension="txt", create_dataset=True, sa_session=model.session)
+        d1.dataset.total_size = 10
+        self.h.add_dataset(d1)
+        self.persist(d1)
+        h2 = model.History(name="Second usage history", user=u)
+        self.persist(h2)
+        d2 = h2.add_dataset(model.HistoryDatasetAssociation(extension="txt", dataset=d1.dataset))
+        self.persist(d2)
+        self._refresh_user_and_assert_disk_usage_is(10)
+        assert self._dataset_usage(d1.dataset) == (2, 10)
+
+        d1.purge_usage_from_quota(u, d1.dataset.quota_source_info)
+        d1.purged = True
+        self.persist(d1)
+        self._refresh_user_and_assert_disk_usage_is(10)
+        assert self._dataset_usage(d1.dataset) == (1, 10)
+
+        d2.purge_usage_from_quota(u, d2.dataset.quota_source_info)
+        d2.purged = True
+        self.persist(d2)
+        self._refresh_user_and_assert_disk_usage_is(0)
+        assert self._dataset_usage(d1.dataset) is None
+
+    def test_reconcile_changed_histories(self):
+        model = self.model
+        u = self.u
+        object_store = MockObjectStore()
+        d1 = self._add_dataset(10)
+        h2 = model.History(name="Unchanged history", user=u)
+        unchanged = model.HistoryDatasetAssociation(
+            extension="txt", history=h2, create_dataset=True, sa_session=model.session
+        )
+        unchanged.dataset.total_size = 15
+        self.persist(h2, unchanged)
+        u.reconcile_disk_usage(object_store)
+        self._refresh_user_and_assert_disk_usage_is(25)
+        time.sleep(0.01)
+
+        # changes bypassing the usage accounting are picked up for changed histories only
+        unchanged.dataset.total_size = 30
+        self.persist(unchanged.dataset)
+        d2 = self._add_dataset(20)
+        d1.purged = True
+        self.persist(d1)
+        u.reconcile_disk_usage(object_store)
+        self._refresh_user_and_assert_disk_usage_is(35)
+        assert self._dataset_usage(d1.dataset) is None
+        assert self._dataset_usage(d2.dataset) == (1, 20)
+
+        u.calculate_and_set_disk_usage(object_store)
+        self._refresh_user_and_assert_disk_usage_is(50)
+        assert self._dataset_usage(unchanged.dataset) == (1, 30)
+
+    def _dataset_usage(self, dataset):
+        stmt = select(model.UserDatasetUsage).where(
+            model.UserDatasetUsage.user_id == self.u.id, model.UserDatasetUsage.dataset_id == dataset.id
+        )
+        usage = self.model.session.scalars(stmt).one_or_none()
+        return usage and (usage.hda_count, int(usage.disk_usage))
+
     def _refresh_user_and_assert_disk_usage_is(self, usage, label=None):
         u = self.u
         self.model.context.refresh(u)
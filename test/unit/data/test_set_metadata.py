@@ -0,0 +1,148 @@
+import os
+import shutil
+
+import pytest
+
+import galaxy.datatypes.registry as registry
+from galaxy.datatypes.sniff import get_test_fname
+from galaxy.metadata import set_metadata
+from galaxy.metadata.set_metadata import (
+    can_set_outputs_meta_in_processes,
+    load_output_meta,
+    set_outputs_meta,
+)
+from galaxy.model import (
+    Dataset,
+    HistoryDatasetAssociation,
+    MetadataFile,
+    set_datatypes_registry,
+    setup_global_object_store_for_models,
+)
+from galaxy.objectstore.unittest_utils import Config as TestConfig
+
+pytestmark = pytest.mark.skipif(not can_set_outputs_meta_in_processes(), reason="requires forking worker processes")
+
+CONTENTS = {
+    "tabular": "#chrom\tstart\n" + "".join(f"chr{i}\t{i * 100}\n" for i in range(50)),
+    "bed": "".join(f"chr1\t{i}\t{i + 10}\tfeature_{i}\t0\t+\n" for i in range(20)),
+    "fasta": ">seq1\nACGT\n>seq2\nGGCC\n",
+}
+
+
+@pytest.fixture(scope="module")
+def datatypes_registry():
+    r = registry.Registry()
+    r.load_datatypes()
+    set_datatypes_registry(r)
+
+
+def _outputs(tmp_path):
+    outputs = []
+    for i, (extension, content) in enumerate(CONTENTS.items(), start=1):
+        path = tmp_path / f"output_{i}.{extension}"
+        path.write_text(content)
+        dataset = Dataset(id=-i, external_filename=str(path))
+        dataset.state = dataset.states.OK
+        outputs.append(HistoryDatasetAssociation(id=-i, dataset=dataset, extension=extension))
+    return outputs
+
+
+def _set_meta_and_peek(dataset_instance):
+    dataset_instance.datatype.set_meta(dataset_instance)
+    dataset_instance.set_peek()
+
+
+def test_set_outputs_meta(datatypes_registry, tmp_path):
+    expected = _outputs(tmp_path)
+    for dataset_instance in expected:
+        _set_meta_and_peek(dataset_instance)
+    outputs = _outputs(tmp_path)
+    tasks = [(output, lambda output=output: _set_meta_and_peek(output)) for output in outputs]
+    results = list(set_outputs_meta(tasks, processes=2))
+    for output, expected_output, (set_successfully, output_meta) in zip(outputs, expected, results):
+        assert set_successfully
+        # the worker processes set metadata on their own copies
+        assert output.peek is None
+        load_output_meta(output, output_meta)
+        assert dict(output.metadata.items()) == dict(expected_output.metadata.items())
+        assert output.peek == expected_output.peek
+        assert output.blurb == expected_output.blurb
+
+
+def test_set_outputs_meta_failure(datatypes_registry, tmp_path):
+    outputs = _outputs(tmp_path)
+
+    def fail():
+        raise Exception("set_meta failed")
+
+    tasks = [(outputs[0], fail), (outputs[1], lambda: _set_meta_and_peek(outputs[1]))]
+    (failed, traceback), (set_successfully, output_meta) = set_outputs_meta(tasks, processes=2)
+    assert not failed
+    assert "set_meta failed" in traceback
+    assert set_successfully
+    load_output_meta(outputs[1], output_meta)
+    assert outputs[1].metadata.columns == 6
+
+
+def test_set_outputs_meta_worker_killed(datatypes_registry, tmp_path):
+    outputs = _outputs(tmp_path)
+    # a single worker process runs the tasks one after the other, the second one isn't run once it's killed
+    tasks = [(outputs[0], lambda: os._exit(1)), (outputs[1], lambda: _set_meta_and_peek(outputs[1]))]
+    results = list(set_outputs_meta(tasks, processes=1))
+    assert len(results) == 2
+    for set_successfully, message in results:
+        assert not set_successfully
+        assert "BrokenProcessPool" in message
+
+
+def test_set_outputs_meta_pool_failure(datatypes_registry, tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("Cannot fork")
+
+    monkeypatch.setattr(set_metadata, "ProcessPoolExecutor", fail)
+    outputs = _outputs(tmp_path)
+    tasks = [(output, lambda output=output: _set_meta_and_peek(output)) for output in outputs]
+    results = list(set_outputs_meta(tasks, processes=2))
+    assert len(results) == len(outputs)
+    for set_successfully, message in results:
+        assert not set_successfully
+        assert "Cannot fork" in message
+
+
+@pytest.fixture
+def object_store():
+    # as built for extended metadata, MetadataFile objects are stored by uuid without a database
+    with TestConfig(store_by="uuid") as (_, object_store):
+        setup_global_object_store_for_models(object_store)
+        try:
+            yield object_store
+        finally:
+            Dataset.object_store = None
+
+
+def _bam_output(tmp_path, name):
+    path = tmp_path / f"{name}.bam"
+    shutil.copy(get_test_fname("1.bam"), path)
+    dataset = Dataset(id=-1, external_filename=str(path), uuid=None)
+    dataset.state = dataset.states.OK
+    return HistoryDatasetAssociation(id=-1, dataset=dataset, extension="bam")
+
+
+def test_set_outputs_meta_metadata_file(datatypes_registry, object_store, tmp_path):
+    expected = _bam_output(tmp_path, "expected")
+    expected.datatype.set_meta(expected)
+    assert isinstance(expected.metadata.bam_index, MetadataFile)
+    output = _bam_output(tmp_path, "output")
+    metadata_tmp_files_dir = tmp_path / "metadata"
+    metadata_tmp_files_dir.mkdir()
+    # worker processes write MetadataTempFile objects, like datatypes do when setting metadata in processes
+    tasks = [(output, lambda: output.datatype.set_meta(output, metadata_tmp_files_dir=str(metadata_tmp_files_dir)))]
+    ((set_successfully, output_meta),) = set_outputs_meta(tasks, processes=1)
+    assert set_successfully
+    load_output_meta(output, output_meta)
+    bam_index = output._metadata["bam_index"]
+    assert isinstance(bam_index, MetadataFile)
+    assert output.metadata.bam_index is bam_index
+    assert bam_index.get_file_name() != expected.metadata.bam_index.get_file_name()
+    with open(bam_index.get_file_name(), "rb") as fh, open(expected.metadata.bam_index.get_file_name(), "rb") as efh:
+        assert fh.read() == efh.read()
@@ -1,7 +1,9 @@
 import os
 import shutil
+import threading
 import time
 from functools import wraps
+from io import BytesIO
 from tempfile import (
     mkdtemp,
     mkstemp,
@@ -14,8 +16,11 @@ from requests import get
 
 from galaxy.exceptions import ObjectInvalid
 from galaxy.objectstore import persist_extra_files_for_dataset
+from galaxy.objectstore._transfer import TransferEngine
 from galaxy.objectstore.azure_blob import AzureBlobObjectStore
 from galaxy.objectstore.caching import (
+    BlockCache,
+    CacheIndex,
     CacheTarget,
     check_cache,
     InProcessCacheMonitor,
@@ -585,6 +590,22 @@ def test_config_parse_pithos():
             assert len(extra_dirs) == 2
 
 
+PITHOS_CACHE_INDEX_TEST_CONFIG = get_example("pithos_cache_index.xml")
+PITHOS_CACHE_INDEX_TEST_CONFIG_YAML = get_example("pithos_cache_index.yml")
+
+
+@patch_object_stores_to_skip_initialize
+def test_config_parse_pithos_cache_index():
+    for config_str in [PITHOS_CACHE_INDEX_TEST_CONFIG, PITHOS_CACHE_INDEX_TEST_CONFIG_YAML]:
+        with TestConfig(config_str) as (directory, object_store):
+            assert object_store.cache_index_enabled
+            assert object_store.cache_eviction_policy == "lfu"
+
+            cache_dict = object_store.to_dict()["cache"]
+            _assert_key_has_value(cache_dict, "index", True)
+            _assert_key_has_value(cache_dict, "eviction_policy", "lfu")
+
+
 S3_TEST_CONFIG = get_example("s3_simple.xml")
 S3_TEST_CONFIG_YAML = get_example("s3_simple.yml")
 
@@ -976,6 +997,286 @@ def test_fits_in_cache_check(tmp_path):
     assert noop_cache_target.fits_in_cache(1024 * 1024 * 1024 * 100)
 
 
+def test_check_cache_with_index(tmp_path):
+    cache_dir = tmp_path
+    path = cache_dir / "a_file_0"
+    path.write_text("this is an example file")
+    big_cache_target = CacheTarget(cache_dir, 1, 0.2, True)
+    # index is built from the cache directory on first check
+    check_cache(big_cache_target)
+    assert path.exists()
+    cache_index = CacheIndex(cache_dir)
+    assert cache_index.built
+    assert len(cache_index) == 1
+    assert cache_index.total_size == len("this is an example file")
+    cache_index.close()
+    small_cache_target = CacheTarget(cache_dir, 1, 0.000000001, True)
+    check_cache(small_cache_target)
+    assert not path.exists()
+    # the index itself is never evicted
+    assert (cache_dir / ".galaxy_cache_index.sqlite").exists()
+
+
+def test_cache_index_lru_eviction(tmp_path):
+    cache_index = CacheIndex(tmp_path)
+    paths = []
+    for i in range(3):
+        path = tmp_path / "000" / f"dataset_{i}.dat"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("x" * 10)
+        cache_index.add(str(path))
+        paths.append(path)
+    assert cache_index.total_size == 30
+    # dataset_0 becomes the most recently used file
+    cache_index.touch(str(paths[0]))
+    assert cache_index.evict(15) == 20
+    assert paths[0].exists()
+    assert not paths[1].exists()
+    assert not paths[2].exists()
+    assert cache_index.total_size == 10
+    cache_index.remove_directory(str(tmp_path / "000"))
+    assert len(cache_index) == 0
+    assert cache_index.total_size == 0
+    cache_index.close()
+
+
+def test_check_cache_with_index_lfu_eviction(tmp_path):
+    cache_dir = tmp_path
+    paths = []
+    for i in range(3):
+        path = cache_dir / f"dataset_{i}.dat"
+        path.write_text("x" * 10)
+        paths.append(path)
+    cache_index = CacheIndex(cache_dir, "lfu")
+    cache_index.rebuild()
+    # dataset_0 is used the most, but dataset_2 most recently
+    for _ in range(2):
+        cache_index.touch(str(paths[0]))
+    cache_index.touch(str(paths[1]))
+    cache_index.touch(str(paths[2]))
+    cache_index.close()
+    # leave room for a single file
+    cache_target = CacheTarget(cache_dir, 1, 15 / (1024 * 1024 * 1024), True, "lfu")
+    check_cache(cache_target)
+    assert paths[0].exists()
+    assert not paths[1].exists()
+    assert not paths[2].exists()
+
+
+def test_block_cache_lru():
+    block_cache = BlockCache(2, block_size=4)
+    block_cache.put("a", 0, b"0123")
+    block_cache.put("a", 1, b"4567")
+    assert block_cache.get("a", 0) == b"0123"
+    # block 1 of a is the least recently used block
+    block_cache.put("b", 0, b"abcd")
+    assert block_cache.get("a", 1) is None
+    assert block_cache.get("a", 0) == b"0123"
+    block_cache.invalidate("a")
+    assert block_cache.get("a", 0) is None
+    assert block_cache.get("b", 0) == b"abcd"
+
+
+def test_transfer_engine_retries():
+    engine = TransferEngine(retries=2, retry_backoff=0)
+    attempts = []
+
+    def flaky_transfer(value):
+        attempts.append(value)
+        if len(attempts) < 3:
+            raise Exception("transient failure")
+        return True
+
+    assert engine.run(flaky_transfer, "a", size=lambda: 5)
+    assert attempts == ["a", "a", "a"]
+    stats = engine.stats.to_dict()
+    assert stats["transfers"] == 1
+    assert stats["retries"] == 2
+    assert stats["bytes"] == 5
+
+    engine = TransferEngine(retries=1, retry_backoff=0)
+
+    def failing_transfer():
+        raise Exception("permanent failure")
+
+    with pytest.raises(Exception, match="permanent failure"):
+        engine.run(failing_transfer)
+    assert engine.stats.failures == 1
+
+
+def test_transfer_engine_does_not_retry_refusals():
+    engine = TransferEngine(retries=2, retry_backoff=0)
+    attempts = []
+
+    def refused_download():
+        # object store transfer methods return False if they refuse a transfer, e.g. if it doesn't fit in the cache
+        attempts.append(True)
+        return False
+
+    assert engine.run(refused_download, size=lambda: 5) is False
+    assert len(attempts) == 1
+    stats = engine.stats.to_dict()
+    assert stats["transfers"] == 0
+    assert stats["retries"] == 0
+    assert stats["failures"] == 0
+
+
+def test_transfer_engine_logs_stats(caplog):
+    engine = TransferEngine(name="test object store")
+    engine.run(lambda: True, size=lambda: 5)
+    with caplog.at_level("INFO", logger="galaxy.objectstore._transfer"):
+        engine.shutdown()
+    assert "test object store transfers: 1 (0 failed, 0 retries), 5 bytes" in caplog.text
+
+
+def test_transfer_engine_map():
+    engine = TransferEngine(concurrency=4)
+    threads = set()
+
+    def transfer(value, size):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        return value * 2
+
+    args_list = [(i, i) for i in range(20)]
+    assert engine.map(transfer, args_list, size=lambda value, size: size) == [i * 2 for i in range(20)]
+    assert engine.stats.transfers == 20
+    assert engine.stats.bytes == sum(range(20))
+    assert all(name.startswith("objectstore-transfer") for name in threads)
+    assert 1 < len(threads) <= 4
+    engine.shutdown()
+
+
+class MockRangedS3Client:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.ranges = []
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(i) for i in Range[len("bytes=") :].split("-"))
+        self.ranges.append((start, end))
+        return {"Body": BytesIO(self.content[start : end + 1])}
+
+
+@patch_object_stores_to_skip_initialize
+def test_boto3_ranged_get_data():
+    for config_str in [get_example("boto3_simple.xml"), get_example("boto3_simple.yml")]:
+        with TestConfig(config_str) as (directory, object_store):
+            client = MockRangedS3Client(b"0123456789")
+            object_store._client = client
+            dataset = MockDataset(1)
+            assert object_store._get_data(dataset, start=2, count=3) == "234"
+            assert client.ranges == [(2, 4)]
+            # partial reads don't pull the dataset into the cache
+            assert not object_store._in_cache(object_store._construct_path(dataset))
+
+            object_store.block_cache = BlockCache(4, block_size=4)
+            assert object_store._get_data(dataset, start=3, count=4) == "3456"
+            assert object_store._get_data(dataset, start=5, count=10) == "56789"
+            assert client.ranges[1:] == [(0, 3), (4, 7), (8, 11)]
+            # reads past the end of the object are empty
+            assert object_store._get_data(dataset, start=20, count=4) == ""
+            assert not object_store._in_cache(object_store._construct_path(dataset))
+
+
+@patch_object_stores_to_skip_initialize
+def test_boto3_ranged_get_data_characters():
+    with TestConfig(get_example("boto3_simple.yml")) as (directory, object_store):
+        content = "αβγ\r\nδ"
+        client = MockRangedS3Client(content.encode("utf-8"))
+        object_store._client = client
+        dataset = MockDataset(1)
+        # count is in characters, like reading the cached file in text mode
+        assert object_store._get_data(dataset, start=0, count=2) == "αβ"
+        assert client.ranges == [(0, 1), (2, 2), (3, 3)]
+        assert object_store._get_data(dataset, start=2, count=3) == "βγ\n"
+        assert object_store._get_data(dataset, start=0, count=100) == "αβγ\nδ"
+        # a \r held back at the end of the range doesn't add a character
+        client.content = b"ab\rcd"
+        assert object_store._get_data(dataset, start=0, count=3) == "ab\n"
+        assert object_store._get_data(dataset, start=1, count=2) == "b\n"
+
+
+class MockDownloadS3Client:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.downloaded = threading.Event()
+        self.release = threading.Event()
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": len(self.content)}
+
+    def download_file(self, bucket, key, local_destination, Config=None):
+        with open(local_destination, "wb") as f:
+            f.write(self.content[:1])
+            self.downloaded.set()
+            self.release.wait(5)
+            f.write(self.content[1:])
+
+
+@patch_object_stores_to_skip_initialize
+def test_boto3_prefetch(tmp_path):
+    for config_str in [get_example("boto3_simple.xml"), get_example("boto3_simple.yml")]:
+        with TestConfig(config_str) as (directory, object_store):
+            object_store.staging_path = str(tmp_path / str(uuid4()))
+            client = MockDownloadS3Client(b"0123456789")
+            object_store._client = client
+            dataset = MockDataset(1)
+            assert object_store.prefetch(dataset)
+            # already being prefetched
+            assert not object_store.prefetch(dataset)
+            assert client.downloaded.wait(5)
+            client.release.set()
+            # waits for the prefetch instead of serving the partially downloaded file
+            with open(object_store.get_filename(dataset)) as f:
+                assert f.read() == "0123456789"
+            assert not object_store.prefetch(dataset)
+            object_store.shutdown()
+
+
+class MockFlakyS3Client:
+    def __init__(self, content: bytes, failures: int):
+        self.content = content
+        self.failures = failures
+        self.downloads = 0
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": len(self.content)}
+
+    def download_file(self, bucket, key, local_destination, Config=None):
+        self.downloads += 1
+        if self.failures:
+            self.failures -= 1
+            raise Exception("connection reset")
+        with open(local_destination, "wb") as f:
+            f.write(self.content)
+
+
+@patch_object_stores_to_skip_initialize
+def test_boto3_download_retries():
+    with TestConfig(get_example("boto3_simple.yml")) as (directory, object_store):
+        object_store._transfer_engine = TransferEngine(retries=1, retry_backoff=0)
+        rel_path = object_store._construct_path(MockDataset(1))
+        client = MockFlakyS3Client(b"0123456789", failures=1)
+        object_store._client = client
+        assert object_store._pull_into_cache(rel_path)
+        assert client.downloads == 2
+        # failing downloads are retried, then logged and reported as not pulled into the cache
+        client = MockFlakyS3Client(b"0123456789", failures=2)
+        object_store._client = client
+        assert not object_store._pull_into_cache(rel_path)
+        assert client.downloads == 2
+        assert not object_store._in_cache(rel_path)
+        # downloads the object store refuses are not retried
+        object_store._caching_allowed = lambda rel_path, remote_size=None: False
+        client = MockFlakyS3Client(b"0123456789", failures=0)
+        object_store._client = client
+        assert not object_store._pull_into_cache(rel_path)
+        assert client.downloads == 0
+        stats = object_store.transfer_engine.stats.to_dict()
+        assert (stats["transfers"], stats["retries"], stats["failures"]) == (2, 2, 1)
+
+
 AZURE_BLOB_NO_CACHE_TEST_CONFIG = get_example("azure_default_cache.xml")
 AZURE_BLOB_NO_CACHE_TEST_CONFIG_YAML = get_example("azure_default_cache.yml")
 
@@ -3,7 +3,10 @@ import sys
 import pytest
 from Cheetah.NameMapper import NotFound
 
-from galaxy.util.template import fill_template
+from galaxy.util.template import (
+    CompiledTemplateCache,
+    fill_template,
+)
 
 # In Python 3.12 calling `locals()`` inside a comprehension now includes
 # variables from outside the comprehension, see
@@ -99,3 +102,14 @@ def test_fix_template_two_to_three():
 def test_fix_template_invalid_cheetah():
     template_str = fill_template(INVALID_CHEETAH_SYNTAX, python_template_version="2", retry=1)
     assert template_str == "1 is 1\n"
+
+
+def test_compiled_template_cache():
+    cache = CompiledTemplateCache(max_size=1)
+    klass = cache.compile(SIMPLE_TEMPLATE)
+    assert cache.compile(SIMPLE_TEMPLATE) is klass
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+    cache.compile(TWO_TO_THREE_TEMPLATE)
+    assert len(cache) == 1
+    assert cache.compile(SIMPLE_TEMPLATE) is not klass
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 1}
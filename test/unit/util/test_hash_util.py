@@ -0,0 +1,34 @@
+import hashlib
+
+from galaxy.util.hash_util import (
+    HASH_NAMES,
+    HashFunctionNameEnum,
+    md5_hash_file,
+    memory_bound_hexdigest,
+    memory_bound_hexdigests,
+)
+
+
+def test_memory_bound_hexdigests(tmp_path):
+    path = tmp_path / "data"
+    content = bytes(range(256)) * 1000
+    path.write_bytes(content)
+    hex_digests = memory_bound_hexdigests(HASH_NAMES, path=str(path), block_size=4096)
+    assert set(hex_digests) == set(HASH_NAMES)
+    for hash_function, hex_digest in hex_digests.items():
+        assert hex_digest == memory_bound_hexdigest(hash_func_name=hash_function, path=str(path))
+    assert hex_digests[HashFunctionNameEnum.sha256] == hashlib.sha256(content).hexdigest()
+
+
+def test_memory_bound_hexdigests_by_name(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    hex_digests = memory_bound_hexdigests(["MD5"], path=str(path))
+    assert hex_digests == {HashFunctionNameEnum.md5: hashlib.md5().hexdigest()}
+
+
+def test_md5_hash_file(tmp_path):
+    path = tmp_path / "data"
+    path.write_bytes(b"moo")
+    assert md5_hash_file(path) == hashlib.md5(b"moo").hexdigest()
+    assert md5_hash_file(tmp_path / "missing") is None
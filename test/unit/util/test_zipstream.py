@@ -0,0 +1,50 @@
+import gzip
+import io
+import os
+import zipfile
+
+import pytest
+
+from galaxy.util.zipstream import ZipstreamWrapper
+
+
+def test_zipstream_archive(tmp_path):
+    data_path = tmp_path / "data.txt"
+    data_path.write_bytes(b"moo\n" * 100000)
+    gz_path = tmp_path / "data.txt.gz"
+    gz_path.write_bytes(gzip.compress(b"cow\n" * 1000))
+    extra_dir = tmp_path / "extra"
+    (extra_dir / "sub").mkdir(parents=True)
+    (extra_dir / "sub" / "file").write_bytes(b"")
+    data_path.chmod(0o644)
+    (extra_dir / "sub" / "file").chmod(0o755)
+
+    archive = ZipstreamWrapper(archive_name="test")
+    archive.write(str(data_path), "outputs/data.txt")
+    archive.write(str(gz_path), "outputs/data.txt.gz")
+    archive.write(str(extra_dir))
+    content = b"".join(archive.response())
+
+    with zipfile.ZipFile(io.BytesIO(content)) as zf:
+        assert zf.testzip() is None
+        names = zf.namelist()
+        assert os.path.join("extra", "sub", "file") in names
+        assert zf.read("outputs/data.txt") == data_path.read_bytes()
+        assert zf.read("outputs/data.txt.gz") == gz_path.read_bytes()
+        assert zf.getinfo("outputs/data.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.getinfo("outputs/data.txt.gz").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("outputs/data.txt").external_attr >> 16 == os.stat(data_path).st_mode
+        assert (
+            zf.getinfo(os.path.join("extra", "sub", "file")).external_attr >> 16
+            == os.stat(extra_dir / "sub" / "file").st_mode
+        )
+
+
+def test_zipstream_missing_member(tmp_path):
+    data_path = tmp_path / "data.txt"
+    data_path.write_bytes(b"moo")
+    archive = ZipstreamWrapper(archive_name="test")
+    archive.write(str(data_path), "data.txt")
+    data_path.unlink()
+    with pytest.raises(FileNotFoundError):
+        b"".join(archive.response())
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from galaxy import model
+from galaxy.model import mapping
+from galaxy.model.base import transaction
+from galaxy.util import bunch
+from galaxy.workflow.scheduling_manager import WorkflowRequestMonitor
+
+
+def test_poll_active_workflow_ids_by_user():
+    app = mapping.init("/tmp", "sqlite:///:memory:", create_tables=True)
+    user = model.User(email="u1@example.com", password="password")
+    other_user = model.User(email="u2@example.com", password="password")
+    workflow = model.Workflow()
+    invocations = [
+        __new_invocation(workflow, user, "new"),
+        __new_invocation(workflow, other_user, "ready"),
+        __new_invocation(workflow, None, "new"),
+        __new_invocation(workflow, user, "cancelling"),
+        __new_invocation(workflow, user, "scheduled"),
+        __new_invocation(workflow, other_user, "new", handler="other_handler"),
+        __new_invocation(workflow, other_user, "new", scheduler="other_scheduler"),
+    ]
+    session = app.context
+    session.add_all(invocations)
+    with transaction(session):
+        session.commit()
+    ids_by_user = model.WorkflowInvocation.poll_active_workflow_ids_by_user(
+        app.engine, scheduler="core", handler="handler0"
+    )
+    assert ids_by_user == {
+        user.id: [invocations[0].id, invocations[3].id],
+        other_user.id: [invocations[1].id],
+        None: [invocations[2].id],
+    }
+
+
+def test_invocation_scheduled_by_one_thread_at_a_time(monkeypatch):
+    monitor = __monitor(monkeypatch, {1: [1, 2], 2: [3]}, threads=3, budget=0.2)
+    release = threading.Event()
+    running = defaultdict(int)
+    max_running = defaultdict(int)
+    attempts = defaultdict(int)
+    lock = threading.Lock()
+
+    def attempt_schedule(invocation_id, workflow_scheduler):
+        with lock:
+            attempts[invocation_id] += 1
+            running[invocation_id] += 1
+            max_running[invocation_id] = max(max_running[invocation_id], running[invocation_id])
+        if invocation_id == 1:
+            release.wait(5)
+        with lock:
+            running[invocation_id] -= 1
+        return True
+
+    monitor._WorkflowRequestMonitor__attempt_schedule = attempt_schedule
+    # invocation 1 is still being scheduled once the budget is spent, later iterations skip it
+    __schedule(monitor)
+    __schedule(monitor)
+    assert attempts == {1: 1, 2: 2, 3: 2}
+    release.set()
+    __wait_until(lambda: not monitor._invocations_in_progress)
+    __schedule(monitor)
+    assert attempts == {1: 2, 2: 3, 3: 3}
+    assert set(max_running.values()) == {1}
+    monitor.scheduling_pool.shutdown()
+
+
+def test_users_interleaved(monkeypatch):
+    monitor = __monitor(monkeypatch, {1: [1, 2, 3], 2: [4], 3: [5, 6]}, threads=2)
+    # a single thread to schedule invocations in the order they are submitted
+    monitor.scheduling_pool = ThreadPoolExecutor(max_workers=1)
+    scheduled = []
+    monitor._WorkflowRequestMonitor__attempt_schedule = lambda invocation_id, _: scheduled.append(invocation_id)
+    __schedule(monitor)
+    assert scheduled == [1, 4, 5, 2, 6, 3]
+    # every iteration starts with the next user
+    __wait_until(lambda: not monitor._invocations_in_progress)
+    scheduled.clear()
+    __schedule(monitor)
+    assert scheduled == [4, 5, 1, 6, 2, 3]
+    monitor.scheduling_pool.shutdown()
+
+
+def test_iteration_budget(monkeypatch):
+    monitor = __monitor(monkeypatch, {1: [1, 2], 2: [3]}, threads=2, budget=0.1)
+    monitor.scheduling_pool = ThreadPoolExecutor(max_workers=1)
+    scheduled = []
+
+    def attempt_schedule(invocation_id, workflow_scheduler):
+        scheduled.append(invocation_id)
+        if scheduled == [1]:
+            time.sleep(0.5)
+
+    monitor._WorkflowRequestMonitor__attempt_schedule = attempt_schedule
+    start = time.monotonic()
+    __schedule(monitor)
+    assert time.monotonic() - start < 0.4
+    __wait_until(lambda: not monitor._invocations_in_progress)
+    # invocations that did not start within the budget were cancelled
+    assert scheduled == [1]
+    __schedule(monitor)
+    assert scheduled == [1, 3, 1, 2]
+    monitor.scheduling_pool.shutdown()
+
+
+def __new_invocation(workflow, user, state, scheduler="core", handler="handler0"):
+    workflow_invocation = model.WorkflowInvocation()
+    workflow_invocation.workflow = workflow
+    workflow_invocation.history = model.History(user=user)
+    workflow_invocation.state = state
+    workflow_invocation.scheduler = scheduler
+    workflow_invocation.handler = handler
+    return workflow_invocation
+
+
+def __monitor(monkeypatch, ids_by_user, threads, budget=0):
+    monkeypatch.setattr(
+        model.WorkflowInvocation,
+        "poll_active_workflow_ids_by_user",
+        staticmethod(lambda engine, scheduler=None, handler=None: ids_by_user),
+    )
+    app = bunch.Bunch(
+        config=bunch.Bunch(
+            server_name="handler0",
+            monitor_thread_join_timeout=0,
+            workflow_scheduling_threads=threads,
+            workflow_scheduling_iteration_budget=budget,
+        ),
+        job_config=bunch.Bunch(self_handler_tags=[]),
+        model=bunch.Bunch(engine=None),
+    )
+    workflow_scheduling_manager = bunch.Bunch(
+        default_handler_id="_default_", handler_assignment_methods=None, handler_max_grab=None
+    )
+    return WorkflowRequestMonitor(app, workflow_scheduling_manager)
+
+
+def __schedule(monitor):
+    monitor._WorkflowRequestMonitor__schedule_concurrently("core", None)
+
+
+def __wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met")
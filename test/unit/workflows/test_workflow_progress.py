@@ -179,6 +179,34 @@ class TestWorkflowProgress(TestCase):
         replacement = progress.replacement_for_input(None, self._step(4), step_dict)
         assert replacement is hda3
 
+    def test_remaining_steps_recovers_tool_outputs_on_demand(self):
+        self._setup_workflow(TEST_WORKFLOW_YAML)
+        hda3 = model.HistoryDatasetAssociation()
+        self._set_previous_progress(
+            [
+                (100, {"output": model.HistoryDatasetAssociation()}),
+                (101, {"output": model.HistoryDatasetAssociation()}),
+                (102, {"out_file1": hda3}),
+                (103, {"out_file1": model.HistoryDatasetAssociation()}),
+                (104, UNSCHEDULED_STEP),
+            ]
+        )
+        progress = self._new_workflow_progress()
+        progress.remaining_steps()
+        # inputs are recovered right away, tool outputs once they are needed
+        assert set(progress.outputs) == {100, 101}
+        conn = model.WorkflowStepConnection()
+        conn.output_name = "out_file1"
+        conn.output_step = self._step(2)
+        assert progress.replacement_for_connection(conn) is hda3
+        assert set(progress.outputs) == {100, 101, 102}
+        # outputs of the invocation include the steps that haven't been recovered
+        step_outputs = progress.step_outputs
+        assert set(step_outputs) == {100, 101, 102, 103}
+        assert set(progress.outputs) == {100, 101, 102}
+        assert step_outputs[103]["out_file1"] is not None
+        assert set(progress.outputs) == {100, 101, 102, 103}
+
     # TODO: Replace multiple true HDA with HDCA
     # TODO: Test explicit delay
     # TODO: Test cancel on collection invalid